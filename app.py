@@ -1,5 +1,16 @@
+import time
+INICIO = time.perf_counter()  # Referencia del tiempo hasta el primer pintado (antes de cualquier import pesado)
+
+import argparse
+import logging
 from ui.main_window import MainWindow
 
 if __name__ == "__main__":
-    app = MainWindow()
-    app.run()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Sistema de Gestión de Reservas")
+    parser.add_argument("--medir-arranque", action="store_true",
+                        help="Imprime el tiempo hasta el primer pintado y hasta tener los datos, y cierra")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO if args.medir_arranque else logging.WARNING,
+                        format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    app = MainWindow(inicio=INICIO, salir_al_cargar=args.medir_arranque)
+    app.run()
@@ -0,0 +1,93 @@
+"""
+Asignación automática de mesas: paridad con fuerza bruta y tiempos en salones de 20, 100 y 500 mesas.
+No necesita BD (los salones se generan en memoria).
+
+Uso:
+    python -m benchmarks.bench_asignacion
+    python -m benchmarks.bench_asignacion --mesas 20 100 500 --consultas 300 --max-mesas 4
+"""
+import argparse
+import random
+import time
+from itertools import combinations
+from logic.asignacion_mesas import combinacion_optima, proponer_mesas
+
+CAPACIDADES = (2, 2, 2, 4, 4, 4, 6, 8, 10)
+
+
+def generar_salon(n_mesas, semilla=11):
+    """[(idMesa, capacidad)] y {idMesa: zona} con zonas de ~10 mesas."""
+    rnd = random.Random(semilla)
+    mesas = [(i, rnd.choice(CAPACIDADES)) for i in range(1, n_mesas + 1)]
+    zonas = {i: f"Z{(i - 1) // 10}" for i, _ in mesas}
+    return mesas, zonas
+
+
+def fuerza_bruta(mesas, pax, max_mesas):
+    # Referencia: todas las combinaciones de hasta max_mesas mesas
+    mejor = None
+    for k in range(1, max_mesas + 1):
+        for combo in combinations(mesas, k):
+            total = sum(cap for _, cap in combo)
+            if total >= pax and (mejor is None or (total - pax, k) < mejor):
+                mejor = (total - pax, k)
+    return mejor
+
+
+def verificar_paridad(n_mesas, max_mesas, consultas, semilla=3):
+    rnd = random.Random(semilla)
+    mesas, _ = generar_salon(n_mesas)
+    for _ in range(consultas):
+        libres = rnd.sample(mesas, rnd.randint(1, n_mesas))
+        pax = rnd.randint(1, 30)
+        esperado = fuerza_bruta(libres, pax, max_mesas)
+        obtenido = combinacion_optima(libres, pax, max_mesas)
+        if obtenido is not None:
+            ids, sobrante = obtenido
+            caps = dict(libres)
+            assert len(set(ids)) == len(ids) and all(i in caps for i in ids)
+            assert sum(caps[i] for i in ids) - pax == sobrante
+            obtenido = (sobrante, len(ids))
+        assert obtenido == esperado, (pax, sorted(libres), obtenido, esperado)
+
+
+def medir(n_mesas, consultas, max_mesas):
+    rnd = random.Random(n_mesas)
+    mesas, zonas = generar_salon(n_mesas)
+    casos = []
+    for _ in range(consultas):
+        libres = [m for m in mesas if rnd.random() < 0.6]  # ~40% del salón ocupado
+        casos.append((libres, rnd.randint(1, 40)))
+
+    tiempos = []
+    for libres, pax in casos:
+        t0 = time.perf_counter()
+        proponer_mesas(libres, pax, zonas, max_mesas)
+        tiempos.append(time.perf_counter() - t0)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2] * 1000, tiempos[int(len(tiempos) * 0.95)] * 1000, max(tiempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mesas", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--consultas", type=int, default=300)
+    parser.add_argument("--max-mesas", type=int, default=4)
+    args = parser.parse_args()
+
+    verificar_paridad(12, args.max_mesas, 300)
+    print("Paridad con fuerza bruta (12 mesas, 300 casos): OK")
+
+    print(f"{'mesas':>6} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for n in args.mesas:
+        p50, p95, peor = medir(n, args.consultas, args.max_mesas)
+        print(f"{n:>6} {p50:>9.3f} {p95:>9.3f} {peor:>9.3f}")
+
+    # Referencia: la fuerza bruta ya en 20 mesas
+    mesas, _ = generar_salon(20)
+    t0 = time.perf_counter(); fuerza_bruta(mesas, 23, args.max_mesas)
+    print(f"Fuerza bruta, 20 mesas, pax=23: {(time.perf_counter() - t0) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
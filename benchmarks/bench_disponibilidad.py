@@ -0,0 +1,143 @@
+"""
+Paridad y microbenchmark del índice de disponibilidad en memoria vs. las consultas SQL.
+
+Uso:
+    python -m benchmarks.bench_disponibilidad                 # contra la BD configurada (crea y borra una reserva en 2099)
+    python -m benchmarks.bench_disponibilidad --sintetico     # sin BD: datos generados en memoria
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from logic.disponibilidad import IndiceDisponibilidad, MARGEN_RESERVA, ESTADOS_ACTIVOS, nivel_visual
+
+
+class IndiceSintetico(IndiceDisponibilidad):
+    """Índice alimentado con filas generadas (idMesa, Nmesa, fecha, idReserva, estado) en vez de la BD."""
+    def __init__(self, filas):
+        super().__init__(ttl=float("inf"))
+        self.filas = filas
+
+    def _cargar(self, dia):
+        return [f for f in self.filas if f[2].date() == dia and f[4] in ESTADOS_ACTIVOS]
+
+
+def generar_filas(n_mesas, n_reservas, dia, semilla=7):
+    rnd = random.Random(semilla)
+    inicio = datetime(dia.year, dia.month, dia.day, 8)
+    filas = []
+    for id_reserva in range(1, n_reservas + 1):
+        fecha = inicio + timedelta(minutes=rnd.randrange(0, 14 * 60, 15))
+        estado = rnd.choice((1, 2, 3, 4))
+        for id_mesa in rnd.sample(range(1, n_mesas + 1), rnd.choice((1, 1, 1, 2))):
+            filas.append((id_mesa, f"M-{id_mesa:03d}", fecha, id_reserva, estado))
+    return filas
+
+
+def referencia_niveles(filas, fecha_hora, ignorar=None):
+    # Semántica exacta del SQL: BETWEEN inclusivo, estados activos, nivel máximo por mesa
+    inicio, fin = fecha_hora - MARGEN_RESERVA, fecha_hora + MARGEN_RESERVA
+    niveles = {}
+    for id_mesa, _, fecha, id_reserva, estado in filas:
+        if estado in ESTADOS_ACTIVOS and inicio <= fecha <= fin and id_reserva != ignorar:
+            niveles[id_mesa] = max(niveles.get(id_mesa, 0), nivel_visual(estado))
+    return niveles
+
+
+def referencia_conflictos(filas, fecha_hora, ids_mesas, ignorar=None):
+    inicio, fin = fecha_hora - MARGEN_RESERVA, fecha_hora + MARGEN_RESERVA
+    return sorted({nm for id_mesa, nm, fecha, id_reserva, estado in filas
+                   if estado in ESTADOS_ACTIVOS and id_mesa in ids_mesas and inicio <= fecha <= fin and id_reserva != ignorar})
+
+
+def cronometrar(funcion, consultas):
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        funcion(*consulta)
+    return (time.perf_counter() - inicio) * 1000 / len(consultas)
+
+
+def horas_del_dia(dia, paso=15):
+    base = datetime(dia.year, dia.month, dia.day, 8)
+    return [base + timedelta(minutes=m) for m in range(0, 14 * 60 + 1, paso)]
+
+
+def sintetico(args):
+    dia = datetime.now().date()
+    filas = generar_filas(args.mesas, args.reservas, dia)
+    indice = IndiceSintetico(filas)
+    rnd = random.Random(11)
+    consultas = [(t, rnd.sample(range(1, args.mesas + 1), 3), rnd.choice((None, 5))) for t in horas_del_dia(dia)]
+
+    for t, ids, ignorar in consultas:
+        assert indice.niveles(t, ignorar) == referencia_niveles(filas, t, ignorar), f"niveles difieren a las {t}"
+        assert indice.conflictos(t, ids, ignorar) == referencia_conflictos(filas, t, ids, ignorar), f"conflictos difieren a las {t}"
+    print(f"Paridad OK en {len(consultas)} horarios ({args.mesas} mesas, {args.reservas} reservas)")
+
+    print(f"niveles    índice: {cronometrar(lambda t, ids, ig: indice.niveles(t, ig), consultas):8.3f} ms/consulta  "
+          f"escaneo lineal: {cronometrar(lambda t, ids, ig: referencia_niveles(filas, t, ig), consultas):8.3f} ms/consulta")
+    print(f"conflictos índice: {cronometrar(lambda t, ids, ig: indice.conflictos(t, ids, ig), consultas):8.3f} ms/consulta  "
+          f"escaneo lineal: {cronometrar(lambda t, ids, ig: referencia_conflictos(filas, t, ids, ig), consultas):8.3f} ms/consulta")
+
+
+def contra_bd(args):
+    from logic.reserva_controller import ReservaController
+    from logic.disponibilidad import INDICE
+
+    dia = datetime.now().date()
+    mesas = [m['id'] for m in ReservaController.obtener_mesas_disponibles()]
+    rnd = random.Random(11)
+    consultas = [(t, rnd.sample(mesas, min(3, len(mesas))), None) for t in horas_del_dia(dia)]
+
+    for t, ids, ignorar in consultas:
+        assert INDICE.niveles(t, ignorar) == ReservaController.niveles_ocupacion_bd(t, ignorar), f"niveles difieren a las {t}"
+        sql = sorted(ReservaController.verificar_conflicto_mesas_bd(t, ids, ignorar) or [])
+        assert INDICE.conflictos(t, ids, ignorar) == sql, f"conflictos difieren a las {t}"
+    print(f"Paridad OK contra SQL en {len(consultas)} horarios de {dia}")
+    mutaciones(mesas)
+
+    print(f"niveles    índice: {cronometrar(lambda t, ids, ig: INDICE.niveles(t, ig), consultas):8.3f} ms/consulta  "
+          f"SQL: {cronometrar(lambda t, ids, ig: ReservaController.niveles_ocupacion_bd(t, ig), consultas):8.3f} ms/consulta")
+    print(f"conflictos índice: {cronometrar(lambda t, ids, ig: INDICE.conflictos(t, ids, ig), consultas):8.3f} ms/consulta  "
+          f"SQL: {cronometrar(lambda t, ids, ig: ReservaController.verificar_conflicto_mesas_bd(t, ids, ig), consultas):8.3f} ms/consulta")
+
+
+def mutaciones(mesas):
+    # El índice se actualiza en sitio al guardar, cambiar de estado y eliminar: tras cada paso debe seguir igual al SQL
+    from logic.reserva_controller import ReservaController
+    from logic.disponibilidad import INDICE
+
+    fecha = datetime(2099, 1, 2, 13)  # Día sin datos reales, como los escenarios de escritura de benchmarks.suite
+    ids = mesas[:2]
+    horas = horas_del_dia(fecha.date())
+
+    def comparar(paso):
+        for t in horas:
+            assert INDICE.niveles(t) == ReservaController.niveles_ocupacion_bd(t), f"{paso}: niveles difieren a las {t}"
+            sql = sorted(ReservaController.verificar_conflicto_mesas_bd(t, ids) or [])
+            assert INDICE.conflictos(t, ids) == sql, f"{paso}: conflictos difieren a las {t}"
+
+    comparar("día cargado")  # Deja el día en el índice: los pasos siguientes lo modifican en sitio
+    id_reserva = ReservaController.guardar_reserva(fecha, 2, 1, None, ids)
+    try:
+        comparar("guardar")
+        for estado in (2, 3, 2, 4, 3, 1):  # Incluye reactivar una cancelada
+            ReservaController.cambiar_estado(id_reserva, estado)
+            comparar(f"estado {estado}")
+    finally:
+        ReservaController.eliminar_reserva(id_reserva)
+    comparar("eliminar")
+    print(f"Paridad OK contra SQL al guardar, cambiar de estado y eliminar ({fecha.date()})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sintetico", action="store_true", help="No usa la BD: genera las reservas en memoria")
+    parser.add_argument("--mesas", type=int, default=100)
+    parser.add_argument("--reservas", type=int, default=2000)
+    args = parser.parse_args()
+    sintetico(args) if args.sintetico else contra_bd(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Grilla de disponibilidad (mesas x franjas de 15 min): paridad con el índice por hora y tiempos.
+
+Uso:
+    python -m benchmarks.bench_grilla                          # sin BD: 200 mesas x 7 días generados en memoria
+    python -m benchmarks.bench_grilla --mesas 200 --dias 7 --reservas-dia 600
+    python -m benchmarks.bench_grilla --bd                     # contra la BD configurada (semana actual)
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from logic.disponibilidad import MARGEN_RESERVA, slots_del_rango, matriz_niveles
+from benchmarks.bench_disponibilidad import IndiceSintetico, generar_filas
+
+
+def cronometrar(funcion, repeticiones=5):
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter(); resultado = funcion()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return resultado, mejor * 1000
+
+
+def sintetico(args):
+    hoy = datetime.now().date()
+    filas = []
+    for d in range(args.dias):
+        # Ids de reserva distintos por día para que no se mezclen
+        for id_mesa, nombre, fecha, id_reserva, estado in generar_filas(args.mesas, args.reservas_dia, hoy + timedelta(days=d), semilla=d):
+            filas.append((id_mesa, nombre, fecha, id_reserva + d * args.reservas_dia, estado))
+    slots = slots_del_rango(hoy, args.dias)
+    ignorar = random.Random(5).choice(filas)[3]
+    entrada = [(f[0], f[2], f[3], f[4]) for f in filas]
+
+    grilla, t_grilla = cronometrar(lambda: matriz_niveles(entrada, slots, ignorar))
+
+    indice = IndiceSintetico(filas)
+    por_hora, t_indice = cronometrar(lambda: [indice.niveles(t, ignorar) for t in slots], repeticiones=1)
+
+    for j, t in enumerate(slots):
+        esperado = por_hora[j]
+        for id_mesa in range(1, args.mesas + 1):
+            celda = grilla[id_mesa][j] if id_mesa in grilla else 0
+            assert celda == esperado.get(id_mesa, 0), f"mesa {id_mesa} difiere a las {t}"
+    celdas = args.mesas * len(slots)
+    print(f"Paridad OK: {args.mesas} mesas x {len(slots)} franjas ({args.dias} días, {len(filas)} filas de reserva)")
+    print(f"grilla (barrido):            {t_grilla:9.2f} ms  ({celdas / t_grilla / 1000:.1f} M celdas/s)")
+    print(f"índice, una consulta/franja: {t_indice:9.2f} ms")
+
+
+def contra_bd(args):
+    from logic.reserva_controller import ReservaController
+    from logic.disponibilidad import INDICE
+    from data.database import DatabaseManager
+
+    hoy = datetime.now().date()
+    viajes = {'n': 0}
+    original = DatabaseManager.run_query
+    def contar(*a, **k):
+        viajes['n'] += 1; return original(*a, **k)
+    DatabaseManager.run_query = staticmethod(contar)
+    try:
+        grilla, t_grilla = cronometrar(lambda: ReservaController.grilla_disponibilidad(hoy, args.dias), repeticiones=1)
+    finally:
+        DatabaseManager.run_query = staticmethod(original)
+    for j, t in enumerate(grilla['slots']):
+        niveles = INDICE.niveles(t)
+        for mesa in grilla['mesas']:
+            assert mesa['niveles'][j] == niveles.get(mesa['id'], 0), f"mesa {mesa['nombre']} difiere a las {t}"
+    print(f"Paridad OK contra el índice: {len(grilla['mesas'])} mesas x {len(grilla['slots'])} franjas")
+    print(f"grilla_disponibilidad: {t_grilla:9.2f} ms, {viajes['n']} viaje(s) a la BD (margen ±{MARGEN_RESERVA})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bd", action="store_true", help="Usa la BD configurada en vez de datos generados")
+    parser.add_argument("--mesas", type=int, default=200)
+    parser.add_argument("--dias", type=int, default=7)
+    parser.add_argument("--reservas-dia", type=int, default=600)
+    args = parser.parse_args()
+    contra_bd(args) if args.bd else sintetico(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Antes/después de la migración 001 (índices): plan de ejecución y tiempo de las consultas calientes.
+
+Borra temporalmente los índices de la migración 001, mide, los vuelve a crear y mide otra vez.
+Usar SOLO contra una BD local de desarrollo:
+    python -m benchmarks.bench_indices --sembrar 100000
+"""
+import argparse
+import re
+import time
+from datetime import datetime
+from data.database import DatabaseManager
+from data.migraciones import CARPETA_MIGRACIONES, lotes_sql
+from logic.reserva_controller import ReservaController
+from logic.disponibilidad import IndiceDisponibilidad
+from benchmarks.bench_monitor import SQL_SEMBRAR
+from config.settings import ID_RESTAURANTE_ACTUAL, MONITOR_TAMANO_PAGINA
+
+MIGRACION_INDICES = f"{CARPETA_MIGRACIONES}/sqlserver/001_indices_reserva.sql"
+_INDICE_CREADO = re.compile(r"CREATE NONCLUSTERED INDEX (\w+)\s+ON (dbo\.\w+)")
+_OPERADOR = re.compile(r'PhysicalOp="([^"]+)"[^>]*?>.*?<Object [^>]*?Index="\[([^\]]+)\]"', re.DOTALL)
+
+
+class CapturaSQL:
+    """Intercepta run_query para quedarse con el SQL y los parámetros que generan los controladores."""
+    def __init__(self):
+        self.sentencias = []
+        self._original = DatabaseManager.run_query
+
+    def __enter__(self):
+        def capturar(query, params=(), **kwargs):
+            self.sentencias.append((query, tuple(params)))
+            return self._original(query, params, **kwargs)
+        DatabaseManager.run_query = staticmethod(capturar)
+        return self
+
+    def __exit__(self, *exc):
+        DatabaseManager.run_query = staticmethod(self._original)
+
+
+def consultas_calientes():
+    ahora = datetime.now().replace(hour=20, minute=0, second=0, microsecond=0)
+    mesas = [m['id'] for m in ReservaController.obtener_mesas_disponibles()][:3] or [1]
+    desde, hasta = ReservaController.ventana_monitor()
+    casos = {
+        "niveles (disponibilidad)": lambda: ReservaController.niveles_ocupacion_bd(ahora),
+        "conflicto de mesas": lambda: ReservaController.verificar_conflicto_mesas_bd(ahora, mesas),
+        "carga del día (índice)": lambda: IndiceDisponibilidad._cargar(ahora.date()),
+        "monitor 1a página": lambda: ReservaController.listar_reservas_monitor(desde, hasta, limite=MONITOR_TAMANO_PAGINA),
+    }
+    capturadas = {}
+    for nombre, funcion in casos.items():
+        with CapturaSQL() as captura:
+            funcion()
+        capturadas[nombre] = captura.sentencias[-1]
+    return capturadas
+
+
+def plan(sql, params):
+    # Plan estimado (SHOWPLAN_XML) resumido a "operador(índice)"
+    with DatabaseManager.transaccion() as uow:
+        uow.ejecutar("SET SHOWPLAN_XML ON")
+        try:
+            xml = "".join(row[0] for row in uow.consultar(sql, params))
+        finally:
+            uow.ejecutar("SET SHOWPLAN_XML OFF")
+    return sorted({f"{op}({indice})" for op, indice in _OPERADOR.findall(xml)})
+
+
+def tiempo_ms(sql, params, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        DatabaseManager.run_query(sql, params, fetchall=True)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    return sorted(tiempos)[len(tiempos) // 2]
+
+
+def medir(etiqueta, consultas, repeticiones):
+    print(f"\n=== {etiqueta} ===")
+    for nombre, (sql, params) in consultas.items():
+        print(f"{nombre:<26} {tiempo_ms(sql, params, repeticiones):9.2f} ms  plan: {', '.join(plan(sql, params))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sembrar", type=int, default=0, help="Inserta N reservas sintéticas antes de medir")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.sembrar:
+        DatabaseManager.run_query(SQL_SEMBRAR, (args.sembrar, ID_RESTAURANTE_ACTUAL, ID_RESTAURANTE_ACTUAL), commit=True)
+    total = DatabaseManager.run_query("SELECT COUNT(*) FROM SGR_T_Reserva", fetchone=True)[0]
+    print(f"Reservas en la BD: {total}")
+
+    with open(MIGRACION_INDICES, encoding="utf-8-sig") as f:
+        lotes = lotes_sql(f.read())
+    consultas = consultas_calientes()
+
+    with DatabaseManager.transaccion() as uow:
+        for indice, tabla in _INDICE_CREADO.findall("\n".join(lotes)):
+            uow.ejecutar(f"DROP INDEX IF EXISTS {indice} ON {tabla}")
+    medir("SIN índices", consultas, args.repeticiones)
+
+    with DatabaseManager.transaccion() as uow:
+        for lote in lotes:
+            uow.ejecutar(lote)
+    medir("CON índices (migración 001)", consultas, args.repeticiones)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark del refresco del monitor: N+1 consultas vs. una sola consulta vs. primera página.
+
+Uso (contra una BD local de desarrollo, NO producción):
+    python -m benchmarks.bench_monitor --sembrar 3000
+    python -m benchmarks.bench_monitor --repeticiones 5
+"""
+import argparse
+import time
+from data.database import DatabaseManager
+from logic.reserva_controller import ReservaController
+from config.settings import ID_RESTAURANTE_ACTUAL, MONITOR_TAMANO_PAGINA
+
+SQL_SEMBRAR = """
+SET NOCOUNT ON;
+DECLARE @ultimo INT = ISNULL((SELECT MAX(idReserva) FROM SGR_T_Reserva), 0);
+WITH N AS (
+    SELECT TOP (?) ROW_NUMBER() OVER (ORDER BY (SELECT NULL)) AS n
+    FROM sys.all_objects a CROSS JOIN sys.all_objects b
+)
+INSERT INTO SGR_T_Reserva (idCliente, idEmpleado, idPolitica, fechareserva, Npersonas, idEstadoreserva, idRestaurante)
+SELECT (SELECT MIN(idCliente) FROM SGR_M_Cliente), NULL, 3,
+       DATEADD(MINUTE, -((n * 37) % 525600), GETDATE()), 1 + n % 6, 1 + n % 4, ?
+FROM N;
+INSERT INTO SGR_T_DetalleReserva (idReserva, idMesa, Total)
+SELECT R.idReserva, M.idMesa, 0
+FROM SGR_T_Reserva R
+CROSS APPLY (SELECT TOP 1 idMesa FROM SGR_M_Mesa WHERE idRestaurante = ? ORDER BY CHECKSUM(R.idReserva, idMesa)) M
+WHERE R.idReserva > @ultimo;
+"""
+
+
+class ContadorRoundTrips:
+    """Envuelve DatabaseManager.run_query para contar cuántas consultas viajan al servidor."""
+    def __init__(self):
+        self.total = 0
+        self._original = DatabaseManager.run_query
+
+    def __enter__(self):
+        def contado(*args, **kwargs):
+            self.total += 1
+            return self._original(*args, **kwargs)
+        DatabaseManager.run_query = staticmethod(contado)
+        return self
+
+    def __exit__(self, *exc):
+        DatabaseManager.run_query = staticmethod(self._original)
+
+
+def cargar_n_mas_1():
+    # Réplica de la carga anterior del monitor: 1 consulta + 1 por cada reserva
+    query = f"""
+    SELECT R.idReserva, {DatabaseManager.dialecto().concat("C.nombre", "' '", "C.apellido")}, R.fechareserva,
+           R.Npersonas, E.Descripcion, R.idEstadoreserva
+    FROM SGR_T_Reserva R
+    JOIN SGR_M_Cliente C ON R.idCliente = C.idCliente
+    JOIN SGR_P_Estadoreserva E ON R.idEstadoreserva = E.idEstadoreserva
+    ORDER BY R.fechareserva DESC
+    """
+    filas = []
+    for row in DatabaseManager.run_query(query, fetchall=True) or []:
+        mesas = DatabaseManager.run_query(
+            "SELECT M.Nmesa FROM SGR_T_DetalleReserva DR JOIN SGR_M_Mesa M ON DR.idMesa=M.idMesa WHERE DR.idReserva=?",
+            (row[0],), fetchall=True
+        )
+        filas.append(tuple(row) + (", ".join([m[0] for m in mesas]) if mesas else None,))
+    return filas
+
+
+def cargar_una_consulta():
+    return ReservaController.listar_reservas_monitor()
+
+
+def cargar_primera_pagina():
+    # Lo que hace hoy el monitor al refrescar: ventana por defecto + 1 página
+    desde, hasta = ReservaController.ventana_monitor()
+    return ReservaController.listar_reservas_monitor(desde, hasta, limite=MONITOR_TAMANO_PAGINA)
+
+
+def medir(nombre, funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        with ContadorRoundTrips() as contador:
+            inicio = time.perf_counter()
+            filas = funcion()
+            tiempos.append(time.perf_counter() - inicio)
+    tiempos.sort()
+    print(f"{nombre:<16} filas={len(filas):>7}  round trips={contador.total:>7}  "
+          f"mediana={tiempos[len(tiempos) // 2] * 1000:9.1f} ms  min={tiempos[0] * 1000:9.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sembrar", type=int, default=0, help="Inserta N reservas sintéticas antes de medir")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.sembrar:
+        DatabaseManager.run_query(SQL_SEMBRAR, (args.sembrar, ID_RESTAURANTE_ACTUAL, ID_RESTAURANTE_ACTUAL), commit=True)
+        print(f"Sembradas {args.sembrar} reservas")
+
+    medir("N+1 (antes)", cargar_n_mas_1, args.repeticiones)
+    medir("1 consulta", cargar_una_consulta, args.repeticiones)
+    medir("1a página", cargar_primera_pagina, args.repeticiones)
+    print("Pool:", DatabaseManager.estadisticas_pool())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Generador de datos sintéticos para el esquema SGR_*: mesas por zona, clientes y meses de reservas.
+Con la misma semilla, los mismos parámetros y la misma fecha de inicio genera exactamente los mismos datos.
+Las reservas activas de una mesa nunca se solapan (como si todas hubieran pasado por guardar_reserva).
+
+Uso:
+    python -m benchmarks.generador                                   # SQLite temporal
+    python -m benchmarks.generador --mesas 60 --clientes 5000 --meses 6 --semilla 3
+    python -m benchmarks.generador --sqlite /tmp/sgr.db --desde 2026-01-01
+    python -m benchmarks.generador --bd                              # BD configurada (SOLO desarrollo)
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from data.database import DatabaseManager
+from data.migraciones import aplicar_migraciones_pendientes
+from logic.reserva_controller import ReservaController
+from config.settings import ID_RESTAURANTE_ACTUAL, SQLITE_CONFIG
+
+NOMBRES = ("Ana", "Luis", "María", "Carlos", "Lucía", "José", "Sofía", "Diego", "Valeria", "Andrés", "Camila", "Jorge")
+APELLIDOS = ("Pérez", "García", "Mora", "Torres", "Vera", "Castro", "León", "Zambrano", "Cedeño", "Ortiz", "Ruiz")
+ZONAS = (("M", (2, 4, 4, 6)), ("T", (2, 2, 4)), ("VIP", (6, 8, 10)))  # Prefijo del nombre y capacidades posibles
+PARAMETROS = {'semilla': 1, 'mesas': 40, 'clientes': 2000, 'meses': 6, 'ocupacion': 0.5, 'desde': None}
+LOTE = 5000  # Filas por transacción al sembrar
+
+
+def desde_por_defecto(meses, referencia=None):
+    """Mitad del período hacia atrás y mitad hacia adelante de hoy: el monitor y la disponibilidad ven datos."""
+    hoy = (referencia or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    return hoy - timedelta(days=meses * 30 // 2)
+
+
+def generar(semilla=1, mesas=40, clientes=2000, meses=6, ocupacion=0.5, desde=None, ahora=None):
+    """
+    Datos en memoria, sin ids de BD (las referencias son posiciones en las listas):
+    {'mesas': [(Nmesa, capacidad)], 'clientes': [(nombre, apellido, cedula, telefono)],
+     'reservas': [(fechareserva, Npersonas, i_cliente, idEstadoreserva, i_mesa)]}
+    """
+    rnd = random.Random(semilla)
+    desde = desde or desde_por_defecto(meses)
+    ahora = ahora or desde + timedelta(days=meses * 30 // 2)  # Pasadas/futuras según desde, no según el reloj
+
+    lista_mesas = []
+    for i in range(mesas):
+        prefijo, capacidades = ZONAS[0] if i % 5 < 3 else ZONAS[1] if i % 5 == 3 else ZONAS[2]
+        lista_mesas.append((f"{prefijo}-{100 + i:03d}", rnd.choice(capacidades)))
+    lista_clientes = [(rnd.choice(NOMBRES), f"{rnd.choice(APELLIDOS)} {i}", f"S{semilla:03d}{i:07d}", f"09{rnd.randrange(10 ** 8):08d}")
+                      for i in range(clientes)]
+
+    reservas = []
+    for d in range(meses * 30):
+        dia = desde + timedelta(days=d)
+        for i_mesa, (_, capacidad) in enumerate(lista_mesas):
+            t = dia.replace(hour=12) + timedelta(minutes=rnd.choice((0, 30, 60)))
+            while t.hour <= 21:
+                if rnd.random() < ocupacion:
+                    if t < ahora:
+                        estado = 4 if rnd.random() < 0.85 else 3
+                    else:
+                        estado = rnd.choices((1, 2, 3), (6, 3, 1))[0]
+                    reservas.append((t, rnd.randint(1, capacidad), rnd.randrange(clientes), estado, i_mesa))
+                    t += timedelta(hours=2, minutes=rnd.choice((0, 15, 30, 60)))  # > 1h59m: nunca chocan
+                else:
+                    t += timedelta(hours=1)
+    return {'mesas': lista_mesas, 'clientes': lista_clientes, 'reservas': reservas}
+
+
+def sembrar(datos):
+    """Escribe los datos generados con executemany en lotes. Retorna {'mesas': [ids], 'clientes': [ids], 'reservas': n}."""
+    with DatabaseManager.transaccion() as uow:
+        ids_mesas = uow.insertar_lote(
+            "SGR_M_Mesa", "idMesa",
+            "INSERT INTO SGR_M_Mesa (idRestaurante, Nmesa, costo, capacidad, idEstadomesa) VALUES (?, ?, 0, ?, 1)",
+            [(ID_RESTAURANTE_ACTUAL, nombre, capacidad) for nombre, capacidad in datos['mesas']]
+        )
+        empleados = [f[0] for f in uow.consultar("SELECT idEmpleado FROM SGR_M_Empleado WHERE idRestaurante = ? ORDER BY idEmpleado",
+                                                  (ID_RESTAURANTE_ACTUAL,))] or [None]
+    ids_clientes = []
+    for i in range(0, len(datos['clientes']), LOTE):
+        with DatabaseManager.transaccion() as uow:
+            ids_clientes += uow.insertar_lote(
+                "SGR_M_Cliente", "idCliente",
+                """INSERT INTO SGR_M_Cliente (nombre, apellido, cedula, telefono, idCiudad, idRestaurante, idEstadocliente)
+                   VALUES (?, ?, ?, ?, 1, ?, 1)""",
+                [c + (ID_RESTAURANTE_ACTUAL,) for c in datos['clientes'][i:i + LOTE]]
+            )
+    reservas = datos['reservas']
+    for i in range(0, len(reservas), LOTE):
+        lote = reservas[i:i + LOTE]
+        with DatabaseManager.transaccion() as uow:
+            ids = uow.insertar_lote(
+                "SGR_T_Reserva", "idReserva",
+                """INSERT INTO SGR_T_Reserva (fechareserva, Npersonas, idCliente, idEmpleado, idEstadoreserva, idPolitica, idRestaurante)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [(fecha, pax, ids_clientes[i_cliente], empleados[n % len(empleados)], estado,
+                  ReservaController.calcular_politica(pax, estado), ID_RESTAURANTE_ACTUAL)
+                 for n, (fecha, pax, i_cliente, estado, _) in enumerate(lote)]
+            )
+            uow.ejecutar_lote("INSERT INTO SGR_T_DetalleReserva (idReserva, idMesa, Total) VALUES (?, ?, 0)",
+                              [(id_reserva, ids_mesas[r[4]]) for id_reserva, r in zip(ids, lote)])
+    return {'mesas': ids_mesas, 'clientes': ids_clientes, 'reservas': len(reservas)}
+
+
+def preparar_sqlite(ruta=None):
+    """Apunta DatabaseManager a un SQLite nuevo (temporal si no se da ruta) con el esquema y las migraciones."""
+    ruta = ruta or os.path.join(tempfile.mkdtemp(prefix="sgr_bench_"), "bench.db")
+    DatabaseManager.usar_backend("sqlite", dict(SQLITE_CONFIG, ruta=ruta))
+    aplicar_migraciones_pendientes()
+    return ruta
+
+
+def argumentos(parser):
+    """Parámetros del generador (compartidos con benchmarks.suite)."""
+    parser.add_argument("--semilla", type=int, default=PARAMETROS['semilla'])
+    parser.add_argument("--mesas", type=int, default=PARAMETROS['mesas'])
+    parser.add_argument("--clientes", type=int, default=PARAMETROS['clientes'])
+    parser.add_argument("--meses", type=int, default=PARAMETROS['meses'])
+    parser.add_argument("--ocupacion", type=float, default=PARAMETROS['ocupacion'], help="Probabilidad de que una franja libre se reserve")
+    parser.add_argument("--desde", type=datetime.fromisoformat, help="Primer día de datos (por defecto hoy - meses/2)")
+
+
+def parametros_de(args):
+    return {k: getattr(args, k) for k in PARAMETROS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argumentos(parser)
+    parser.add_argument("--sqlite", help="Ruta del archivo SQLite a crear/llenar")
+    parser.add_argument("--bd", action="store_true", help="Usa la BD configurada (solo una BD de desarrollo)")
+    args = parser.parse_args()
+
+    if not args.bd:
+        print(f"SQLite: {preparar_sqlite(args.sqlite)}")
+    inicio = time.perf_counter()
+    datos = generar(**parametros_de(args))
+    generado = time.perf_counter()
+    ids = sembrar(datos)
+    fin = time.perf_counter()
+    print(f"Generadas {len(ids['mesas'])} mesas, {len(ids['clientes'])} clientes y {ids['reservas']} reservas "
+          f"en {generado - inicio:.2f} s; sembradas en {fin - generado:.2f} s ({ids['reservas'] / (fin - generado):.0f} reservas/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Prueba del refresco incremental del monitor: revisiones del feed pedidas una tras otra (el sondeo periódico
+y una escritura propia casi a la vez) no pueden perder cambios. Todo idCambio de SGR_S_Cambio debe llegar
+a monitor.aplicar_cambios, usando los métodos reales de MainWindow y EjecutorBD (sin ventana: el after()
+de Tk se reemplaza por un bucle propio).
+
+Uso:
+    python -m benchmarks.prueba_feed_monitor                  # SQLite temporal (no toca datos reales)
+    python -m benchmarks.prueba_feed_monitor --rondas 50
+"""
+import argparse
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta
+from data.database import DatabaseManager
+from logic.notificaciones import FEED
+from logic.reserva_controller import ReservaController
+from ui.ejecutor import EjecutorBD
+from ui.main_window import MainWindow
+from benchmarks import generador
+
+
+class RaizSimulada:
+    """Lo que EjecutorBD usa de Tk (after / after_cancel), atendido con procesar() en vez de mainloop()."""
+    def __init__(self):
+        self._agenda = []
+        self._ids = itertools.count(1)
+        self._canceladas = set()
+
+    def after(self, ms, funcion):
+        id_after = next(self._ids)
+        heapq.heappush(self._agenda, (time.monotonic() + ms / 1000, id_after, funcion))
+        return id_after
+
+    def after_cancel(self, id_after):
+        self._canceladas.add(id_after)
+
+    def procesar(self, hasta, limite_s=10):
+        # Atiende los after() vencidos hasta que hasta() se cumpla
+        fin = time.monotonic() + limite_s
+        while not hasta():
+            if time.monotonic() > fin:
+                raise TimeoutError("El ejecutor no terminó a tiempo")
+            if self._agenda and self._agenda[0][0] <= time.monotonic():
+                _, id_after, funcion = heapq.heappop(self._agenda)
+                if id_after not in self._canceladas:
+                    funcion()
+            else:
+                time.sleep(0.002)
+
+
+class MonitorSimulado:
+    def __init__(self):
+        self.recibidos = []
+
+    def aplicar_cambios(self, cambios):
+        self.recibidos.extend(c[0] for c in cambios)
+
+
+class FormSimulado:
+    def verificar_disponibilidad(self):
+        pass
+
+
+class VentanaSimulada:
+    """Solo el flujo del feed de MainWindow, con sus métodos tal cual."""
+    _revisar_cambios = MainWindow._revisar_cambios
+    _al_recibir_cambios = MainWindow._al_recibir_cambios
+    _al_fallar_revision = MainWindow._al_fallar_revision
+    _fin_revision = MainWindow._fin_revision
+
+    def __init__(self, root):
+        self.root = root
+        self.ejecutor = EjecutorBD(root)
+        self.monitor = MonitorSimulado()
+        self.form = FormSimulado()
+        self._revision_en_curso = False
+        self._repetir_revision = False
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rondas", type=int, default=20)
+    args = parser.parse_args()
+
+    generador.preparar_sqlite()
+    mesa = DatabaseManager.run_query("SELECT MIN(idMesa) FROM SGR_M_Mesa", fetchone=True)[0]
+    FEED.revisar()  # Marca de agua inicial: lo que ya existe no cuenta
+    inicio = FEED.ultimo
+    root = RaizSimulada()
+    ventana = VentanaSimulada(root)
+    base = datetime(2099, 1, 1, 12)
+
+    for ronda in range(args.rondas):
+        id_reserva = ReservaController.guardar_reserva(base + timedelta(hours=3 * ronda), 2, 1, None, [mesa])
+        ventana._revisar_cambios()   # Sondeo periódico...
+        ReservaController.cambiar_estado(id_reserva, 2)
+        ventana._revisar_cambios()   # ...y, enseguida, el refresco tras una escritura propia
+        root.procesar(lambda: not ventana._revision_en_curso)
+    root.procesar(lambda: ventana.ejecutor._pendientes == 0)
+    ventana.ejecutor.cerrar()
+
+    esperados = [f[0] for f in DatabaseManager.run_query(
+        "SELECT idCambio FROM SGR_S_Cambio WHERE idCambio > ? ORDER BY idCambio", (inicio,), fetchall=True)]
+    perdidos = sorted(set(esperados) - set(ventana.monitor.recibidos))
+    print(f"{len(esperados)} cambios en el feed, {len(set(ventana.monitor.recibidos))} recibidos por el monitor")
+    assert not perdidos, f"El monitor no recibió los cambios {perdidos}"
+    print("OK: ningún cambio perdido")
+
+
+if __name__ == "__main__":
+    main()
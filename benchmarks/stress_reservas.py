@@ -0,0 +1,131 @@
+"""
+Prueba de estrés del guardado atómico: cientos de reservas concurrentes sobre las mismas mesas y franjas.
+Al final verifica que ninguna mesa quedó con dos reservas activas a menos de 1h59m, y mide el throughput.
+
+Uso:
+    python -m benchmarks.stress_reservas                     # SQLite temporal (no toca datos reales)
+    python -m benchmarks.stress_reservas --ingenuo           # flujo anterior (verificar y luego insertar): muestra los choques
+    python -m benchmarks.stress_reservas --bd                # BD configurada; usa una fecha lejana y borra lo que crea
+    python -m benchmarks.stress_reservas --hilos 16 --reservas 500 --mesas 6
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from data.database import DatabaseManager
+from logic.disponibilidad import MARGEN_RESERVA
+from logic.reserva_controller import ReservaController, ConflictoReservaError
+from config.settings import ID_RESTAURANTE_ACTUAL, SQLITE_CONFIG
+
+
+def preparar_sqlite(n_mesas):
+    ruta = os.path.join(tempfile.mkdtemp(prefix="sgr_stress_"), "stress.db")
+    DatabaseManager.usar_backend("sqlite", dict(SQLITE_CONFIG, ruta=ruta))
+    with DatabaseManager.transaccion() as uow:
+        uow.ejecutar("DELETE FROM SGR_M_Mesa WHERE idMesa NOT IN (SELECT idMesa FROM SGR_T_DetalleReserva)")
+        uow.ejecutar_lote(
+            "INSERT INTO SGR_M_Mesa (idRestaurante, Nmesa, costo, capacidad, idEstadomesa) VALUES (?, ?, 0, 4, 1)",
+            [(ID_RESTAURANTE_ACTUAL, f"S-{i:02d}") for i in range(1, n_mesas + 1)]
+        )
+    return ruta
+
+
+def mesas_de_prueba(n_mesas):
+    filas = DatabaseManager.run_query("SELECT idMesa FROM SGR_M_Mesa WHERE idRestaurante = ? ORDER BY idMesa",
+                                      (ID_RESTAURANTE_ACTUAL,), fetchall=True) or []
+    return [f[0] for f in filas][:n_mesas]
+
+
+def guardar_ingenuo(fecha_hora, pax, id_cliente, id_empleado, ids_mesas):
+    # Flujo anterior: la verificación es una lectura aparte, fuera de la transacción del INSERT
+    ocupadas = ReservaController.verificar_conflicto_mesas_bd(fecha_hora, ids_mesas)
+    if ocupadas: raise ConflictoReservaError(ocupadas)
+    time.sleep(0.001)  # La ventana entre leer y escribir (otra terminal, la red...)
+    with DatabaseManager.transaccion() as uow:
+        id_reserva = uow.insertar(
+            """INSERT INTO SGR_T_Reserva (fechareserva, Npersonas, idCliente, idEmpleado, idEstadoreserva, idPolitica, idRestaurante)
+               VALUES (?, ?, ?, ?, 1, 3, ?)""",
+            (fecha_hora, pax, id_cliente, id_empleado, ID_RESTAURANTE_ACTUAL)
+        )
+        uow.ejecutar_lote("INSERT INTO SGR_T_DetalleReserva (idReserva, idMesa, Total) VALUES (?, ?, 0)",
+                          [(id_reserva, m) for m in ids_mesas])
+    return id_reserva
+
+
+def solapamientos(desde, hasta):
+    """Pares (mesa, reserva, reserva) activos a menos del margen entre sí en [desde, hasta)."""
+    filas = DatabaseManager.run_query("""
+        SELECT DR.idMesa, R.fechareserva, R.idReserva
+        FROM SGR_T_DetalleReserva DR JOIN SGR_T_Reserva R ON DR.idReserva = R.idReserva
+        WHERE R.idEstadoreserva IN (1, 2, 4) AND R.fechareserva >= ? AND R.fechareserva < ?
+        ORDER BY DR.idMesa, R.fechareserva
+    """, (desde, hasta), fetchall=True) or []
+    choques = []
+    for anterior, actual in zip(filas, filas[1:]):
+        if anterior[0] == actual[0] and actual[1] - anterior[1] <= MARGEN_RESERVA:
+            choques.append((actual[0], anterior[2], actual[2]))
+    return choques
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--bd", action="store_true", help="Usa la BD configurada en vez de un SQLite temporal")
+    parser.add_argument("--ingenuo", action="store_true", help="Guarda con el flujo anterior (sin atomicidad)")
+    parser.add_argument("--hilos", type=int, default=16)
+    parser.add_argument("--reservas", type=int, default=400)
+    parser.add_argument("--mesas", type=int, default=6)
+    parser.add_argument("--semilla", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.bd:
+        dia = datetime(2099, 1, 1)  # Fecha sin reservas reales
+    else:
+        print(f"SQLite temporal: {preparar_sqlite(args.mesas)}")
+        dia = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+    mesas = mesas_de_prueba(args.mesas)
+    franjas = [dia.replace(hour=h, minute=m) for h in (19, 20, 21) for m in (0, 30)]
+    rnd = random.Random(args.semilla)
+    pedidos = [(rnd.choice(franjas), rnd.sample(mesas, rnd.choice((1, 1, 2)))) for _ in range(args.reservas)]
+
+    guardar = guardar_ingenuo if args.ingenuo else \
+        lambda t, pax, cli, emp, ids: ReservaController.guardar_reserva(t, pax, cli, emp, ids)
+
+    def reservar(pedido):
+        try:
+            return "ok", guardar(pedido[0], 2, 1, 1, pedido[1])
+        except ConflictoReservaError:
+            return "conflicto", None
+        except Exception as e:
+            return f"error {type(e).__name__}", None
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.hilos) as pool:
+        resultados = list(pool.map(reservar, pedidos))
+    segundos = time.perf_counter() - inicio
+
+    conteo = {}
+    for estado, _ in resultados:
+        conteo[estado] = conteo.get(estado, 0) + 1
+    choques = solapamientos(dia, dia + timedelta(days=1))
+    print(f"{args.reservas} intentos con {args.hilos} hilos sobre {len(mesas)} mesas x {len(franjas)} franjas "
+          f"({'flujo ingenuo' if args.ingenuo else 'guardado atómico'})")
+    print(f"resultados: {conteo}")
+    print(f"throughput: {args.reservas / segundos:.1f} intentos/s ({segundos * 1000 / args.reservas:.2f} ms c/u)")
+    print(f"solapamientos: {len(choques)} {choques[:5]}")
+
+    if args.bd:
+        creadas = [id_r for estado, id_r in resultados if estado == "ok"]
+        for id_reserva in creadas:
+            ReservaController.eliminar_reserva(id_reserva)
+        print(f"Limpieza: {len(creadas)} reservas de prueba eliminadas")
+
+    if not args.ingenuo:
+        assert not choques, "Hubo reservas dobles con el guardado atómico"
+        print("OK: cero reservas dobles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Suite de benchmarks reproducible: siembra datos sintéticos (benchmarks.generador) y mide las operaciones
+calientes de ReservaController: disponibilidad, conflictos, monitor, grilla, guardar y eliminar.
+Por escenario registra latencia p50/p95 y sentencias a la BD por operación (round trips, según la
+instrumentación de data/instrumentacion.py) y puede guardarlo como línea base JSON o compararse con una.
+
+Uso:
+    python -m benchmarks.suite                                       # SQLite temporal, parámetros por defecto
+    python -m benchmarks.suite --guardar                             # -> benchmarks/linea_base_sqlite.json
+    python -m benchmarks.suite --comparar                            # vs. benchmarks/linea_base_sqlite.json (con su --desde)
+    python -m benchmarks.suite --repeticiones 300 --mesas 80 --meses 12 --desde 2026-01-01
+    python -m benchmarks.suite --bd [--sembrar]                      # BD configurada (SOLO desarrollo)
+
+Para comparar entre cambios, usar la misma semilla y los mismos parámetros; --comparar sin --desde
+reutiliza el --desde guardado en la línea base.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from data.database import DatabaseManager
+from data.instrumentacion import INSTRUMENTACION
+from logic.reserva_controller import ReservaController
+from logic.disponibilidad import INDICE
+from logic.catalogos import MESAS
+from logic.notificaciones import FEED
+from logic.busqueda_clientes import buscar_clientes_bd
+from logic.reportes import Reportes
+from benchmarks import generador
+from config.settings import MONITOR_TAMANO_PAGINA
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+CALENTAMIENTO = 3  # Iteraciones descartadas antes de medir (cachés de planes, pool, catálogos)
+
+
+def percentil(ordenados, p):
+    # Nearest-rank sobre tiempos ya ordenados
+    return ordenados[min(len(ordenados) - 1, max(0, int(round(p * len(ordenados) + 0.5)) - 1))]
+
+
+def medir(funcion, repeticiones):
+    """Corre funcion(i) repeticiones veces. Retorna {'n', 'p50_ms', 'p95_ms', 'prom_ms', 'max_ms', 'round_trips'}."""
+    for i in range(CALENTAMIENTO):
+        funcion(-1 - i)
+    INSTRUMENTACION.reiniciar()
+    tiempos = []
+    for i in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(i)
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    sentencias = sum(s['n'] for s in INSTRUMENTACION.estadisticas()['sentencias'])
+    tiempos.sort()
+    return {
+        'n': repeticiones,
+        'p50_ms': round(percentil(tiempos, 0.50), 3), 'p95_ms': round(percentil(tiempos, 0.95), 3),
+        'prom_ms': round(sum(tiempos) / repeticiones, 3), 'max_ms': round(tiempos[-1], 3),
+        'round_trips': round(sentencias / repeticiones, 2)
+    }
+
+
+def escenarios(referencia, semilla):
+    """{nombre: función(i)}. referencia: "ahora" de los datos (mitad del período sembrado)."""
+    rnd = random.Random(semilla)
+    MESAS.actualizar(forzar=True)
+    mesas = [m[0] for m in MESAS.filas()]
+    hoy = referencia.replace(hour=0, minute=0, second=0, microsecond=0)
+    # Horas de consulta: próximos 14 días, franjas de 15 min entre 12:00 y 21:45
+    horas = [hoy + timedelta(days=rnd.randrange(14), hours=12, minutes=15 * rnd.randrange(40)) for _ in range(512)]
+    grupos = [rnd.sample(mesas, min(3, len(mesas))) for _ in range(512)]
+    # Lo que se teclea en el buscador: 2-4 letras de un nombre o apellido
+    prefijos = [rnd.choice(generador.NOMBRES + generador.APELLIDOS)[:rnd.randint(2, 4)] for _ in range(512)]
+    desde, hasta = ReservaController.ventana_monitor(referencia=referencia)
+    pagina = ReservaController.listar_reservas_monitor(desde, hasta, limite=MONITOR_TAMANO_PAGINA)
+    cursor = (pagina[-1][2], pagina[-1][0]) if pagina else None
+    Reportes.refrescar()  # El reporte solo lee los resúmenes: se dejan al día antes de medir
+
+    # Guardar/eliminar en un año sin datos: nunca chocan con lo sembrado ni entre sí
+    lejos = datetime(2099, 1, 1, 12)
+    creadas = []
+    def guardar(i):
+        fecha = lejos + timedelta(hours=3 * (i + CALENTAMIENTO))
+        creadas.append(ReservaController.guardar_reserva(fecha, 2, 1, None, [mesas[i % len(mesas)]]))
+    def eliminar(i):
+        ReservaController.eliminar_reserva(creadas.pop())
+
+    def disponibilidad_fria(i):
+        INDICE.invalidar()
+        ReservaController.obtener_mesas_disponibles(horas[i % 512])
+
+    return {
+        "disponibilidad (índice frío)": disponibilidad_fria,
+        "disponibilidad (índice caliente)": lambda i: ReservaController.obtener_mesas_disponibles(horas[i % 512]),
+        "disponibilidad (SQL)": lambda i: ReservaController.niveles_ocupacion_bd(horas[i % 512]),
+        "conflicto (SQL)": lambda i: ReservaController.verificar_conflicto_mesas_bd(horas[i % 512], grupos[i % 512]),
+        "conflicto (índice, recarga)": lambda i: ReservaController.verificar_conflicto_mesas(horas[i % 512], grupos[i % 512], forzar_recarga=True),
+        "monitor 1a página": lambda i: ReservaController.listar_reservas_monitor(desde, hasta, limite=MONITOR_TAMANO_PAGINA),
+        "monitor página siguiente": lambda i: ReservaController.listar_reservas_monitor(desde, hasta, cursor, MONITOR_TAMANO_PAGINA),
+        "grilla semana": lambda i: ReservaController.grilla_disponibilidad(hoy, 7),
+        "feed sin cambios": lambda i: FEED.revisar(),
+        "búsqueda clientes (BD)": lambda i: buscar_clientes_bd(prefijos[i % 512], 50),
+        # Todo el período sembrado (resúmenes ya refrescados al preparar los escenarios)
+        "reporte período completo": lambda i: Reportes.resumen(hoy - timedelta(days=183), hoy + timedelta(days=182), "mes"),
+        "guardar reserva": guardar,
+        "eliminar reserva": eliminar,  # Después de guardar: borra las que creó (incluidas las de calentamiento)
+    }
+
+
+def comparar(actual, base, tolerancia):
+    """Imprime base -> actual por escenario. Retorna la lista de regresiones."""
+    regresiones = []
+    print(f"\nComparación con la línea base del {base['generado']} ({base['backend']}):")
+    for nombre, r in actual['escenarios'].items():
+        b = base['escenarios'].get(nombre)
+        if not b:
+            print(f"  {nombre:<34} (nuevo)"); continue
+        marcas = []
+        if r['round_trips'] > b['round_trips']:
+            marcas.append(f"round trips {b['round_trips']} -> {r['round_trips']}")
+        # Margen absoluto de 0.5 ms: en operaciones de microsegundos el ruido supera cualquier porcentaje
+        if r['p95_ms'] > b['p95_ms'] * (1 + tolerancia) + 0.5:
+            marcas.append(f"p95 {b['p95_ms']} -> {r['p95_ms']} ms")
+        regresiones += [f"{nombre}: {m}" for m in marcas]
+        print(f"  {nombre:<34} p50 {b['p50_ms']:>8.3f} -> {r['p50_ms']:>8.3f} ms   p95 {b['p95_ms']:>8.3f} -> {r['p95_ms']:>8.3f} ms   "
+              f"rt {b['round_trips']:>5} -> {r['round_trips']:<5} {'<-- REGRESIÓN' if marcas else ''}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    generador.argumentos(parser)
+    parser.add_argument("--repeticiones", type=int, default=100)
+    parser.add_argument("--bd", action="store_true", help="BD configurada en vez de un SQLite temporal")
+    parser.add_argument("--sembrar", action="store_true", help="Con --bd: siembra los datos sintéticos antes de medir")
+    parser.add_argument("--guardar", nargs="?", const="", help="Escribe la línea base (por defecto benchmarks/linea_base_<motor>.json)")
+    parser.add_argument("--comparar", nargs="?", const="", help="Compara con una línea base (por defecto la del motor)")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Aumento relativo de p95 que se considera regresión")
+    args = parser.parse_args()
+
+    INSTRUMENTACION.activa = True
+    if not args.bd:
+        print(f"SQLite temporal: {generador.preparar_sqlite()}")
+    backend = DatabaseManager.backend().nombre
+    por_defecto = os.path.join(CARPETA, f"linea_base_{backend}.json")
+    base = None
+    if args.comparar is not None:
+        with open(args.comparar or por_defecto, encoding="utf-8") as f:
+            base = json.load(f)
+    parametros = generador.parametros_de(args)
+    # Sin --desde explícito, la comparación siembra desde el mismo día que la línea base (no desde hoy)
+    desde_base = base and base['datos'].get('desde')
+    parametros['desde'] = args.desde or (datetime.fromisoformat(desde_base) if desde_base
+                                         else generador.desde_por_defecto(args.meses))
+    if not args.bd or args.sembrar:
+        inicio = time.perf_counter()
+        ids = generador.sembrar(generador.generar(**parametros))
+        print(f"Sembradas {ids['reservas']} reservas, {len(ids['mesas'])} mesas y {len(ids['clientes'])} clientes "
+              f"en {time.perf_counter() - inicio:.1f} s")
+        referencia = parametros['desde'] + timedelta(days=args.meses * 30 // 2)
+    else:
+        referencia = datetime.now()
+
+    resultados = {}
+    for nombre, funcion in escenarios(referencia, args.semilla).items():
+        resultados[nombre] = r = medir(funcion, args.repeticiones)
+        print(f"{nombre:<34} p50 {r['p50_ms']:>8.3f} ms   p95 {r['p95_ms']:>8.3f} ms   round trips/op {r['round_trips']}")
+
+    actual = {
+        'generado': datetime.now().isoformat(timespec="seconds"), 'backend': backend,
+        'python': platform.python_version(), 'plataforma': platform.platform(),
+        'datos': dict(parametros, desde=parametros['desde'].date().isoformat()),
+        'repeticiones': args.repeticiones, 'escenarios': resultados
+    }
+    regresiones = []
+    if base is not None:
+        if base['datos'] != actual['datos']:
+            print(f"AVISO: la línea base usa otros datos {base['datos']}")
+        regresiones = comparar(actual, base, args.tolerancia)
+    if args.guardar is not None:
+        with open(args.guardar or por_defecto, "w", encoding="utf-8") as f:
+            json.dump(actual, f, ensure_ascii=False, indent=2)
+        print(f"Línea base guardada en {args.guardar or por_defecto}")
+    DatabaseManager.get_pool().cerrar_todo()
+
+    if regresiones:
+        print("\nREGRESIONES:\n  " + "\n  ".join(regresiones))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
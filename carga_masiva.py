@@ -0,0 +1,63 @@
+"""
+Importación / exportación masiva por CSV (alta de sucursales con miles de clientes y reservas).
+
+Uso:
+    python carga_masiva.py importar clientes clientes.csv [--lote 500]
+    python carga_masiva.py importar reservas reservas.csv [--lote 500] [--pasadas]
+    python carga_masiva.py exportar clientes clientes.csv
+    python carga_masiva.py exportar reservas reservas.csv [--desde 2026-01-01] [--hasta 2027-01-01]
+
+Columnas (encabezado obligatorio, mismo formato al exportar e importar):
+    clientes: nombre, apellido, cedula, telefono, id_ciudad
+    reservas: fecha_hora (AAAA-MM-DD HH:MM), n_personas, cedula_cliente o id_cliente, id_empleado,
+              estado (1..4, por defecto 1), mesas (nombres separados por |, p. ej. M-01|M-02)
+
+Las filas rechazadas se escriben en <archivo>.rechazos.csv con la línea y el motivo.
+"""
+import argparse
+import logging
+import sys
+from datetime import datetime
+from data.database import DatabaseManager
+from data.migraciones import aplicar_migraciones_pendientes
+from logic.carga_masiva import CargaMasiva, CargaInterrumpidaError
+from config.settings import CARGA_MASIVA_CONFIG, MIGRACIONES_AL_INICIAR
+
+ACCIONES = {
+    ("importar", "clientes"): lambda a: CargaMasiva.importar_clientes(a.archivo, a.lote),
+    ("importar", "reservas"): lambda a: CargaMasiva.importar_reservas(a.archivo, a.lote, permitir_pasadas=a.pasadas),
+    ("exportar", "clientes"): lambda a: CargaMasiva.exportar_clientes(a.archivo),
+    ("exportar", "reservas"): lambda a: CargaMasiva.exportar_reservas(a.archivo, a.desde, a.hasta),
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("accion", choices=("importar", "exportar"))
+    parser.add_argument("tabla", choices=("clientes", "reservas"))
+    parser.add_argument("archivo")
+    parser.add_argument("--lote", type=int, default=CARGA_MASIVA_CONFIG['lote'], help="filas por transacción")
+    parser.add_argument("--pasadas", action="store_true", help="aceptar reservas con fecha pasada (históricas)")
+    parser.add_argument("--desde", type=datetime.fromisoformat)
+    parser.add_argument("--hasta", type=datetime.fromisoformat)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if MIGRACIONES_AL_INICIAR and args.accion == "importar":
+        aplicar_migraciones_pendientes()
+    try:
+        resumen = ACCIONES[(args.accion, args.tabla)](args)
+    except CargaInterrumpidaError as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        DatabaseManager.get_pool().cerrar_todo()
+
+    if args.accion == "importar":
+        print(f"{resumen['leidas']} filas leídas, {resumen['insertadas']} insertadas, {resumen['rechazadas']} rechazadas "
+              f"en {resumen['segundos']:.2f} s ({resumen['filas_por_s']:.0f} filas/s)")
+        if resumen['rechazos']:
+            print(f"Rechazos: {resumen['rechazos']}")
+    else:
+        print(f"{resumen['exportadas']} filas exportadas a {resumen['archivo']} "
+              f"en {resumen['segundos']:.2f} s ({resumen['filas_por_s']:.0f} filas/s)")
@@ -1,3 +1,9 @@
+import os
+
+# Motor de BD: 'sqlserver' (producción) o 'sqlite' (local/offline, pruebas de carga).
+# Se puede cambiar sin editar este archivo con la variable de entorno SGR_BACKEND.
+DB_BACKEND = os.environ.get('SGR_BACKEND', 'sqlserver')
+
 # Configuración de la Base de Datos
 DB_CONFIG = {
     'driver': '{SQL Server}',
@@ -5,10 +11,128 @@ DB_CONFIG = {
     'database': 'ReservaRestaurante'
 }
 
+# Base local SQLite (DB_BACKEND = 'sqlite')
+SQLITE_CONFIG = {
+    'ruta': os.environ.get('SGR_SQLITE_RUTA', 'reservas_local.db'),  # Relativa a la raíz del proyecto
+    'busy_timeout': 5000,  # ms esperando el bloqueo de escritura
+    'pragmas': {
+        'journal_mode': 'WAL',       # Lectores no bloquean al escritor
+        'synchronous': 'NORMAL',     # Seguro con WAL y mucho más rápido que FULL
+        'foreign_keys': 'ON',
+        'cache_size': -20000,        # ~20 MB de caché de páginas
+        'temp_store': 'MEMORY',
+        'mmap_size': 268435456
+    }
+}
+
 # Configuración del Negocio
 ID_RESTAURANTE_ACTUAL = 1
 
 # Constantes de Diseño (Colores)
 COLOR_OCUPADA = {'bg': '#ffcccc', 'fg': 'darkred'}   # Rojo
 COLOR_RESERVADA = {'bg': '#fff3cd', 'fg': '#856404'} # Amarillo
-COLOR_DISPONIBLE = {'bg': 'white', 'fg': 'black'}    # Blanco
\ No newline at end of file
+COLOR_DISPONIBLE = {'bg': 'white', 'fg': 'black'}    # Blanco
+
+# Pool de Conexiones a la BD
+POOL_CONFIG = {
+    'tamano_max': 5,          # Conexiones abiertas como máximo (prestadas + libres)
+    'timeout_espera': 10,     # Segundos que se espera por una conexión libre
+    'max_inactividad': 300,   # Segundos ociosa antes de cerrarse
+    'validar_tras': 30,       # Segundos ociosa tras los que se hace un ping antes de reutilizarla
+    'sentencias_por_conexion': 32  # Cursores preparados que se reutilizan por conexión (LRU)
+}
+
+# Monitor de Reservas
+MONITOR_DIAS_VENTANA = 7      # Por defecto se muestran reservas de hoy ± N días
+MONITOR_TAMANO_PAGINA = 100   # Filas que se traen por página al hacer scroll
+MONITOR_MAX_PAGINAS = 3       # Páginas que se mantienen en la tabla; las que salen de la vista se descartan
+
+# Índice de Disponibilidad en memoria
+DISPONIBILIDAD_TTL = 60  # Segundos que vale la foto de un día antes de recargarla (cambios de otras terminales)
+
+# Migraciones de esquema (scripts/migraciones/NNN_*.sql)
+MIGRACIONES_AL_INICIAR = True  # Aplica las pendientes al arrancar app.py
+
+# Ejecutor de fondo (consultas fuera del hilo de Tk)
+EJECUTOR_CONFIG = {
+    'hilos': 3,              # Hilos de trabajo (no más que POOL_CONFIG['tamano_max'])
+    'intervalo_ms': 30,      # Cada cuánto Tk revisa si hay resultados listos
+    'debounce_ms': 250       # Espera antes de lanzar consultas disparadas por clics/teclas rápidas
+}
+
+# Catálogos en memoria (clientes, empleados, mesas)
+CATALOGO_TTL = 120  # Segundos entre sondas de cambios a la BD
+
+# Asignación automática de mesas (botón "Sugerir")
+ASIGNACION_CONFIG = {
+    'max_mesas': 4,           # Nunca se proponen más mesas que esto para un grupo
+    'por_zona': True          # Preferir mesas de la misma zona (prefijo del nombre: M-, VIP-, ...)
+}
+
+# Grilla de disponibilidad (mesas x franjas), mismo horario que el selector de hora del formulario
+GRILLA_CONFIG = {
+    'hora_inicio': 8,
+    'hora_fin': 22,           # Última hora en que se puede reservar (franjas hasta hora_fin:45)
+    'minutos_slot': 15
+}
+
+# Guardado atómico de reservas (verificación de conflicto + INSERT en la misma transacción)
+BLOQUEO_RESERVA_TIMEOUT_MS = 5000  # Espera máxima por el bloqueo de la franja horaria
+
+# Instrumentación de consultas (tiempos por SQL normalizado, log de consultas lentas)
+INSTRUMENTACION_CONFIG = {
+    'activa': True,
+    'umbral_lento_ms': 200,                           # Desde aquí la sentencia va al log de lentas
+    'archivo_lentas': 'logs/consultas_lentas.log',    # Relativo a la raíz del proyecto; rota por tamaño
+    'max_bytes': 1000000,
+    'respaldos': 3,
+    'archivo_volcado': 'logs/estadisticas_bd.json',   # Destino de "Volcar" y del volcado al salir
+    'volcar_al_salir': True
+}
+
+# Servidor HTTP/JSON (servidor.py): un proceso compartido por varias terminales
+SERVIDOR_CONFIG = {
+    'host': '127.0.0.1',      # Solo la máquina local; usar '0.0.0.0' para atender la red del local
+    'puerto': 8765,
+    'max_cuerpo': 65536       # Bytes máximos de un cuerpo JSON
+}
+
+# Feed de cambios (tabla SGR_S_Cambio, migración 002): refresco incremental entre terminales
+NOTIFICACIONES_CONFIG = {
+    'activas': True,
+    'intervalo_ms': 3000,     # Cada cuánto se consulta la marca de agua
+    'lote': 500,              # Cambios leídos por consulta
+    'retencion_horas': 24,    # Los cambios más viejos se purgan
+    'purgar_cada_s': 3600
+}
+
+# Importación / exportación masiva por CSV (carga_masiva.py)
+CARGA_MASIVA_CONFIG = {
+    'lote': 500,                  # Filas por transacción al importar (un executemany por tabla)
+    'filas_por_pagina': 2000,     # fetchmany al exportar
+    'delimitador': ',',
+    'separador_mesas': '|',       # Columna "mesas": M-01|M-02
+    'codificacion': 'utf-8-sig'   # Con BOM: Excel abre bien las tildes
+}
+
+# Arranque rápido: la ventana se pinta primero y los datos llegan por detrás
+ARRANQUE_CONFIG = {
+    'instantanea_catalogos': 'cache/catalogos.pickle',  # Últimos catálogos en disco (relativo a la raíz; None = no usar)
+    'calendario_diferido': True   # tkcalendar se importa en segundo plano tras el primer pintado
+}
+
+# Búsqueda incremental de clientes en el formulario (migración 003: índices por nombre, apellido, cédula y teléfono)
+BUSQUEDA_CLIENTES_CONFIG = {
+    'min_caracteres': 2,      # Con menos no se consulta (una letra coincide con media tabla)
+    'limite': 50,             # Sugerencias por página
+    'ttl': 60,                # Segundos que vale un prefijo en caché (después se ven los clientes nuevos)
+    'max_prefijos': 200       # Entradas del caché LRU
+}
+
+# Reportes de gestión sobre resúmenes diarios (migración 004; ver logic/reportes.py)
+REPORTES_CONFIG = {
+    'minutos_por_reserva': 120,   # Tiempo que una reserva ocupa la mesa, para el % de ocupación
+    'dias_por_transaccion': 31,   # Días recalculados por transacción (bloqueos cortos para las terminales)
+    'refrescar_cada_s': 300,      # Refresco en segundo plano en app.py y servidor.py (0 = solo "python reportes.py refrescar")
+    'dias_por_defecto': 30        # Rango inicial del visor: últimos N días
+}
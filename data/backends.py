@@ -0,0 +1,164 @@
+import os
+import sqlite3
+import threading
+import zlib
+from datetime import date, datetime
+from data.dialecto import DialectoSQLServer, DialectoSQLite
+
+RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class BackendSQLServer:
+    """Motor principal: SQL Server vía pyodbc (se importa recién al conectar)."""
+    nombre = "sqlserver"
+    dialecto = DialectoSQLServer
+
+    def __init__(self, config):
+        self.config = config
+
+    @property
+    def errores(self):
+        import pyodbc
+        return pyodbc.Error
+
+    def conectar(self):
+        import pyodbc
+        return pyodbc.connect(
+            f"DRIVER={self.config['driver']};SERVER={self.config['server']};DATABASE={self.config['database']};Trusted_Connection=yes;"
+        )
+
+    @staticmethod
+    def conexion_rota(error):
+        # SQLSTATE 08xxx = errores de enlace/conexión: la conexión no se devuelve al pool
+        return bool(error.args) and str(error.args[0]).startswith('08')
+
+    @staticmethod
+    def iniciar_transaccion(conn):
+        pass  # pyodbc abre la transacción implícitamente (autocommit desactivado)
+
+    @staticmethod
+    def insertar(cursor, sql, params):
+        cursor.execute(DialectoSQLServer.sql_insertar_con_identidad(sql), params)
+        return int(cursor.fetchone()[0])
+
+    @staticmethod
+    def bloquear(cursor, recursos, timeout_ms):
+        # Todos los sp_getapplock en un solo lote (un viaje), en orden; se detiene en el primero no concedido.
+        # Ligados a la transacción: se sueltan solos con el commit/rollback. Retorna cuántos se concedieron
+        pedir = "EXEC @r = sp_getapplock @Resource = ?, @LockMode = 'Exclusive', @LockOwner = 'Transaction', @LockTimeout = @espera;\n" \
+                "IF @r < 0 GOTO fin; SET @n = @n + 1;\n"
+        cursor.execute("SET NOCOUNT ON;\nDECLARE @r INT, @n INT = 0, @espera INT = ?;\n"
+                       + pedir * len(recursos) + "fin: SELECT @n;", (timeout_ms, *recursos))
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def bloquear_tabla(cursor, tabla):
+        # U a nivel de tabla hasta el commit: se puede leer, pero nadie más inserta (identidades consecutivas)
+        cursor.execute(f"SELECT TOP 0 1 FROM {tabla} WITH (UPDLOCK, TABLOCK, HOLDLOCK)")
+        cursor.fetchall()
+
+    @staticmethod
+    def preparar_lote(cursor):
+        cursor.fast_executemany = True  # Arreglo de parámetros ODBC: un viaje para todas las filas
+
+    @staticmethod
+    def descartar_resultados(cursor):
+        # Descartar lo no leído sin perder la sentencia preparada (libera la conexión para otro cursor)
+        while cursor.nextset(): pass
+
+
+class _ChecksumAgg:
+    """Equivalente local de CHECKSUM_AGG: XOR de los checksums de cada fila."""
+    def __init__(self):
+        self.valor = None
+
+    def step(self, checksum):
+        if checksum is not None:
+            self.valor = (self.valor or 0) ^ checksum
+
+    def finalize(self):
+        return self.valor
+
+
+def _checksum(*valores):
+    return zlib.crc32(repr(valores).encode("utf-8"))
+
+
+class BackendSQLite:
+    """
+    Motor local (archivo .db) con el mismo esquema SGR_*: operación offline de una sucursal,
+    pruebas de carga y benchmarks sin SQL Server. WAL permite lectores concurrentes con un escritor.
+    """
+    nombre = "sqlite"
+    dialecto = DialectoSQLite
+    errores = sqlite3.Error
+    ESQUEMA = os.path.join(RAIZ_PROYECTO, "scripts", "esquema_sqlite.sql")
+
+    def __init__(self, config):
+        self.config = config
+        self.ruta = config['ruta'] if os.path.isabs(config['ruta']) else os.path.join(RAIZ_PROYECTO, config['ruta'])
+        self._inicializada = False
+        self._lock = threading.Lock()
+
+    def conectar(self):
+        conn = sqlite3.connect(self.ruta, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False,
+                               isolation_level=None, timeout=self.config.get('busy_timeout', 5000) / 1000)
+        for pragma, valor in self.config.get('pragmas', {}).items():
+            conn.execute(f"PRAGMA {pragma} = {valor}")
+        conn.create_function("sgr_checksum", -1, _checksum, deterministic=True)
+        conn.create_aggregate("sgr_checksum_agg", 1, _ChecksumAgg)
+        with self._lock:
+            if not self._inicializada:
+                self._crear_esquema(conn)
+                self._inicializada = True
+        return conn
+
+    def _crear_esquema(self, conn):
+        existe = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'SGR_T_Reserva'").fetchone()
+        if not existe:
+            with open(self.ESQUEMA, encoding="utf-8") as f:
+                conn.executescript(f.read())
+
+    @staticmethod
+    def conexion_rota(error):
+        return False  # Archivo local: no hay enlace que se caiga
+
+    @staticmethod
+    def iniciar_transaccion(conn):
+        # IMMEDIATE toma el bloqueo de escritura al empezar: dos escritores no se cruzan a mitad
+        conn.execute("BEGIN IMMEDIATE")
+
+    @staticmethod
+    def insertar(cursor, sql, params):
+        cursor.execute(sql, params)
+        return cursor.lastrowid
+
+    @staticmethod
+    def bloquear(cursor, recursos, timeout_ms):
+        return len(recursos)  # BEGIN IMMEDIATE ya dejó a esta transacción como único escritor de la base
+
+    @staticmethod
+    def bloquear_tabla(cursor, tabla):
+        pass  # Idem: ya no hay otro escritor
+
+    @staticmethod
+    def preparar_lote(cursor):
+        pass  # executemany de sqlite3 ya reutiliza la sentencia preparada
+
+    @staticmethod
+    def descartar_resultados(cursor):
+        pass
+
+
+# Fechas como texto ISO: se ordenan y comparan igual que en SQL Server
+sqlite3.register_adapter(datetime, lambda d: d.strftime("%Y-%m-%d %H:%M:%S"))
+sqlite3.register_adapter(date, lambda d: d.isoformat())
+sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
+sqlite3.register_converter("DATE", lambda b: date.fromisoformat(b.decode()))
+
+
+BACKENDS = {BackendSQLServer.nombre: BackendSQLServer, BackendSQLite.nombre: BackendSQLite}
+
+
+def crear_backend(nombre, config):
+    return BACKENDS[nombre](config)
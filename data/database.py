@@ -1,55 +1,481 @@
-import pyodbc
-from tkinter import messagebox
-from config.settings import DB_CONFIG
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+import logging
+from data.backends import crear_backend
+from data.instrumentacion import INSTRUMENTACION
+from config.settings import DB_BACKEND, DB_CONFIG, SQLITE_CONFIG, POOL_CONFIG
+
+log = logging.getLogger(__name__)
+MAX_PARAMETROS_IN = 1000  # SQL Server admite 2100 parámetros por sentencia: listas más largas se parten en tandas
+
+class PoolAgotadoError(Exception):
+    """No se liberó ninguna conexión dentro del tiempo de espera configurado."""
+
+
+class BloqueoNoObtenidoError(Exception):
+    """Otra transacción retuvo el bloqueo de aplicación más allá del tiempo de espera."""
+
+
+class ConnectionPool:
+    """
+    Pool acotado y thread-safe de conexiones.
+    Reutiliza conexiones ociosas (LIFO), les hace un ping si llevan tiempo sin usarse
+    y cierra las que superan el máximo de inactividad.
+    Además guarda por conexión un LRU de cursores por texto SQL: el driver solo vuelve a
+    preparar la sentencia cuando el SQL del cursor cambia, así que reutilizarlos ahorra el prepare.
+    """
+    def __init__(self, fabrica, tamano_max=5, timeout_espera=10, max_inactividad=300, validar_tras=30,
+                 sentencias_por_conexion=32):
+        self.fabrica = fabrica
+        self.tamano_max = tamano_max
+        self.timeout_espera = timeout_espera
+        self.max_inactividad = max_inactividad
+        self.validar_tras = validar_tras
+        self.sentencias_por_conexion = sentencias_por_conexion
+        self._cursores = {}  # id(conexion) -> OrderedDict(sql -> cursor)
+        self._libres = []   # [(conexion, instante_ultimo_uso)]
+        self._abiertas = 0  # Prestadas + libres
+        self._cond = threading.Condition()
+        self._stats = {'hits': 0, 'misses': 0, 'esperas': 0, 'tiempo_espera': 0.0,
+                       'timeouts': 0, 'descartadas': 0, 'cerradas_inactivas': 0,
+                       'sentencias_reutilizadas': 0, 'sentencias_preparadas': 0}
+
+    def adquirir(self):
+        inicio = time.perf_counter()
+        limite = inicio + self.timeout_espera
+        while True:
+            conn, ultimo_uso = None, None
+            with self._cond:
+                ya_espero = False
+                while True:
+                    self._cerrar_inactivas()
+                    if self._libres:
+                        conn, ultimo_uso = self._libres.pop()
+                        self._stats['hits'] += 1
+                        break
+                    if self._abiertas < self.tamano_max:
+                        self._abiertas += 1  # Reservamos el cupo antes de conectar
+                        self._stats['misses'] += 1
+                        break
+                    restante = limite - time.perf_counter()
+                    if restante <= 0:
+                        self._stats['timeouts'] += 1
+                        raise PoolAgotadoError(f"Sin conexiones libres tras {self.timeout_espera}s")
+                    if not ya_espero:
+                        self._stats['esperas'] += 1
+                        ya_espero = True
+                    self._cond.wait(restante)
+                self._stats['tiempo_espera'] += time.perf_counter() - inicio
+
+            if conn is None:
+                try:
+                    return self.fabrica()
+                except Exception:
+                    self._liberar_cupo()
+                    raise
+
+            # Ping solo si estuvo ociosa un rato (evita un round trip en cada préstamo)
+            if time.monotonic() - ultimo_uso < self.validar_tras or self._esta_viva(conn):
+                return conn
+            self._descartar(conn)
+
+    def liberar(self, conn, descartar=False):
+        if not descartar:
+            try:
+                conn.rollback()  # Nunca devolver una conexión con transacción abierta
+            except Exception:
+                descartar = True
+        if descartar:
+            return self._descartar(conn)
+        with self._cond:
+            self._libres.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def cursor_para(self, conn, sql):
+        """Cursor de conn dedicado a este texto SQL (reutilizado si ya existía)."""
+        with self._cond:
+            cache = self._cursores.setdefault(id(conn), OrderedDict())
+        cursor = cache.get(sql)
+        if cursor is not None:
+            cache.move_to_end(sql)
+            with self._cond:
+                self._stats['sentencias_reutilizadas'] += 1
+            return cursor
+        cursor = cache[sql] = conn.cursor()
+        with self._cond:
+            self._stats['sentencias_preparadas'] += 1
+        if len(cache) > self.sentencias_por_conexion:
+            _, viejo = cache.popitem(last=False)
+            try:
+                viejo.close()
+            except Exception:
+                pass
+        return cursor
+
+    def olvidar_cursor(self, conn, sql):
+        # Tras un error el cursor no se reutiliza
+        with self._cond:
+            cache = self._cursores.get(id(conn))
+        cursor = cache.pop(sql, None) if cache else None
+        if cursor is not None:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    def cerrar_todo(self):
+        with self._cond:
+            libres, self._libres = self._libres, []
+            self._abiertas -= len(libres)
+            self._cond.notify_all()
+        for conn, _ in libres:
+            self._cerrar(conn)
+
+    def estadisticas(self):
+        with self._cond:
+            datos = dict(self._stats)
+            datos['abiertas'] = self._abiertas
+            datos['libres'] = len(self._libres)
+        total = datos['hits'] + datos['misses']
+        datos['tasa_hits'] = datos['hits'] / total if total else 0.0
+        datos['espera_promedio_ms'] = datos['tiempo_espera'] * 1000 / total if total else 0.0
+        return datos
+
+    # --- Internos ---
+    def _cerrar_inactivas(self):
+        # Se llama con el lock tomado. Las más viejas están al inicio de la lista.
+        ahora = time.monotonic()
+        while self._libres and ahora - self._libres[0][1] > self.max_inactividad:
+            conn, _ = self._libres.pop(0)
+            self._abiertas -= 1
+            self._stats['cerradas_inactivas'] += 1
+            self._cerrar(conn)
+
+    def _descartar(self, conn):
+        self._cerrar(conn)
+        with self._cond:
+            self._stats['descartadas'] += 1
+        self._liberar_cupo()
+
+    def _liberar_cupo(self):
+        with self._cond:
+            self._abiertas -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _esta_viva(conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1").fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _cerrar(self, conn):
+        with self._cond:
+            self._cursores.pop(id(conn), None)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+class UnidadTrabajo:
+    """
+    Varias sentencias sobre UNA conexión y UN solo commit (lo hace DatabaseManager.transaccion).
+    Si algo falla, no queda nada a medias: se hace rollback de todo.
+    """
+    def __init__(self, conn, backend, espera=0.0):
+        self.conn = conn
+        self.backend = backend
+        self.cursor = conn.cursor()
+        self._espera = espera  # Lo que tardó el pool en dar la conexión; se anota en la primera sentencia
+
+    def ejecutar(self, sql, params=()):
+        with self._medir(sql) as medida:
+            self.cursor.execute(sql, params)
+            medida['filas'] = self.cursor.rowcount
+        return self.cursor.rowcount
+
+    def insertar(self, sql, params=()):
+        # INSERT de una sola fila que devuelve la identidad generada (SCOPE_IDENTITY / lastrowid)
+        with self._medir(sql) as medida:
+            medida['filas'] = 1
+            return self.backend.insertar(self.cursor, sql, params)
+
+    def ejecutar_lote(self, sql, filas):
+        # Un solo viaje con todas las filas (fast_executemany en ODBC)
+        filas = list(filas)
+        if not filas: return 0
+        with self._medir(sql) as medida:
+            self.backend.preparar_lote(self.cursor)
+            self.cursor.executemany(sql, filas)
+            medida['filas'] = len(filas)
+        return len(filas)
+
+    def insertar_lote(self, tabla, columna_id, sql, filas):
+        """
+        ejecutar_lote que además retorna las identidades generadas, en el orden de filas.
+        executemany no las devuelve: se bloquea la tabla hasta el commit y las nuevas son las > MAX(id) previo.
+        """
+        filas = list(filas)
+        if not filas: return []
+        self.bloquear_tabla(tabla)
+        ultimo = self.consultar(f"SELECT MAX({columna_id}) FROM {tabla}", fetchone=True)[0] or 0
+        self.ejecutar_lote(sql, filas)
+        ids = [f[0] for f in self.consultar(
+            f"SELECT {columna_id} FROM {tabla} WHERE {columna_id} > ? ORDER BY {columna_id}", (ultimo,))]
+        if len(ids) != len(filas):
+            raise RuntimeError(f"{tabla}: se esperaban {len(filas)} identidades nuevas y hay {len(ids)}")
+        return ids
+
+    def consultar(self, sql, params=(), fetchone=False):
+        with self._medir(sql) as medida:
+            self.cursor.execute(sql, params)
+            resultado = self.cursor.fetchone() if fetchone else self.cursor.fetchall()
+            medida['filas'] = (resultado is not None) if fetchone else len(resultado)
+        return resultado
+
+    def bloquear(self, recursos, timeout_ms):
+        """Bloqueos exclusivos con nombre hasta el fin de la transacción (siempre en orden: sin deadlocks)."""
+        recursos = sorted(set(recursos))
+        # Un viaje por trozo (no uno por recurso): una carga masiva pide cientos de franjas a la vez
+        for i in range(0, len(recursos), MAX_PARAMETROS_IN - 1):
+            trozo = recursos[i:i + MAX_PARAMETROS_IN - 1]
+            with self._medir("sp_getapplock") as medida:
+                concedidos = self.backend.bloquear(self.cursor, trozo, timeout_ms)
+                medida['filas'] = concedidos
+                medida['error'] = concedidos < len(trozo)
+            if concedidos < len(trozo):
+                raise BloqueoNoObtenidoError(f"No se obtuvo el bloqueo '{trozo[concedidos]}' en {timeout_ms} ms")
+
+    def bloquear_tabla(self, tabla):
+        """Nadie más inserta en la tabla hasta el fin de la transacción (cargas masivas que releen sus identidades)."""
+        with self._medir(f"LOCK {tabla}"):
+            self.backend.bloquear_tabla(self.cursor, tabla)
+
+    @contextmanager
+    def _medir(self, sql):
+        medida = {'filas': 0, 'error': False}
+        inicio = time.perf_counter()
+        try:
+            yield medida
+        except BaseException:
+            medida['error'] = True
+            raise
+        finally:
+            INSTRUMENTACION.registrar(sql, time.perf_counter() - inicio, medida['filas'], self._espera, medida['error'])
+            self._espera = 0.0
+
 
 class DatabaseManager:
+    _backend = None
+    _pool = None
+    _pool_lock = threading.Lock()
+    manejador_errores = None  # callable(titulo, detalle); la UI instala uno que muestra messagebox
+
+    @staticmethod
+    def reportar_error(titulo, detalle):
+        # Sin UI (scripts, benchmarks, servidor) los errores van al log
+        if DatabaseManager.manejador_errores:
+            DatabaseManager.manejador_errores(titulo, detalle)
+        else:
+            log.error("%s: %s", titulo, detalle)
+
+    @staticmethod
+    def backend():
+        if DatabaseManager._backend is None:
+            with DatabaseManager._pool_lock:
+                if DatabaseManager._backend is None:
+                    config = SQLITE_CONFIG if DB_BACKEND == 'sqlite' else DB_CONFIG
+                    DatabaseManager._backend = crear_backend(DB_BACKEND, config)
+        return DatabaseManager._backend
+
+    @staticmethod
+    def dialecto():
+        return DatabaseManager.backend().dialecto
+
+    @staticmethod
+    def usar_backend(nombre, config):
+        """Cambia de motor en caliente (scripts de carga, benchmarks). Cierra el pool anterior."""
+        with DatabaseManager._pool_lock:
+            if DatabaseManager._pool is not None:
+                DatabaseManager._pool.cerrar_todo()
+            DatabaseManager._backend = crear_backend(nombre, config)
+            DatabaseManager._pool = None
+
     @staticmethod
     def get_connection():
+        # Conexión suelta (fuera del pool); quien la pide debe cerrarla
+        backend = DatabaseManager.backend()
         try:
-            conn = pyodbc.connect(
-                f"DRIVER={DB_CONFIG['driver']};SERVER={DB_CONFIG['server']};DATABASE={DB_CONFIG['database']};Trusted_Connection=yes;"
-            )
-            return conn
-        except pyodbc.Error as e:
-            messagebox.showerror("Error Crítico", f"No se pudo conectar a la BD:\n{e}")
+            return backend.conectar()
+        except backend.errores as e:
+            DatabaseManager.reportar_error("Error Crítico", f"No se pudo conectar a la BD:\n{e}")
             return None
 
     @staticmethod
-    def run_query(query, params=(), fetchone=False, fetchall=False, commit=False):
-        conn = DatabaseManager.get_connection()
-        if not conn: return None
-        
-        cursor = conn.cursor()
+    def get_pool():
+        if DatabaseManager._pool is None:
+            backend = DatabaseManager.backend()
+            with DatabaseManager._pool_lock:
+                if DatabaseManager._pool is None:
+                    DatabaseManager._pool = ConnectionPool(backend.conectar, **POOL_CONFIG)
+        return DatabaseManager._pool
+
+    @staticmethod
+    def estadisticas_pool():
+        return DatabaseManager.get_pool().estadisticas()
+
+    @staticmethod
+    @contextmanager
+    def transaccion():
+        """
+        Uso:
+            with DatabaseManager.transaccion() as uow:
+                uow.ejecutar(...); uow.ejecutar_lote(...)
+        Commit al salir del bloque; rollback y re-lanza la excepción si algo falla.
+        """
+        backend = DatabaseManager.backend()
+        pool = DatabaseManager.get_pool()
+        inicio = time.perf_counter()
+        conn = pool.adquirir()
+        espera = time.perf_counter() - inicio
+        descartar = False
+        try:
+            backend.iniciar_transaccion(conn)
+            uow = UnidadTrabajo(conn, backend, espera)
+        except backend.errores as e:
+            pool.liberar(conn, backend.conexion_rota(e))
+            raise
+        try:
+            yield uow
+            with uow._medir("COMMIT"):
+                conn.commit()
+        except backend.errores as e:
+            descartar = backend.conexion_rota(e)
+            if not descartar: conn.rollback()
+            raise
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            try:
+                uow.cursor.close()
+            except backend.errores:
+                descartar = True
+            pool.liberar(conn, descartar)
+
+    @staticmethod
+    def consultar_por_lotes(query, params=(), tamano=1000):
+        """
+        Generador de páginas de filas (fetchmany): el resultado se va leyendo del servidor a medida
+        que se consume, sin cargarlo entero en memoria (exportaciones). La conexión queda prestada
+        hasta agotar o cerrar el generador. Los errores se propagan a quien itera.
+        """
+        backend = DatabaseManager.backend()
+        pool = DatabaseManager.get_pool()
+        inicio = time.perf_counter()
+        conn = pool.adquirir()
+        espera = time.perf_counter() - inicio
+        cursor = conn.cursor()  # Cursor propio: no se mezcla con el LRU de sentencias preparadas
+        filas, error, descartar = 0, False, False
+        inicio = time.perf_counter()
+        try:
+            cursor.execute(query, params)
+            while True:
+                pagina = cursor.fetchmany(tamano)
+                if not pagina: break
+                filas += len(pagina)
+                yield pagina
+        except backend.errores as e:
+            error = True
+            descartar = backend.conexion_rota(e)
+            raise
+        finally:
+            # El tiempo incluye lo que tarda quien consume (p. ej. escribir a disco)
+            INSTRUMENTACION.registrar(query, time.perf_counter() - inicio, filas, espera, error)
+            try:
+                cursor.close()
+            except backend.errores:
+                descartar = True
+            pool.liberar(conn, descartar)
+
+    @staticmethod
+    def parametros_in(valores):
+        """
+        Marcadores para un IN (...) con aridad fija: la lista se rellena con NULL hasta la
+        siguiente potencia de 2 (mín. 4). Así hay pocos textos SQL distintos (reutilizan plan)
+        y los valores nunca se interpolan en el SQL.
+        Retorna ("?, ?, ?, ?", [v1, v2, None, None])
+        """
+        valores = list(valores)
+        tamano = 4
+        while tamano < len(valores):
+            tamano *= 2
+        return ", ".join("?" * tamano), valores + [None] * (tamano - len(valores))
+
+    @staticmethod
+    def run_query(query, params=(), fetchone=False, fetchall=False, commit=False, reportar=True):
+        # reportar=False: los errores solo van al log (consultas periódicas que no deben llenar la pantalla de avisos)
+        avisar = DatabaseManager.reportar_error if reportar else lambda titulo, detalle: log.warning("%s: %s", titulo, detalle)
+        backend = DatabaseManager.backend()
+        pool = DatabaseManager.get_pool()
+        inicio = time.perf_counter()
+        try:
+            conn = pool.adquirir()
+        except (backend.errores, PoolAgotadoError) as e:
+            INSTRUMENTACION.registrar(query, 0.0, espera=time.perf_counter() - inicio, error=True)
+            avisar("Error Crítico", f"No se pudo conectar a la BD:\n{e}")
+            return None
+        espera = time.perf_counter() - inicio
+
         result = None
+        descartar = False
+        filas, error = 0, False
+        inicio = time.perf_counter()
         try:
+            cursor = pool.cursor_para(conn, query)
             cursor.execute(query, params)
-            
+
             # --- CORRECCIÓN CRÍTICA AQUÍ ---
             if "SCOPE_IDENTITY" in query:
                 # 1. Si pedimos un ID nuevo, lo leemos ANTES de hacer commit
                 row = cursor.fetchone()
                 if row:
                     result = int(row[0]) # Convertimos explícitamente a Entero
-                
+
                 # 2. Luego confirmamos la transacción
                 if commit: conn.commit()
-            
+
             elif commit:
                 # Si es un INSERT/UPDATE/DELETE normal
+                filas = cursor.rowcount
                 conn.commit()
                 result = True
-            
+
             elif fetchone:
                 result = cursor.fetchone()
-            
+                filas = int(result is not None)
+
             elif fetchall:
                 result = cursor.fetchall()
-                
-        except pyodbc.Error as e:
-            if commit: conn.rollback()
-            messagebox.showerror("Error SQL", f"Detalle del error:\n{e}")
+                filas = len(result)
+
+            backend.descartar_resultados(cursor)
+
+        except backend.errores as e:
+            error = True
+            descartar = backend.conexion_rota(e)
+            if not descartar:
+                pool.olvidar_cursor(conn, query)
+                if commit: conn.rollback()
+            avisar("Error SQL", f"Detalle del error:\n{e}")
         finally:
-            cursor.close()
-            conn.close()
-            
-        return result
\ No newline at end of file
+            INSTRUMENTACION.registrar(query, time.perf_counter() - inicio, filas, espera, error)
+            pool.liberar(conn, descartar)
+
+        return result
@@ -0,0 +1,109 @@
+class DialectoSQLServer:
+    """Fragmentos de SQL que cambian entre motores. Los controladores arman sus consultas con esto."""
+    nombre = "sqlserver"
+
+    @staticmethod
+    def concat(*partes):
+        return " + ".join(partes)
+
+    @staticmethod
+    def isnull(expr, defecto):
+        return f"ISNULL({expr}, {defecto})"
+
+    @staticmethod
+    def agregar_texto(expr, separador="', '"):
+        return f"STRING_AGG({expr}, {separador})"
+
+    @staticmethod
+    def fecha_de(expr):
+        # Día (sin hora) de un DATETIME
+        return f"CAST({expr} AS DATE)"
+
+    @staticmethod
+    def leer_confirmado(tabla):
+        # Espera a las filas aún sin confirmar en vez de saltarlas (también si la BD usa READ_COMMITTED_SNAPSHOT)
+        return f"{tabla} WITH (READCOMMITTEDLOCK)"
+
+    @staticmethod
+    def primeras_filas():
+        # Va después del ORDER BY; el tamaño se pasa como último parámetro
+        return "OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY"
+
+    @staticmethod
+    def parametro_texto(largo):
+        # pyodbc manda str como NVARCHAR: contra una columna VARCHAR eso convierte la columna y no usa el índice
+        return f"CAST(? AS VARCHAR({largo}))"
+
+    @staticmethod
+    def checksum(*columnas):
+        return f"BINARY_CHECKSUM({', '.join(columnas)})"
+
+    @staticmethod
+    def checksum_agg(expr):
+        return f"CHECKSUM_AGG({expr})"
+
+    @staticmethod
+    def sql_insertar_con_identidad(sql):
+        return f"SET NOCOUNT ON; {sql}; SELECT SCOPE_IDENTITY();"
+
+    sql_tabla_migraciones = """
+    IF OBJECT_ID('SGR_S_Migracion') IS NULL
+    CREATE TABLE SGR_S_Migracion (
+        version INT NOT NULL PRIMARY KEY,
+        nombre VARCHAR(200) NOT NULL,
+        fechaaplicada DATETIME NOT NULL DEFAULT GETDATE()
+    )
+    """
+
+
+class DialectoSQLite(DialectoSQLServer):
+    nombre = "sqlite"
+
+    @staticmethod
+    def concat(*partes):
+        return " || ".join(partes)
+
+    @staticmethod
+    def isnull(expr, defecto):
+        return f"IFNULL({expr}, {defecto})"
+
+    @staticmethod
+    def agregar_texto(expr, separador="', '"):
+        return f"group_concat({expr}, {separador})"
+
+    @staticmethod
+    def fecha_de(expr):
+        return f"date({expr})"  # Texto AAAA-MM-DD, el mismo formato con que se guardan los date
+
+    @staticmethod
+    def leer_confirmado(tabla):
+        return tabla  # Un solo escritor a la vez: lo que se lee ya está confirmado
+
+    @staticmethod
+    def primeras_filas():
+        return "LIMIT ?"
+
+    @staticmethod
+    def parametro_texto(largo):
+        return "?"  # Un CAST aquí impediría que el LIKE 'prefijo%' use el índice
+
+    # Funciones registradas por BackendSQLite en cada conexión
+    @staticmethod
+    def checksum(*columnas):
+        return f"sgr_checksum({', '.join(columnas)})"
+
+    @staticmethod
+    def checksum_agg(expr):
+        return f"sgr_checksum_agg({expr})"
+
+    @staticmethod
+    def sql_insertar_con_identidad(sql):
+        return sql  # La identidad se lee de cursor.lastrowid
+
+    sql_tabla_migraciones = """
+    CREATE TABLE IF NOT EXISTS SGR_S_Migracion (
+        version INTEGER NOT NULL PRIMARY KEY,
+        nombre VARCHAR(200) NOT NULL,
+        fechaaplicada DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+    """
@@ -0,0 +1,181 @@
+import json
+import logging
+import os
+import re
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+from config.settings import INSTRUMENTACION_CONFIG
+
+RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Límites superiores (ms) de los cubos del histograma; el último recoge todo lo demás
+CUBOS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float("inf"))
+
+_COMENTARIOS = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_TEXTOS = re.compile(r"'(?:[^']|'')*'")
+_NUMEROS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LISTAS_IN = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+
+def normalizar_sql(sql):
+    """Forma canónica de una sentencia para agrupar: sin comentarios, literales como ?, IN (?, ?, ...) colapsado."""
+    sql = _COMENTARIOS.sub(" ", sql)
+    sql = _TEXTOS.sub("?", sql)
+    sql = _NUMEROS.sub("?", sql)
+    sql = _LISTAS_IN.sub("(?...)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+
+class Histograma:
+    """Conteo por cubos de milisegundos con total, mínimo y máximo (percentiles aproximados al cubo)."""
+    def __init__(self):
+        self.cubos = [0] * len(CUBOS_MS)
+        self.n = 0
+        self.total_ms = 0.0
+        self.min_ms = float("inf")
+        self.max_ms = 0.0
+
+    def agregar(self, ms):
+        self.n += 1
+        self.total_ms += ms
+        self.min_ms = min(self.min_ms, ms)
+        self.max_ms = max(self.max_ms, ms)
+        for i, limite in enumerate(CUBOS_MS):
+            if ms <= limite:
+                self.cubos[i] += 1
+                break
+
+    def percentil(self, p):
+        if not self.n: return 0.0
+        objetivo, acumulado = p * self.n, 0
+        for limite, cantidad in zip(CUBOS_MS, self.cubos):
+            acumulado += cantidad
+            if acumulado >= objetivo:
+                return min(limite, self.max_ms)
+        return self.max_ms
+
+    def resumen(self):
+        return {
+            'n': self.n,
+            'total_ms': round(self.total_ms, 3),
+            'prom_ms': round(self.total_ms / self.n, 3) if self.n else 0.0,
+            'min_ms': round(self.min_ms, 3) if self.n else 0.0,
+            'p50_ms': self.percentil(0.50), 'p95_ms': self.percentil(0.95), 'p99_ms': self.percentil(0.99),
+            'max_ms': round(self.max_ms, 3),
+            'cubos': {str(limite): c for limite, c in zip(CUBOS_MS, self.cubos) if c}
+        }
+
+
+class _Sentencia:
+    def __init__(self):
+        self.ejecucion = Histograma()   # Ejecución + lectura de resultados
+        self.espera = Histograma()      # Tiempo hasta obtener la conexión del pool
+        self.filas = 0
+        self.errores = 0
+        self.lentas = 0
+
+
+class Instrumentacion:
+    """
+    Estadísticas por sentencia SQL normalizada (tiempos, filas, espera de conexión, errores) y por
+    acción de la UI (tareas del ejecutor de fondo). Las sentencias que pasan el umbral se escriben
+    en un log rotativo junto con la acción que las disparó.
+    """
+    def __init__(self, config=INSTRUMENTACION_CONFIG):
+        self.config = config
+        self.activa = config['activa']
+        self._sentencias = {}   # sql normalizado -> _Sentencia
+        self._acciones = {}     # nombre de acción -> Histograma
+        self._normalizadas = {} # sql crudo -> normalizado (los textos se repiten mucho)
+        self._lock = threading.Lock()
+        self._contexto = threading.local()
+        self._log_lentas = None
+        self.desde = time.time()
+
+    # --- Registro ---
+    def registrar(self, sql, segundos, filas=0, espera=0.0, error=False):
+        if not self.activa: return
+        ms = segundos * 1000
+        clave = self._normalizadas.get(sql)
+        if clave is None:
+            if len(self._normalizadas) > 5000: self._normalizadas.clear()  # SQL armado con valores: no crecer sin fin
+            clave = self._normalizadas[sql] = normalizar_sql(sql)
+        lenta = ms >= self.config['umbral_lento_ms']
+        with self._lock:
+            s = self._sentencias.get(clave)
+            if s is None:
+                s = self._sentencias[clave] = _Sentencia()
+            s.ejecucion.agregar(ms)
+            s.espera.agregar(espera * 1000)
+            s.filas += filas or 0
+            s.errores += bool(error)
+            s.lentas += lenta
+        if lenta:
+            self._logger_lentas().warning("%.1f ms | espera %.1f ms | filas %s | accion %s | %s",
+                                          ms, espera * 1000, filas, self.accion_actual(), clave)
+
+    def registrar_accion(self, nombre, segundos):
+        if not self.activa: return
+        with self._lock:
+            self._acciones.setdefault(nombre, Histograma()).agregar(segundos * 1000)
+
+    def en_accion(self, nombre):
+        """Marca el hilo actual: las sentencias lentas que corra se atribuyen a esa acción."""
+        self._contexto.accion = nombre
+
+    def accion_actual(self):
+        return getattr(self._contexto, 'accion', None)
+
+    # --- Consulta / volcado ---
+    def estadisticas(self):
+        """{'sentencias': [...] ordenadas por tiempo total, 'acciones': [...]}."""
+        with self._lock:
+            sentencias = [dict(sql=sql, filas=s.filas, errores=s.errores, lentas=s.lentas,
+                               espera=s.espera.resumen(), **s.ejecucion.resumen())
+                          for sql, s in self._sentencias.items()]
+            acciones = [dict(accion=nombre, **h.resumen()) for nombre, h in self._acciones.items()]
+        return {
+            'desde': time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.desde)),
+            'sentencias': sorted(sentencias, key=lambda s: s['total_ms'], reverse=True),
+            'acciones': sorted(acciones, key=lambda a: a['total_ms'], reverse=True)
+        }
+
+    def volcar(self, ruta=None, extra=None):
+        """Escribe las estadísticas en JSON (por defecto en config['archivo_volcado']). Retorna la ruta."""
+        ruta = self._ruta(ruta or self.config['archivo_volcado'])
+        datos = self.estadisticas()
+        if extra: datos.update(extra)
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False, indent=2, default=str)
+        return ruta
+
+    def reiniciar(self):
+        with self._lock:
+            self._sentencias.clear(); self._acciones.clear()
+            self.desde = time.time()
+
+    # --- Internos ---
+    def _ruta(self, ruta):
+        ruta = ruta if os.path.isabs(ruta) else os.path.join(RAIZ_PROYECTO, ruta)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        return ruta
+
+    def _logger_lentas(self):
+        if self._log_lentas is None:
+            with self._lock:
+                if self._log_lentas is None:
+                    logger = logging.getLogger("sgr.consultas_lentas")
+                    manejador = RotatingFileHandler(self._ruta(self.config['archivo_lentas']), encoding="utf-8",
+                                                    maxBytes=self.config['max_bytes'], backupCount=self.config['respaldos'])
+                    manejador.setFormatter(logging.Formatter("%(asctime)s %(threadName)s %(message)s"))
+                    logger.addHandler(manejador)
+                    logger.setLevel(logging.WARNING)
+                    logger.propagate = False
+                    self._log_lentas = logger
+        return self._log_lentas
+
+
+# Instancia compartida por toda la aplicación
+INSTRUMENTACION = Instrumentacion()
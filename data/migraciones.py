@@ -0,0 +1,55 @@
+import os
+import re
+from data.database import DatabaseManager
+
+CARPETA_MIGRACIONES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts", "migraciones")
+
+# Los scripts usan separadores GO (como SSMS); cada lote se envía por separado
+_SEPARADOR_GO = re.compile(r"^\s*GO\s*$", re.IGNORECASE | re.MULTILINE)
+_NOMBRE_MIGRACION = re.compile(r"^(\d+)_.+\.sql$")
+
+def lotes_sql(texto):
+    return [lote.strip() for lote in _SEPARADOR_GO.split(texto) if lote.strip()]
+
+
+def carpeta_backend():
+    # Cada motor tiene su propia serie de scripts: scripts/migraciones/<sqlserver|sqlite>
+    return os.path.join(CARPETA_MIGRACIONES, DatabaseManager.backend().nombre)
+
+
+def migraciones_disponibles(carpeta=None):
+    """[(version, nombre_archivo, ruta)] ordenadas por versión."""
+    carpeta = carpeta or carpeta_backend()
+    encontradas = []
+    for archivo in os.listdir(carpeta):
+        m = _NOMBRE_MIGRACION.match(archivo)
+        if m:
+            encontradas.append((int(m.group(1)), archivo, os.path.join(carpeta, archivo)))
+    return sorted(encontradas)
+
+
+def versiones_aplicadas():
+    with DatabaseManager.transaccion() as uow:
+        uow.ejecutar(DatabaseManager.dialecto().sql_tabla_migraciones)
+        return {row[0] for row in uow.consultar("SELECT version FROM SGR_S_Migracion")}
+
+
+def aplicar_migracion(version, nombre, ruta):
+    # Cada migración es todo o nada: sus lotes y el registro de versión van en la misma transacción
+    with open(ruta, encoding="utf-8-sig") as f:
+        lotes = lotes_sql(f.read())
+    with DatabaseManager.transaccion() as uow:
+        for lote in lotes:
+            uow.ejecutar(lote)
+        uow.ejecutar("INSERT INTO SGR_S_Migracion (version, nombre) VALUES (?, ?)", (version, nombre))
+
+
+def aplicar_migraciones_pendientes(carpeta=None):
+    """Aplica en orden las migraciones que aún no constan en SGR_S_Migracion. Retorna los nombres aplicados."""
+    aplicadas = versiones_aplicadas()
+    nuevas = []
+    for version, nombre, ruta in migraciones_disponibles(carpeta):
+        if version not in aplicadas:
+            aplicar_migracion(version, nombre, ruta)
+            nuevas.append(nombre)
+    return nuevas
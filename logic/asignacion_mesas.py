@@ -0,0 +1,92 @@
+"""
+Asignación automática de mesas para un grupo de N personas.
+
+Es un knapsack acotado: cada capacidad distinta es un ítem con tantas copias como mesas libres la tienen.
+Las copias se dividen en paquetes 1, 2, 4, ... (así cualquier cantidad 0..n se arma con paquetes 0/1)
+y se calcula, para cada total de asientos s, el mínimo de mesas que suman exactamente s.
+La mejor propuesta es el primer s >= pax alcanzable: menos asientos vacíos y, a igual sobrante, menos mesas.
+"""
+INFINITO = float("inf")
+
+
+def zona_por_nombre(nombre):
+    """Zona (grupo de mesas contiguas) según el prefijo del nombre: 'VIP-01' -> 'VIP', 'M-02' -> 'M'."""
+    return str(nombre).split("-")[0].strip().upper()
+
+
+def _paquetes(mesas):
+    # [(capacidad, [ids...])]: por capacidad, las mesas se reparten en paquetes de 1, 2, 4, ... y el resto
+    por_capacidad = {}
+    for id_mesa, capacidad in mesas:
+        por_capacidad.setdefault(capacidad, []).append(id_mesa)
+    paquetes = []
+    for capacidad, ids in sorted(por_capacidad.items(), reverse=True):
+        inicio, tamano = 0, 1
+        while inicio < len(ids):
+            paquetes.append((capacidad, ids[inicio:inicio + tamano]))
+            inicio += tamano; tamano *= 2
+    return paquetes
+
+
+def combinacion_optima(mesas, pax, max_mesas=None):
+    """
+    Mejor combinación de mesas [(idMesa, capacidad)] para pax personas.
+    Retorna (ids, asientos_sobrantes) o None si no alcanza (o haría falta más de max_mesas).
+    """
+    mesas = [(id_m, cap) for id_m, cap in mesas if cap and cap > 0]
+    if pax <= 0 or not mesas: return None
+    limite = max_mesas or INFINITO
+
+    # Poda 1: una mesa sola es siempre la combinación con menos mesas; si sobra poco no hay nada mejor
+    sola = min(((cap, id_m) for id_m, cap in mesas if cap >= pax), default=None)
+    if sola and sola[0] == pax:
+        return [sola[1]], 0
+
+    # Poda 2: si una combinación suma pax + cap_max o más, se le puede quitar una mesa y sigue alcanzando,
+    # así que nunca es óptima. La tabla solo necesita llegar a pax + cap_max - 1.
+    cap_max = max(cap for _, cap in mesas)
+    tope = min(pax + cap_max - 1, sum(cap for _, cap in mesas))
+    if tope < pax: return None
+
+    paquetes = _paquetes(mesas)
+    minimo = [0] + [INFINITO] * tope  # minimo[s] = menos mesas que suman exactamente s asientos
+    tomado = []                       # tomado[i][s] = 1 si el paquete i mejoró minimo[s]
+    for capacidad, ids in paquetes:
+        peso, cantidad = capacidad * len(ids), len(ids)
+        fila = bytearray(tope + 1)
+        for s in range(tope, peso - 1, -1):
+            candidato = minimo[s - peso] + cantidad
+            if candidato < minimo[s]:
+                minimo[s] = candidato; fila[s] = 1
+        tomado.append(fila)
+
+    total = next((s for s in range(pax, tope + 1) if minimo[s] <= limite), None)
+    if total is None: return None
+
+    # Reconstrucción: se recorren los paquetes al revés siguiendo las marcas
+    elegidas, s = [], total
+    for (capacidad, ids), fila in zip(reversed(paquetes), reversed(tomado)):
+        if fila[s]:
+            elegidas.extend(ids); s -= capacidad * len(ids)
+    return elegidas, total - pax
+
+
+def proponer_mesas(mesas, pax, zonas=None, max_mesas=None, solo_misma_zona=False):
+    """
+    Propuesta para pax personas entre las mesas libres [(idMesa, capacidad)].
+    - zonas: {idMesa: zona}. Si se da, se prefiere juntar al grupo en una sola zona (la de menos sobrante);
+      solo si ninguna zona alcanza se mezclan zonas, salvo solo_misma_zona=True.
+    Retorna (ids, asientos_sobrantes) o None.
+    """
+    if zonas:
+        por_zona = {}
+        for mesa in mesas:
+            por_zona.setdefault(zonas.get(mesa[0]), []).append(mesa)
+        propuestas = []
+        for miembros in por_zona.values():
+            if sum(cap for _, cap in miembros) < pax: continue  # Poda: la zona entera no alcanza
+            propuesta = combinacion_optima(miembros, pax, max_mesas)
+            if propuesta: propuestas.append(propuesta)
+        if propuestas or solo_misma_zona:
+            return min(propuestas, key=lambda p: (p[1], len(p[0])), default=None)
+    return combinacion_optima(mesas, pax, max_mesas)
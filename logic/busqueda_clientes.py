@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from data.database import DatabaseManager
+from config.settings import BUSQUEDA_CLIENTES_CONFIG
+
+MAX_LARGO = 100  # Más que esto no acota nada (nombre + apellido: 201)
+
+
+def normalizar(texto):
+    """Clave de búsqueda: sin espacios sobrantes y en minúsculas ("  Ana   Pérez" -> "ana pérez")."""
+    return " ".join((texto or "").split()).lower()[:MAX_LARGO]
+
+
+def escapar_like(texto):
+    # '\' es el ESCAPE de las consultas; '[' solo es especial en SQL Server, pero escaparlo no molesta a SQLite
+    for caracter in ("\\", "%", "_", "["):
+        texto = texto.replace(caracter, "\\" + caracter)
+    return texto
+
+
+def buscar_clientes_bd(prefijo, limite, despues_de=None):
+    """
+    Clientes cuyo nombre completo, apellido, cédula o teléfono empieza por prefijo (sin distinguir mayúsculas).
+    Orden y paginación por keyset: (nombrecompleto, idCliente); despues_de es la última clave ya mostrada.
+    Retorna (filas [(idCliente, nombrecompleto, apellido, cedula, telefono)], hay_mas).
+    Cada LIKE 'prefijo%' es un seek sobre su índice (migración 003).
+    """
+    d = DatabaseManager.dialecto()
+    p = d.parametro_texto(2 * MAX_LARGO + 1)
+    patron = escapar_like(normalizar(prefijo)) + "%"
+    condiciones = " OR ".join(f"{columna} LIKE {p} ESCAPE '\\'" for columna in ("nombrecompleto", "apellido", "cedula", "telefono"))
+    params = [patron] * 4
+    keyset = ""
+    if despues_de:
+        keyset = f"AND (nombrecompleto > {p} OR (nombrecompleto = {p} AND idCliente > ?))"
+        params += [despues_de[0], despues_de[0], despues_de[1]]
+    sql = f"""
+    SELECT idCliente, nombrecompleto, apellido, cedula, telefono
+    FROM SGR_M_Cliente
+    WHERE ({condiciones}) {keyset}
+    ORDER BY nombrecompleto, idCliente
+    {d.primeras_filas()}
+    """
+    filas = DatabaseManager.run_query(sql, tuple(params) + (limite + 1,), fetchall=True, reportar=False)
+    if filas is None:
+        return None
+    filas = [tuple(f) for f in filas]
+    return filas[:limite], len(filas) > limite
+
+
+def _coincide(fila, prefijo):
+    return any(str(valor or "").lower().startswith(prefijo) for valor in fila[1:5])
+
+
+class BuscadorClientes:
+    """
+    Búsqueda incremental con caché por prefijo (LRU, con TTL para ver los clientes nuevos).
+    Cada entrada guarda la primera página de un prefijo ya consultado, ordenada como en la BD.
+    Si un prefijo más corto ya trajo TODAS sus coincidencias, el prefijo nuevo se resuelve filtrando
+    esas filas en memoria: al escribir "mar", "mari", "maria" solo la primera tecla consulta la BD.
+    """
+    def __init__(self, limite=BUSQUEDA_CLIENTES_CONFIG['limite'], ttl=BUSQUEDA_CLIENTES_CONFIG['ttl'],
+                 max_prefijos=BUSQUEDA_CLIENTES_CONFIG['max_prefijos']):
+        self.limite = limite
+        self.ttl = ttl
+        self.max_prefijos = max_prefijos
+        self._cache = OrderedDict()  # prefijo -> (filas, hay_mas, momento)
+        self._lock = threading.Lock()
+
+    def en_cache(self, texto):
+        """(filas, hay_mas) sin tocar la BD, o None si hay que consultarla. Seguro desde el hilo de Tk."""
+        prefijo = normalizar(texto)
+        with self._lock:
+            return self._resolver(prefijo)
+
+    def buscar(self, texto):
+        """(filas, hay_mas): primera página desde el caché si se puede; si no, una consulta a la BD."""
+        prefijo = normalizar(texto)
+        with self._lock:
+            resultado = self._resolver(prefijo)
+        if resultado is not None:
+            return resultado
+        resultado = buscar_clientes_bd(prefijo, self.limite)
+        if resultado is None:
+            return [], False
+        with self._lock:
+            self._guardar(prefijo, *resultado)
+        return resultado
+
+    def siguiente_pagina(self, texto, despues_de):
+        """Páginas siguientes: siempre a la BD (no se guardan; casi nunca se piden)."""
+        return buscar_clientes_bd(normalizar(texto), self.limite, despues_de) or ([], False)
+
+    def invalidar(self):
+        with self._lock:
+            self._cache.clear()
+
+    # --- Internos ---
+    def _resolver(self, prefijo):
+        ahora = time.monotonic()
+        entrada = self._vigente(prefijo, ahora)
+        if entrada:
+            self._cache.move_to_end(prefijo)
+            return entrada[0], entrada[1]
+        # Ancestro completo más largo ("mar" para "maria"): sus filas contienen todas las del prefijo nuevo
+        for largo in range(len(prefijo) - 1, 0, -1):
+            entrada = self._vigente(prefijo[:largo], ahora)
+            if entrada and not entrada[1]:
+                filas = [f for f in entrada[0] if _coincide(f, prefijo)]
+                self._guardar(prefijo, filas, False, entrada[2])  # Vence junto con el ancestro
+                return filas, False
+        return None
+
+    def _vigente(self, prefijo, ahora):
+        entrada = self._cache.get(prefijo)
+        if entrada and ahora - entrada[2] < self.ttl:
+            return entrada
+        return None
+
+    def _guardar(self, prefijo, filas, hay_mas, momento=None):
+        self._cache[prefijo] = (filas, hay_mas, momento if momento is not None else time.monotonic())
+        self._cache.move_to_end(prefijo)
+        while len(self._cache) > self.max_prefijos:
+            self._cache.popitem(last=False)
+
+
+BUSCADOR = BuscadorClientes()
@@ -0,0 +1,365 @@
+import csv
+import logging
+import os
+import time
+from bisect import bisect_left, insort
+from datetime import datetime
+from data.database import DatabaseManager, BloqueoNoObtenidoError, MAX_PARAMETROS_IN
+from logic.reserva_controller import ReservaController
+from logic.disponibilidad import INDICE, MARGEN_RESERVA
+from logic.catalogos import CLIENTES, EMPLEADOS, MESAS
+from config.settings import ID_RESTAURANTE_ACTUAL, BLOQUEO_RESERVA_TIMEOUT_MS, CARGA_MASIVA_CONFIG
+
+log = logging.getLogger(__name__)
+
+ESTADOS_ACTIVOS = (1, 2, 4)
+COLUMNAS_CLIENTES = ("nombre", "apellido", "cedula", "telefono", "id_ciudad")
+COLUMNAS_RESERVAS = ("fecha_hora", "n_personas", "cedula_cliente", "id_cliente", "id_empleado", "estado", "mesas")
+
+
+class FilaInvalida(Exception):
+    """La fila no pasa la validación: va al CSV de rechazos con este mensaje."""
+
+
+class CargaInterrumpidaError(Exception):
+    """Falló la BD a mitad de la carga. Los lotes anteriores quedaron guardados; se retoma desde linea."""
+    def __init__(self, linea, causa):
+        super().__init__(f"Carga interrumpida en el lote que empieza en la línea {linea}: {causa}")
+        self.linea = linea
+
+
+class _Resultado:
+    """Contadores de una carga y el CSV de rechazos (se crea solo si hay alguno)."""
+    def __init__(self, ruta_rechazos, columnas):
+        self.ruta_rechazos = ruta_rechazos
+        self.columnas = list(columnas) + ["linea", "error"]
+        self.leidas = self.insertadas = self.rechazadas = 0
+        self.inicio = time.perf_counter()
+        self._archivo = self._escritor = None
+
+    def rechazar(self, linea, fila, error):
+        if self._escritor is None:
+            self._archivo = open(self.ruta_rechazos, "w", newline="", encoding=CARGA_MASIVA_CONFIG['codificacion'])
+            self._escritor = csv.DictWriter(self._archivo, self.columnas, extrasaction="ignore",
+                                            delimiter=CARGA_MASIVA_CONFIG['delimitador'])
+            self._escritor.writeheader()
+        self._escritor.writerow(dict(fila, linea=linea, error=str(error)))
+        self.rechazadas += 1
+
+    def cerrar(self):
+        if self._archivo: self._archivo.close()
+
+    def resumen(self):
+        segundos = time.perf_counter() - self.inicio
+        return {
+            'leidas': self.leidas, 'insertadas': self.insertadas, 'rechazadas': self.rechazadas,
+            'segundos': round(segundos, 3), 'filas_por_s': round(self.leidas / segundos, 1) if segundos else 0.0,
+            'rechazos': self.ruta_rechazos if self.rechazadas else None
+        }
+
+
+class CargaMasiva:
+    """
+    Importación y exportación de clientes y reservas por CSV, en streaming.
+    - Importar: el archivo se lee por lotes; cada lote se valida, se revisa contra la BD con UNA consulta
+      por tipo de verificación (cédulas existentes, reservas que chocan) y se escribe con executemany
+      (fast_executemany en ODBC) en su propia transacción. Si la BD falla, lo ya confirmado queda.
+    - Exportar: fetchmany página a página directo al archivo; nunca se carga todo en memoria.
+    Las columnas que exporta cada tabla son las mismas que importa (ida y vuelta sin retoques).
+    """
+
+    # --- Clientes ---
+    @staticmethod
+    def importar_clientes(ruta, lote=CARGA_MASIVA_CONFIG['lote'], ruta_rechazos=None):
+        """Alta de clientes nuevos; la cédula es la clave: las que ya existen (en la BD o antes en el archivo) se rechazan."""
+        resultado = _Resultado(ruta_rechazos or _ruta_rechazos(ruta), COLUMNAS_CLIENTES)
+        vistas = set()
+        try:
+            for filas in _leer_lotes(ruta, lote):
+                resultado.leidas += len(filas)
+                validas = []
+                for linea, fila in filas:
+                    try:
+                        cliente = CargaMasiva._cliente(fila)
+                        if cliente[2] in vistas:
+                            raise FilaInvalida(f"Cédula repetida en el archivo: {cliente[2]}")
+                        vistas.add(cliente[2])
+                        validas.append((linea, fila, cliente))
+                    except FilaInvalida as e:
+                        resultado.rechazar(linea, fila, e)
+                try:
+                    with DatabaseManager.transaccion() as uow:
+                        existentes = {f[0] for f in _consultar_in(
+                            uow, "SELECT cedula FROM SGR_M_Cliente WHERE cedula IN ({})", [v[2][2] for v in validas])}
+                        nuevas = []
+                        for linea, fila, cliente in validas:
+                            if cliente[2] in existentes:
+                                resultado.rechazar(linea, fila, f"La cédula {cliente[2]} ya está registrada")
+                            else:
+                                nuevas.append(cliente)
+                        ahora = datetime.now()
+                        uow.ejecutar_lote(
+                            """INSERT INTO SGR_M_Cliente (nombre, apellido, cedula, telefono, idCiudad, idRestaurante, fecharegistro, idEstadocliente)
+                               VALUES (?, ?, ?, ?, ?, ?, ?, 1)""",
+                            [c + (ID_RESTAURANTE_ACTUAL, ahora) for c in nuevas]
+                        )
+                except DatabaseManager.backend().errores as e:
+                    raise CargaInterrumpidaError(filas[0][0], e)
+                resultado.insertadas += len(nuevas)
+                _informar("clientes", resultado)
+        finally:
+            resultado.cerrar()
+        CLIENTES.invalidar()
+        return resultado.resumen()
+
+    @staticmethod
+    def exportar_clientes(ruta, tamano=CARGA_MASIVA_CONFIG['filas_por_pagina']):
+        sql = """
+        SELECT nombre, apellido, cedula, telefono, idCiudad
+        FROM SGR_M_Cliente
+        ORDER BY idCliente
+        """
+        return _exportar(ruta, COLUMNAS_CLIENTES, sql, (), tamano, lambda f: f)
+
+    # --- Reservas ---
+    @staticmethod
+    def importar_reservas(ruta, lote=CARGA_MASIVA_CONFIG['lote'], ruta_rechazos=None, permitir_pasadas=False):
+        """
+        Reservas con sus mesas. El cliente va por id_cliente o por cedula_cliente; las mesas por nombre
+        (o id) separadas por CARGA_MASIVA_CONFIG['separador_mesas']; estado opcional (1 = Pendiente).
+        Se rechaza toda reserva activa que choque (±1h59m en alguna mesa) con la BD o con otra del archivo.
+        Conviene que el archivo venga ordenado por fecha: cada lote consulta un rango de fechas más corto.
+        """
+        resultado = _Resultado(ruta_rechazos or _ruta_rechazos(ruta), COLUMNAS_RESERVAS)
+        MESAS.actualizar(forzar=True); EMPLEADOS.actualizar(forzar=True); CLIENTES.actualizar(forzar=True)
+        ahora = None if permitir_pasadas else datetime.now()
+        try:
+            for filas in _leer_lotes(ruta, lote):
+                resultado.leidas += len(filas)
+                validas = []
+                for linea, fila in filas:
+                    try:
+                        validas.append((linea, fila, CargaMasiva._reserva(fila, ahora)))
+                    except FilaInvalida as e:
+                        resultado.rechazar(linea, fila, e)
+                if not validas:
+                    continue
+                try:
+                    aceptadas = CargaMasiva._guardar_lote_reservas(validas, resultado)
+                except (DatabaseManager.backend().errores, BloqueoNoObtenidoError) as e:
+                    raise CargaInterrumpidaError(filas[0][0], e)
+                resultado.insertadas += len(aceptadas)
+                for dia in {r['fecha_hora'].date() for r in aceptadas}:
+                    INDICE.invalidar(dia)
+                _informar("reservas", resultado)
+        finally:
+            resultado.cerrar()
+        return resultado.resumen()
+
+    @staticmethod
+    def exportar_reservas(ruta, desde=None, hasta=None, tamano=CARGA_MASIVA_CONFIG['filas_por_pagina']):
+        """Reservas del restaurante con desde <= fecha < hasta (None = sin límite), en orden de fecha."""
+        d = DatabaseManager.dialecto()
+        filtros, params = ["R.idRestaurante = ?"], [ID_RESTAURANTE_ACTUAL]
+        if desde is not None:
+            filtros.append("R.fechareserva >= ?"); params.append(desde)
+        if hasta is not None:
+            filtros.append("R.fechareserva < ?"); params.append(hasta)
+        sql = f"""
+        SELECT R.fechareserva, R.Npersonas, C.cedula, R.idCliente, R.idEmpleado, R.idEstadoreserva,
+               (SELECT {d.agregar_texto("M.Nmesa", f"'{CARGA_MASIVA_CONFIG['separador_mesas']}'")}
+                FROM SGR_T_DetalleReserva DR
+                JOIN SGR_M_Mesa M ON DR.idMesa = M.idMesa
+                WHERE DR.idReserva = R.idReserva) AS mesas
+        FROM SGR_T_Reserva R
+        JOIN SGR_M_Cliente C ON R.idCliente = C.idCliente
+        WHERE {" AND ".join(filtros)}
+        ORDER BY R.fechareserva, R.idReserva
+        """
+        return _exportar(ruta, COLUMNAS_RESERVAS, sql, tuple(params), tamano,
+                         lambda f: (f[0].strftime("%Y-%m-%d %H:%M"),) + tuple(f[1:]))
+
+    # --- Internos ---
+    @staticmethod
+    def _cliente(fila):
+        nombre, apellido = _texto(fila, 'nombre', 100, True), _texto(fila, 'apellido', 100)
+        cedula, telefono = _texto(fila, 'cedula', 20, True), _texto(fila, 'telefono', 20)
+        return (nombre, apellido, cedula, telefono, _entero(fila, 'id_ciudad'))
+
+    @staticmethod
+    def _reserva(fila, ahora):
+        try:
+            fecha_hora = datetime.fromisoformat((fila.get('fecha_hora') or "").strip()).replace(microsecond=0)
+        except ValueError:
+            raise FilaInvalida(f"Fecha inválida: {fila.get('fecha_hora')!r} (se espera AAAA-MM-DD HH:MM)")
+        if ahora and fecha_hora < ahora:
+            raise FilaInvalida("Fecha pasada")
+        pax = _entero(fila, 'n_personas')
+        if not pax or pax < 1:
+            raise FilaInvalida("Número de personas inválido")
+        estado = _entero(fila, 'estado') or 1
+        if estado not in (1, 2, 3, 4):
+            raise FilaInvalida(f"Estado inválido: {estado}")
+
+        id_cliente, cedula = _entero(fila, 'id_cliente'), _texto(fila, 'cedula_cliente', 20)
+        if id_cliente is None and not cedula:
+            raise FilaInvalida("Falta el cliente (id_cliente o cedula_cliente)")
+        if id_cliente is not None and id_cliente not in CLIENTES.por_id:
+            raise FilaInvalida(f"Cliente inexistente: {id_cliente}")
+        id_empleado = _entero(fila, 'id_empleado')
+        if id_empleado is not None and id_empleado not in EMPLEADOS.por_id:
+            raise FilaInvalida(f"Empleado inexistente: {id_empleado}")
+
+        mesas, desconocidas = [], []
+        for token in (fila.get('mesas') or "").split(CARGA_MASIVA_CONFIG['separador_mesas']):
+            token = token.strip()
+            if not token: continue
+            id_mesa = MESAS.id_de(token)
+            if id_mesa is None and token.isdigit() and int(token) in MESAS.por_id:
+                id_mesa = int(token)
+            if id_mesa is None: desconocidas.append(token)
+            elif id_mesa not in mesas: mesas.append(id_mesa)
+        if desconocidas:
+            raise FilaInvalida(f"Mesas inexistentes: {', '.join(desconocidas)}")
+        if not mesas:
+            raise FilaInvalida("Sin mesas")
+        if sum(MESAS.por_id[m][2] for m in mesas) < pax:
+            raise FilaInvalida("Mesas insuficientes para el número de personas")
+        return {'fecha_hora': fecha_hora, 'n_personas': pax, 'id_cliente': id_cliente, 'cedula': cedula,
+                'id_empleado': id_empleado, 'estado': estado, 'mesas': mesas}
+
+    @staticmethod
+    def _guardar_lote_reservas(validas, resultado):
+        """
+        Un lote en UNA transacción. Retorna las reservas insertadas.
+        Mismo orden de bloqueos que ReservaController.guardar_reserva (franjas horarias y luego la tabla),
+        así una terminal que guarda a la vez espera o choca, pero nunca se cuela entre la revisión y el INSERT.
+        Los bloqueos de todas las franjas del lote se piden en un solo viaje (ver UnidadTrabajo.bloquear).
+        """
+        fechas = [r['fecha_hora'] for _, _, r in validas]
+        recursos = {rec for f in fechas for rec in ReservaController._recursos_bloqueo(f)}
+        with DatabaseManager.transaccion() as uow:
+            uow.bloquear(recursos, BLOQUEO_RESERVA_TIMEOUT_MS)
+            uow.bloquear_tabla("SGR_T_Reserva")
+
+            # Cédulas -> idCliente en una consulta
+            por_cedula = dict(_consultar_in(uow, "SELECT cedula, idCliente FROM SGR_M_Cliente WHERE cedula IN ({})",
+                                            {r['cedula'] for _, _, r in validas if r['id_cliente'] is None}))
+            # Reservas activas de las mesas del lote en todo su rango de fechas, en una consulta
+            ocupadas = {}
+            ids_mesas = {m for _, _, r in validas for m in r['mesas']}
+            for id_mesa, fecha in _consultar_in(uow, """
+                    SELECT DR.idMesa, R.fechareserva
+                    FROM SGR_T_DetalleReserva DR
+                    JOIN SGR_T_Reserva R ON DR.idReserva = R.idReserva
+                    WHERE R.idEstadoreserva IN (1, 2, 4)
+                    AND R.fechareserva BETWEEN ? AND ?
+                    AND DR.idMesa IN ({})""", ids_mesas, (min(fechas) - MARGEN_RESERVA, max(fechas) + MARGEN_RESERVA)):
+                ocupadas.setdefault(id_mesa, []).append(fecha)
+            for lista in ocupadas.values(): lista.sort()
+
+            aceptadas = []
+            for linea, fila, r in validas:
+                if r['id_cliente'] is None:
+                    r['id_cliente'] = por_cedula.get(r['cedula'])
+                    if r['id_cliente'] is None:
+                        resultado.rechazar(linea, fila, f"Cliente inexistente: cédula {r['cedula']}")
+                        continue
+                if r['estado'] in ESTADOS_ACTIVOS:
+                    choques = [m for m in r['mesas'] if _choca(ocupadas.get(m, ()), r['fecha_hora'])]
+                    if choques:
+                        resultado.rechazar(linea, fila, "Mesas ocupadas o reservadas en ese horario: "
+                                                        + ", ".join(MESAS.nombre(m) for m in choques))
+                        continue
+                    for m in r['mesas']:
+                        insort(ocupadas.setdefault(m, []), r['fecha_hora'])  # Choques dentro del mismo archivo
+                aceptadas.append(r)
+            if not aceptadas:
+                return aceptadas
+
+            ids = uow.insertar_lote(
+                "SGR_T_Reserva", "idReserva",
+                """INSERT INTO SGR_T_Reserva (fechareserva, Npersonas, idCliente, idEmpleado, idEstadoreserva, idPolitica, idRestaurante)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                [(r['fecha_hora'], r['n_personas'], r['id_cliente'], r['id_empleado'], r['estado'],
+                  ReservaController.calcular_politica(r['n_personas'], r['estado']), ID_RESTAURANTE_ACTUAL)
+                 for r in aceptadas]
+            )
+            for id_reserva, r in zip(ids, aceptadas):
+                r['id_reserva'] = id_reserva
+            uow.ejecutar_lote(
+                "INSERT INTO SGR_T_DetalleReserva (idReserva, idMesa, Total) VALUES (?, ?, 0)",
+                [(r['id_reserva'], m) for r in aceptadas for m in r['mesas']]
+            )
+        return aceptadas
+
+
+def _ruta_rechazos(ruta):
+    base, extension = os.path.splitext(ruta)
+    return f"{base}.rechazos{extension or '.csv'}"
+
+
+def _leer_lotes(ruta, tamano):
+    """Genera listas [(linea, fila dict)] de hasta tamano filas (la línea 1 es el encabezado)."""
+    with open(ruta, newline="", encoding=CARGA_MASIVA_CONFIG['codificacion']) as f:
+        lector = csv.DictReader(f, delimiter=CARGA_MASIVA_CONFIG['delimitador'])
+        lote = []
+        for fila in lector:
+            lote.append((lector.line_num, fila))
+            if len(lote) >= tamano:
+                yield lote
+                lote = []
+        if lote:
+            yield lote
+
+
+def _exportar(ruta, columnas, sql, params, tamano, convertir):
+    inicio, total = time.perf_counter(), 0
+    with open(ruta, "w", newline="", encoding=CARGA_MASIVA_CONFIG['codificacion']) as f:
+        escritor = csv.writer(f, delimiter=CARGA_MASIVA_CONFIG['delimitador'])
+        escritor.writerow(columnas)
+        for pagina in DatabaseManager.consultar_por_lotes(sql, params, tamano):
+            escritor.writerows(convertir(fila) for fila in pagina)
+            total += len(pagina)
+    segundos = time.perf_counter() - inicio
+    return {'exportadas': total, 'segundos': round(segundos, 3),
+            'filas_por_s': round(total / segundos, 1) if segundos else 0.0, 'archivo': ruta}
+
+
+def _consultar_in(uow, sql, valores, params_previos=()):
+    """sql con un {} donde va el IN (...); si hay muchos valores se parte en varias consultas."""
+    valores, filas = list(valores), []
+    for i in range(0, len(valores), MAX_PARAMETROS_IN):
+        marcadores, params = DatabaseManager.parametros_in(valores[i:i + MAX_PARAMETROS_IN])
+        filas.extend(uow.consultar(sql.format(marcadores), tuple(params_previos) + tuple(params)))
+    return filas
+
+
+def _choca(fechas, fecha_hora):
+    # fechas ordenadas: ¿alguna a menos de MARGEN_RESERVA (inclusive) de fecha_hora?
+    i = bisect_left(fechas, fecha_hora - MARGEN_RESERVA)
+    return i < len(fechas) and fechas[i] <= fecha_hora + MARGEN_RESERVA
+
+
+def _texto(fila, columna, largo, obligatorio=False):
+    valor = (fila.get(columna) or "").strip()
+    if obligatorio and not valor:
+        raise FilaInvalida(f"Falta {columna}")
+    if len(valor) > largo:
+        raise FilaInvalida(f"{columna} supera {largo} caracteres")
+    return valor or None
+
+
+def _entero(fila, columna):
+    valor = (fila.get(columna) or "").strip()
+    if not valor: return None
+    try:
+        return int(valor)
+    except ValueError:
+        raise FilaInvalida(f"{columna} no es un número: {valor!r}")
+
+
+def _informar(tipo, resultado):
+    r = resultado.resumen()
+    log.info("%s: %s leídas, %s insertadas, %s rechazadas (%.0f filas/s)",
+             tipo, r['leidas'], r['insertadas'], r['rechazadas'], r['filas_por_s'])
@@ -0,0 +1,190 @@
+import logging
+import os
+import pickle
+import threading
+import time
+from data.database import DatabaseManager
+from config.settings import ID_RESTAURANTE_ACTUAL, CATALOGO_TTL, ARRANQUE_CONFIG
+
+log = logging.getLogger(__name__)
+RAIZ_PROYECTO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FORMATO_INSTANTANEA = 1  # Subirlo si cambia lo que se guarda
+
+
+class Catalogo:
+    """
+    Cache en memoria de una tabla maestra con índices id -> fila y nombre -> id.
+    Pasado el TTL se hace UNA consulta sonda (COUNT, MAX(id), CHECKSUM_AGG) para saber si cambió:
+    - nada cambió: no se recarga nada;
+    - solo hay filas nuevas (id > último id conocido): se traen solo esas;
+    - hubo ediciones o borrados: recarga completa.
+    La tabla no tiene columna rowversion, por eso las ediciones se detectan con el checksum.
+    Las columnas de la consulta son: id, nombre, [extras...]
+    expr_nombre puede ser una función(dialecto) -> SQL cuando depende del motor (p. ej. concatenación).
+    """
+    def __init__(self, tabla, columna_id, expr_nombre, extras=(), filtro="1=1", params=(), ttl=CATALOGO_TTL):
+        self.tabla = tabla
+        self.columna_id = columna_id
+        self.expr_nombre = expr_nombre
+        self.extras = tuple(extras)
+        self.filtro = filtro
+        self.params = tuple(params)
+        self.ttl = ttl
+        self.version = 0           # Sube cada vez que el contenido cambia
+        self.por_id = {}           # id -> (id, nombre, extras...)
+        self.por_nombre = {}       # nombre -> id
+        self._firma = None         # (count, max_id, checksum) de la última carga
+        self._verificado_en = None
+        self._lock = threading.RLock()
+
+    # --- Lectura ---
+    def filas(self):
+        """Filas ordenadas por nombre."""
+        with self._lock:
+            return sorted(self.por_id.values(), key=lambda f: (str(f[1]).casefold(), f[0]))
+
+    def nombres(self):
+        return [f[1] for f in self.filas()]
+
+    def nombre(self, id_registro):
+        fila = self.por_id.get(id_registro)
+        return fila[1] if fila else None
+
+    def id_de(self, nombre):
+        return self.por_nombre.get(nombre)
+
+    # --- Actualización ---
+    def invalidar(self):
+        with self._lock:
+            self._verificado_en = None
+
+    def actualizar(self, forzar=False):
+        """Sincroniza con la BD si venció el TTL (o forzar=True). Retorna True si el contenido cambió."""
+        with self._lock:
+            if not forzar and self._verificado_en is not None and time.monotonic() - self._verificado_en < self.ttl:
+                return False
+            max_conocido = self._firma[1] if self._firma else None
+            sonda = self._sondear(max_conocido)
+            if sonda is None:
+                return False
+            total, max_id, checksum, total_previo, checksum_previo = sonda
+            self._verificado_en = time.monotonic()
+            firma = (total, max_id, checksum)
+            if firma == self._firma:
+                return False
+
+            if self._firma and (total_previo, checksum_previo) == (self._firma[0], self._firma[2]):
+                nuevas = self._leer(f"{self.columna_id} > ?", (max_conocido,))  # Solo altas
+            else:
+                nuevas = self._leer()
+                if nuevas is not None:
+                    self.por_id, self.por_nombre = {}, {}
+            if nuevas is None:
+                return False
+            for fila in nuevas:
+                self.por_id[fila[0]] = fila
+                self.por_nombre[fila[1]] = fila[0]
+            self._firma = firma
+            self.version += 1
+            return True
+
+    # --- Instantánea en disco ---
+    def exportar(self):
+        with self._lock:
+            return {'firma': self._firma, 'filas': list(self.por_id.values())}
+
+    def importar(self, estado):
+        """
+        Carga filas ya conocidas (p. ej. de la última sesión). La próxima actualizar() sondea igual:
+        si la firma coincide no se relee nada, si solo hubo altas se traen esas.
+        Retorna False (sin tocar nada) si el catálogo ya se cargó desde la BD.
+        """
+        with self._lock:
+            if self._firma is not None: return False
+            self.por_id = {f[0]: tuple(f) for f in estado['filas']}
+            self.por_nombre = {f[1]: f[0] for f in self.por_id.values()}
+            self._firma = tuple(estado['firma']) if estado['firma'] else None
+            self._verificado_en = None
+            self.version += 1
+            return True
+
+    # --- Internos ---
+    def _columnas(self):
+        d = DatabaseManager.dialecto()
+        nombre = self.expr_nombre(d) if callable(self.expr_nombre) else self.expr_nombre
+        return (self.columna_id, nombre) + self.extras
+
+    def _sondear(self, max_conocido):
+        # Un solo viaje: firma de toda la tabla y firma del rango ya cargado (id <= max_conocido)
+        d = DatabaseManager.dialecto()
+        checksum = d.checksum(*self._columnas())
+        sql = f"""
+        SELECT COUNT(*), MAX({self.columna_id}), {d.checksum_agg(checksum)},
+               SUM(CASE WHEN {self.columna_id} <= ? THEN 1 ELSE 0 END),
+               {d.checksum_agg(f"CASE WHEN {self.columna_id} <= ? THEN {checksum} END")}
+        FROM {self.tabla}
+        WHERE {self.filtro}
+        """
+        limite = max_conocido if max_conocido is not None else 0
+        fila = DatabaseManager.run_query(sql, (limite, limite) + self.params, fetchone=True)
+        return tuple(fila) if fila else None
+
+    def _leer(self, condicion="1=1", params=()):
+        sql = f"""
+        SELECT {', '.join(self._columnas())}
+        FROM {self.tabla}
+        WHERE {self.filtro} AND {condicion}
+        """
+        filas = DatabaseManager.run_query(sql, self.params + tuple(params), fetchall=True)
+        return None if filas is None else [tuple(f) for f in filas]
+
+
+# Catálogos compartidos por toda la aplicación
+CLIENTES = Catalogo("SGR_M_Cliente", "idCliente", lambda d: d.concat("nombre", "' '", "apellido"))
+EMPLEADOS = Catalogo("SGR_M_Empleado", "idEmpleado", "nombre",
+                     filtro="idRestaurante = ?", params=(ID_RESTAURANTE_ACTUAL,))
+MESAS = Catalogo("SGR_M_Mesa", "idMesa", "Nmesa", extras=("capacidad", "idEstadomesa"),
+                 filtro="idRestaurante = ?", params=(ID_RESTAURANTE_ACTUAL,))
+CATALOGOS = {'clientes': CLIENTES, 'empleados': EMPLEADOS, 'mesas': MESAS}
+
+
+def _ruta_instantanea(ruta):
+    ruta = ruta or ARRANQUE_CONFIG['instantanea_catalogos']
+    if not ruta: return None
+    return ruta if os.path.isabs(ruta) else os.path.join(RAIZ_PROYECTO, ruta)
+
+
+def _origen():
+    # La instantánea solo vale para la misma BD y el mismo restaurante
+    config = DatabaseManager.backend().config
+    return (FORMATO_INSTANTANEA, DatabaseManager.backend().nombre, config.get('ruta'),
+            config.get('server'), config.get('database'), ID_RESTAURANTE_ACTUAL)
+
+
+def guardar_instantanea(ruta=None):
+    """Escribe los catálogos ya cargados (se reemplaza el archivo de una vez: nunca queda a medias)."""
+    ruta = _ruta_instantanea(ruta)
+    if not ruta: return None
+    datos = {'origen': _origen(),
+             'catalogos': {nombre: c.exportar() for nombre, c in CATALOGOS.items() if c._firma is not None}}
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    with open(ruta + ".tmp", "wb") as f:
+        pickle.dump(datos, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(ruta + ".tmp", ruta)
+    return ruta
+
+
+def cargar_instantanea(ruta=None):
+    """Arranque en caliente: llena los catálogos vacíos desde el disco. Retorna True si cargó algo."""
+    ruta = _ruta_instantanea(ruta)
+    if not ruta or not os.path.exists(ruta): return False
+    try:
+        with open(ruta, "rb") as f:
+            datos = pickle.load(f)  # Archivo propio de la aplicación, en su carpeta
+    except Exception as e:
+        log.warning("Instantánea de catálogos ilegible (%s); se carga desde la BD", e)
+        return False
+    if datos.get('origen') != _origen():
+        return False
+    cargados = [CATALOGOS[nombre].importar(estado) for nombre, estado in datos['catalogos'].items() if nombre in CATALOGOS]
+    return any(cargados)
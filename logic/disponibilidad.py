@@ -0,0 +1,225 @@
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from data.database import DatabaseManager
+from config.settings import DISPONIBILIDAD_TTL
+
+# Una reserva bloquea la mesa ±1h59m alrededor de su hora (misma regla que las consultas SQL)
+MARGEN_RESERVA = timedelta(hours=1, minutes=59)
+ESTADOS_ACTIVOS = (1, 2, 4)  # Pendiente, Confirmada, Completada
+
+
+def nivel_visual(id_estado):
+    # 0 = libre, 1 = reservada (pendiente/confirmada), 2 = ocupada (completada)
+    if id_estado in (1, 2): return 1
+    if id_estado == 4: return 2
+    return 0
+
+
+def slots_del_rango(desde, dias=1, hora_inicio=8, hora_fin=22, minutos_slot=15):
+    """Inicios de franja de cada día: hora_inicio:00 hasta la última franja que empieza antes de hora_fin+1."""
+    slots = []
+    for d in range(dias):
+        base = datetime(desde.year, desde.month, desde.day, hora_inicio) + timedelta(days=d)
+        slots.extend(base + timedelta(minutes=m) for m in range(0, (hora_fin + 1 - hora_inicio) * 60, minutos_slot))
+    return slots
+
+
+def matriz_niveles(filas, slots, id_reserva_ignorar=None):
+    """
+    Barrido de una sola pasada: {idMesa: bytes} con el nivel (0/1/2) de la mesa en cada franja de slots.
+    filas: (idMesa, fechareserva, idReserva, idEstadoreserva). Una reserva a la hora t bloquea las franjas
+    con inicio en [t - margen, t + margen]; con bisect se ubica ese tramo y se pinta de una vez (asignación
+    de slice). Se pinta primero el nivel 1 y luego el 2, así cada celda queda con el máximo.
+    """
+    tramos = {}
+    for id_mesa, fecha, id_reserva, estado in filas:
+        if estado not in ESTADOS_ACTIVOS or id_reserva == id_reserva_ignorar: continue
+        a, b = bisect_left(slots, fecha - MARGEN_RESERVA), bisect_right(slots, fecha + MARGEN_RESERVA)
+        if a < b: tramos.setdefault(id_mesa, []).append((nivel_visual(estado), a, b))
+    resultado = {}
+    for id_mesa, lista in tramos.items():
+        fila = bytearray(len(slots))
+        for nivel, a, b in sorted(lista):
+            fila[a:b] = bytes((nivel,)) * (b - a)
+        resultado[id_mesa] = bytes(fila)
+    return resultado
+
+
+class _Dia:
+    """Reservas activas de un día agrupadas por mesa en arreglos ordenados por fecha."""
+    def __init__(self, filas):
+        self.cargado_en = time.monotonic()
+        self.fechas = {}    # idMesa -> [fechareserva, ...] ordenadas
+        self.reservas = {}  # idMesa -> [(idReserva, idEstadoreserva), ...] en el mismo orden
+        for id_mesa, fecha, id_reserva, estado in sorted(filas, key=lambda f: (f[0], f[1])):
+            self.fechas.setdefault(id_mesa, []).append(fecha)
+            self.reservas.setdefault(id_mesa, []).append((id_reserva, estado))
+
+    def agregar(self, id_mesa, fecha, id_reserva, estado):
+        fechas = self.fechas.setdefault(id_mesa, [])
+        pos = bisect_right(fechas, fecha)
+        fechas.insert(pos, fecha)
+        self.reservas.setdefault(id_mesa, []).insert(pos, (id_reserva, estado))
+
+    def quitar(self, id_reserva):
+        for id_mesa, reservas in self.reservas.items():
+            for pos in range(len(reservas) - 1, -1, -1):
+                if reservas[pos][0] == id_reserva:
+                    del reservas[pos]
+                    del self.fechas[id_mesa][pos]
+
+    def cambiar_estado(self, id_reserva, estado):
+        encontrada = False
+        for reservas in self.reservas.values():
+            for pos, (id_r, _) in enumerate(reservas):
+                if id_r == id_reserva:
+                    reservas[pos] = (id_r, estado)
+                    encontrada = True
+        return encontrada
+
+    def en_rango(self, id_mesa, inicio, fin):
+        # Reservas de la mesa con fechareserva BETWEEN inicio AND fin
+        fechas = self.fechas.get(id_mesa)
+        if not fechas: return []
+        return self.reservas[id_mesa][bisect_left(fechas, inicio):bisect_right(fechas, fin)]
+
+
+class IndiceDisponibilidad:
+    """
+    Foto en memoria de las reservas activas por día y por mesa.
+    Responde "¿qué mesas chocan a la hora T?" y "¿estado de cada mesa a la hora T?" sin ir a la BD.
+    Cada día se recarga al vencer el TTL (cambios de otras terminales) y se actualiza
+    incrementalmente con las escrituras de este cliente.
+    """
+    def __init__(self, ttl=DISPONIBILIDAD_TTL):
+        self.ttl = ttl
+        self._dias = {}          # date -> _Dia
+        self.nombres_mesa = {}   # idMesa -> Nmesa (para reportar conflictos por nombre)
+        self._lock = threading.RLock()
+        self._generacion = 0     # Sube con cada cambio; una carga que empezó antes no se cachea
+
+    # --- Consultas ---
+    def niveles(self, fecha_hora, id_reserva_ignorar=None):
+        """{idMesa: nivel} con el nivel más alto (1 reservada, 2 ocupada) que choca con fecha_hora."""
+        inicio, fin = fecha_hora - MARGEN_RESERVA, fecha_hora + MARGEN_RESERVA
+        resultado = {}
+        dias = self._dias_del_rango(inicio, fin)
+        with self._lock:
+            for dia in dias:
+                for id_mesa in dia.fechas:
+                    for id_reserva, estado in dia.en_rango(id_mesa, inicio, fin):
+                        if id_reserva == id_reserva_ignorar: continue
+                        nivel = nivel_visual(estado)
+                        if nivel > resultado.get(id_mesa, 0):
+                            resultado[id_mesa] = nivel
+        return resultado
+
+    def conflictos(self, fecha_hora, ids_mesas, id_reserva_ignorar=None):
+        """Nombres de las mesas de ids_mesas ocupadas o reservadas en el rango (lista vacía si todo libre)."""
+        inicio, fin = fecha_hora - MARGEN_RESERVA, fecha_hora + MARGEN_RESERVA
+        nombres = set()
+        dias = self._dias_del_rango(inicio, fin)
+        with self._lock:
+            for dia in dias:
+                for id_mesa in ids_mesas:
+                    if any(id_r != id_reserva_ignorar for id_r, _ in dia.en_rango(id_mesa, inicio, fin)):
+                        nombres.add(self.nombres_mesa.get(id_mesa, str(id_mesa)))
+        return sorted(nombres)
+
+    # --- Invalidación / actualización incremental ---
+    def invalidar(self, fecha=None):
+        with self._lock:
+            self._generacion += 1
+            if fecha is None:
+                self._dias.clear()
+            else:
+                self._dias.pop(fecha.date() if isinstance(fecha, datetime) else fecha, None)
+
+    def invalidar_rango(self, fecha_hora):
+        # Días que toca la ventana ±1h59m de fecha_hora
+        self.invalidar((fecha_hora - MARGEN_RESERVA).date())
+        self.invalidar((fecha_hora + MARGEN_RESERVA).date())
+
+    def registrar_nombres(self, nombres):
+        with self._lock:
+            self.nombres_mesa.update(nombres)
+
+    def registrar_reserva(self, id_reserva, fecha_hora, ids_mesas, id_estado=1):
+        """Alta o edición hecha por este cliente: se refleja sin recargar el día."""
+        with self._lock:
+            self._generacion += 1
+            for dia in self._dias.values():
+                dia.quitar(id_reserva)
+            dia = self._dias.get(fecha_hora.date())
+            if dia and id_estado in ESTADOS_ACTIVOS:
+                for id_mesa in ids_mesas:
+                    dia.agregar(id_mesa, fecha_hora, id_reserva, id_estado)
+
+    def cambiar_estado(self, id_reserva, id_estado, fecha_hora):
+        with self._lock:
+            self._generacion += 1
+            if id_estado not in ESTADOS_ACTIVOS:
+                for dia in self._dias.values():
+                    dia.quitar(id_reserva)
+                return
+            dia = self._dias.get(fecha_hora.date())
+            # Reactivada (p. ej. cancelada -> confirmada): no está en el índice y su mesa no se sabe aquí; se recarga el día
+            if dia and not dia.cambiar_estado(id_reserva, id_estado):
+                del self._dias[fecha_hora.date()]
+
+    def quitar_reserva(self, id_reserva):
+        with self._lock:
+            self._generacion += 1
+            for dia in self._dias.values():
+                dia.quitar(id_reserva)
+
+    # --- Carga ---
+    def _dias_del_rango(self, inicio, fin):
+        # Se llama sin el lock: las recargas de BD no frenan las consultas de otros hilos
+        dias, dia = [], inicio.date()
+        while dia <= fin.date():
+            dias.append(self._obtener_dia(dia))
+            dia += timedelta(days=1)
+        return dias
+
+    def _obtener_dia(self, dia):
+        with self._lock:
+            actual = self._dias.get(dia)
+            if actual is not None and time.monotonic() - actual.cargado_en <= self.ttl:
+                return actual
+            generacion = self._generacion
+        filas = self._cargar(dia)
+        if filas is None:
+            return _Dia([])  # Error de BD: no se cachea un día vacío falso
+        nuevo = _Dia([(f[0], f[2], f[3], f[4]) for f in filas])
+        with self._lock:
+            self.nombres_mesa.update((f[0], f[1]) for f in filas)
+            # Si hubo escrituras o invalidaciones durante la carga, la foto puede no incluirlas:
+            # sirve para esta consulta pero no se cachea
+            if self._generacion == generacion:
+                self._dias[dia] = nuevo
+        return nuevo
+
+    @staticmethod
+    def _cargar(dia):
+        desde = datetime(dia.year, dia.month, dia.day)
+        return cargar_reservas_activas(desde, desde + timedelta(days=1))
+
+
+def cargar_reservas_activas(desde, hasta):
+    """(idMesa, Nmesa, fechareserva, idReserva, idEstadoreserva) activas con desde <= fecha < hasta. None si falla la BD."""
+    sql = """
+    SELECT DR.idMesa, M.Nmesa, R.fechareserva, R.idReserva, R.idEstadoreserva
+    FROM SGR_T_DetalleReserva DR
+    JOIN SGR_T_Reserva R ON DR.idReserva = R.idReserva
+    JOIN SGR_M_Mesa M ON DR.idMesa = M.idMesa
+    WHERE R.idEstadoreserva IN (1, 2, 4)
+    AND R.fechareserva >= ? AND R.fechareserva < ?
+    """
+    return DatabaseManager.run_query(sql, (desde, hasta), fetchall=True)
+
+
+# Instancia compartida por toda la aplicación
+INDICE = IndiceDisponibilidad()
@@ -0,0 +1,116 @@
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from data.database import DatabaseManager
+from logic.disponibilidad import INDICE
+from config.settings import NOTIFICACIONES_CONFIG
+
+log = logging.getLogger(__name__)
+
+
+class FeedCambios:
+    """
+    Lee SGR_S_Cambio (lo llenan los triggers de la migración 002) desde la última marca de agua.
+    Cada revisión invalida en el índice de disponibilidad solo los días tocados y avisa a los suscriptores
+    con la lista de cambios [(idCambio, idReserva, fechareserva, tipo)]. Si no hubo cambios, la consulta
+    es un seek sobre la PK que no devuelve filas.
+    """
+    def __init__(self, lote=NOTIFICACIONES_CONFIG['lote'], retencion_horas=NOTIFICACIONES_CONFIG['retencion_horas'],
+                 purgar_cada_s=NOTIFICACIONES_CONFIG['purgar_cada_s']):
+        self.lote = lote
+        self.retencion = timedelta(hours=retencion_horas)
+        self.purgar_cada_s = purgar_cada_s
+        self.ultimo = None          # Marca de agua: último idCambio procesado
+        self.disponible = None      # None = aún no se comprobó que exista la tabla
+        self._purgado_en = time.monotonic()
+        self._suscriptores = []
+        self._lock = threading.Lock()
+        self._hilo = None
+
+    def suscribir(self, funcion):
+        """funcion(cambios) se llama desde el hilo que revisa (en la UI, usar el ejecutor)."""
+        self._suscriptores.append(funcion)
+
+    def revisar(self):
+        """Procesa los cambios nuevos. Retorna la lista (vacía si no hubo o si el feed no está disponible)."""
+        with self._lock:
+            if self.disponible is None:
+                self._iniciar()
+            if not self.disponible:
+                return []
+            cambios = self._leer_nuevos()
+            if cambios is None:
+                return []
+            if cambios:
+                self._invalidar(cambios)
+                for funcion in self._suscriptores:
+                    funcion(cambios)
+            if time.monotonic() - self._purgado_en > self.purgar_cada_s:
+                self._purgar()
+            return cambios
+
+    def iniciar_en_fondo(self, intervalo_s=NOTIFICACIONES_CONFIG['intervalo_ms'] / 1000):
+        """Revisión periódica en un hilo demonio (procesos sin Tk, p. ej. servidor.py)."""
+        def bucle():
+            while True:
+                try:
+                    self.revisar()
+                except Exception:
+                    log.exception("Error revisando el feed de cambios")
+                time.sleep(intervalo_s)
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=bucle, name="feed-cambios", daemon=True)
+            self._hilo.start()
+
+    # --- Internos ---
+    def _iniciar(self):
+        # Se parte de lo que ya existe: lo anterior ya está reflejado en la carga inicial de cada pantalla
+        backend = DatabaseManager.backend()
+        try:
+            with DatabaseManager.transaccion() as uow:
+                fila = uow.consultar("SELECT MAX(idCambio) FROM SGR_S_Cambio", fetchone=True)
+        except backend.errores as e:
+            log.warning("Feed de cambios no disponible (¿falta la migración 002?): %s", e)
+            self.disponible = False
+            return
+        self.ultimo = fila[0] or 0
+        self.disponible = True
+
+    def _leer_nuevos(self):
+        d = DatabaseManager.dialecto()
+        sql = f"""
+        SELECT idCambio, idReserva, fechareserva, tipo
+        FROM SGR_S_Cambio
+        WHERE idCambio > ?
+        ORDER BY idCambio
+        {d.primeras_filas()}
+        """
+        cambios = []
+        while True:
+            filas = DatabaseManager.run_query(sql, (self.ultimo, self.lote), fetchall=True, reportar=False)
+            if filas is None:
+                return None if not cambios else cambios
+            cambios.extend(tuple(f) for f in filas)
+            if filas:
+                self.ultimo = filas[-1][0]
+            if len(filas) < self.lote:
+                return cambios
+
+    @staticmethod
+    def _invalidar(cambios):
+        dias = {c[2].date() for c in cambios if c[2] is not None}
+        if any(c[2] is None for c in cambios):
+            INDICE.invalidar()  # Sin fecha (reserva ya borrada): no se sabe qué día tocó
+            return
+        for dia in dias:
+            INDICE.invalidar(dia)  # El índice guarda cada reserva en el día de su fechareserva
+
+    def _purgar(self):
+        self._purgado_en = time.monotonic()
+        DatabaseManager.run_query("DELETE FROM SGR_S_Cambio WHERE fechacambio < ?",
+                                  (datetime.now() - self.retencion,), commit=True, reportar=False)
+
+
+# Instancia compartida por toda la aplicación
+FEED = FeedCambios()
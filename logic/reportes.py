@@ -0,0 +1,235 @@
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+from data.database import DatabaseManager
+from logic.catalogos import MESAS
+from logic.disponibilidad import ESTADOS_ACTIVOS
+from config.settings import ID_RESTAURANTE_ACTUAL, REPORTES_CONFIG, GRILLA_CONFIG
+
+log = logging.getLogger(__name__)
+
+AGRUPACIONES = {
+    'dia': lambda f: f,
+    'semana': lambda f: f - timedelta(days=f.weekday()),  # Lunes de esa semana
+    'mes': lambda f: f.replace(day=1),
+}
+
+
+class Reportes:
+    """
+    Reportes de gestión (ocupación por mesa, cancelaciones, ingresos por políticas) sobre los resúmenes
+    diarios de la migración 004. Nunca se agrega SGR_T_Reserva al consultar un reporte:
+    - refrescar(): recalcula solo los días que los triggers anotaron en SGR_R_MarcaDia (migración 005). Corre en
+      segundo plano (iniciar_en_fondo) o programado, nunca dentro de una consulta;
+    - resumen(): solo lee SGR_R_ResumenDia y SGR_R_OcupacionMesaDia (un año = 365 filas por restaurante + 365 por mesa)
+      tal como están, sin transacción de escritura, e informa su antigüedad.
+    """
+    _hilo = None
+
+    @staticmethod
+    def refrescar(dias_por_transaccion=REPORTES_CONFIG['dias_por_transaccion']):
+        """
+        Recalcula los días marcados. Retorna cuántos eran.
+        La cola solo crece por el final: el recálculo no la toca y las marcas ya procesadas se borran al
+        terminar, en una transacción corta. Ninguna transacción toma las tablas en el orden inverso al de
+        las terminales (reserva y después marca), así que el refresco no puede interbloquearse con ellas.
+        """
+        d = DatabaseManager.dialecto()
+        momento = datetime.now()
+        # Espera a las marcas de transacciones en curso: así toda marca <= ultima ya está confirmada y se ve
+        marcas = _consultar(f"SELECT idMarca, fecha FROM {d.leer_confirmado('SGR_R_MarcaDia')}")
+        if not marcas: return 0
+        ultima = max(m[0] for m in marcas)
+        dias = sorted({_fecha(m[1]) for m in marcas})
+        for desde, hasta in _rangos(dias, dias_por_transaccion):
+            with DatabaseManager.transaccion() as uow:
+                Reportes._recalcular(uow, desde, hasta)
+        # Un cambio que entró durante el recálculo tiene una marca > ultima: queda para el próximo refresco
+        with DatabaseManager.transaccion() as uow:
+            uow.ejecutar("DELETE FROM SGR_R_MarcaDia WHERE idMarca <= ?", (ultima,))
+            if not uow.ejecutar("UPDATE SGR_R_Refresco SET fechahora = ? WHERE id = 1", (momento,)):
+                uow.ejecutar("INSERT INTO SGR_R_Refresco (id, fechahora) VALUES (1, ?)", (momento,))
+        return len(dias)
+
+    @staticmethod
+    def iniciar_en_fondo(intervalo_s=REPORTES_CONFIG['refrescar_cada_s']):
+        """Refresco periódico en un hilo demonio (app.py y servidor.py). intervalo_s=0: no se inicia."""
+        def bucle():
+            while True:
+                time.sleep(intervalo_s)
+                try:
+                    Reportes.refrescar()
+                except Exception:
+                    log.exception("Error refrescando los resúmenes de reportes")
+        if intervalo_s and Reportes._hilo is None:
+            Reportes._hilo = threading.Thread(target=bucle, name="refresco-reportes", daemon=True)
+            Reportes._hilo.start()
+
+    @staticmethod
+    def reconstruir(desde=None, hasta=None, dias_por_transaccion=REPORTES_CONFIG['dias_por_transaccion']):
+        """
+        Recalcula todo un rango (por defecto toda la historia), p. ej. tras cambiar SGR_P_Politica.Valor,
+        que no pasa por los triggers. Retorna cuántos días recalculó.
+        """
+        if desde is None or hasta is None:
+            d = DatabaseManager.dialecto()
+            primero, ultimo = _consultar(
+                f"SELECT MIN({d.fecha_de('fechareserva')}), MAX({d.fecha_de('fechareserva')}) FROM SGR_T_Reserva")[0]
+            if primero is None: return 0
+            desde = primero if desde is None else desde
+            hasta = ultimo if hasta is None else hasta
+        desde, hasta = _fecha(desde), _fecha(hasta)
+        dias = [desde + timedelta(days=i) for i in range((hasta - desde).days + 1)]
+        for inicio, fin in _rangos(dias, dias_por_transaccion):
+            with DatabaseManager.transaccion() as uow:
+                Reportes._recalcular(uow, inicio, fin)  # Las marcas de estos días las borra el próximo refrescar()
+        return len(dias)
+
+    @staticmethod
+    def resumen(desde, hasta, agrupar="dia"):
+        """
+        Reporte del rango [desde, hasta] (días inclusive) agrupado por 'dia', 'semana' o 'mes'.
+        Retorna {'desde', 'hasta', 'agrupar', 'periodos': [...], 'mesas': [...], 'totales': {...},
+                 'actualizado', 'dias_pendientes', 'ms'}.
+        actualizado: último refresco (None = nunca); dias_pendientes: días del rango con cambios aún no resumidos.
+        ocupacion = horas reservadas / horas de servicio (GRILLA_CONFIG), con REPORTES_CONFIG['minutos_por_reserva'] por reserva.
+        """
+        if agrupar not in AGRUPACIONES:
+            raise ValueError(f"agrupar debe ser uno de {', '.join(AGRUPACIONES)}")
+        inicio = time.perf_counter()
+        desde, hasta = _fecha(desde), _fecha(hasta)
+        if hasta < desde:
+            raise ValueError("hasta es anterior a desde")
+        fin = hasta + timedelta(days=1)
+        params = (ID_RESTAURANTE_ACTUAL, desde, fin)
+        # Solo lecturas sueltas: en SQLite una transacción tomaría el bloqueo de escritura de las terminales
+        dias = _consultar(
+            """SELECT fecha, reservas, pendientes, confirmadas, canceladas, completadas, personas, ingresos
+               FROM SGR_R_ResumenDia WHERE idRestaurante = ? AND fecha >= ? AND fecha < ?""", params)
+        mesas_dia = _consultar(
+            """SELECT fecha, SUM(reservas) FROM SGR_R_OcupacionMesaDia
+               WHERE idRestaurante = ? AND fecha >= ? AND fecha < ? GROUP BY fecha""", params)
+        por_mesa = _consultar(
+            """SELECT idMesa, SUM(reservas), SUM(canceladas) FROM SGR_R_OcupacionMesaDia
+               WHERE idRestaurante = ? AND fecha >= ? AND fecha < ? GROUP BY idMesa""", params)
+        pendientes = _consultar("SELECT COUNT(DISTINCT fecha) FROM SGR_R_MarcaDia WHERE fecha >= ? AND fecha < ?", (desde, fin))[0][0]
+        actualizado = _consultar("SELECT fechahora FROM SGR_R_Refresco WHERE id = 1")
+        MESAS.actualizar()
+
+        clave = AGRUPACIONES[agrupar]
+        dias_por_periodo = Counter(clave(desde + timedelta(days=i)) for i in range((hasta - desde).days + 1))
+        periodos = {p: dict(_vacio(), periodo=p) for p in sorted(dias_por_periodo)}
+        for f in dias:
+            p = periodos[clave(_fecha(f[0]))]
+            for campo, valor in zip(("reservas", "pendientes", "confirmadas", "canceladas", "completadas", "personas"), f[1:7]):
+                p[campo] += valor
+            p['ingresos'] += float(f[7] or 0)
+        for f in mesas_dia:
+            periodos[clave(_fecha(f[0]))]['mesas_reservadas'] += f[1]
+
+        n_mesas = len(MESAS.por_id) or 1
+        por_reserva, por_dia = REPORTES_CONFIG['minutos_por_reserva'], _minutos_servicio()
+        for p in periodos.values():
+            _tasas(p, n_mesas * dias_por_periodo[p['periodo']] * por_dia, por_reserva)
+        n_dias = sum(dias_por_periodo.values())
+        mesas = []
+        for id_mesa, reservas, canceladas in por_mesa:
+            fila = MESAS.por_id.get(id_mesa)
+            m = {'id': id_mesa, 'mesa': fila[1] if fila else f"#{id_mesa}", 'capacidad': fila[2] if fila else None,
+                 'reservas': reservas, 'canceladas': canceladas, 'mesas_reservadas': reservas}
+            mesas.append(_tasas(m, n_dias * por_dia, por_reserva, total=reservas + canceladas))
+        mesas.sort(key=lambda m: (-m['ocupacion'], m['mesa']))
+
+        totales = _vacio()
+        for p in periodos.values():
+            for campo in totales:
+                totales[campo] += p[campo]
+        _tasas(totales, n_mesas * n_dias * por_dia, por_reserva)
+        for p in list(periodos.values()) + [totales]:
+            p['ingresos'] = round(p['ingresos'], 2)
+        return {
+            'desde': desde, 'hasta': hasta, 'agrupar': agrupar,
+            'periodos': list(periodos.values()), 'mesas': mesas, 'totales': totales,
+            'actualizado': actualizado[0][0] if actualizado else None, 'dias_pendientes': pendientes,
+            'ms': round((time.perf_counter() - inicio) * 1000, 1)
+        }
+
+    # --- Internos ---
+    @staticmethod
+    def _recalcular(uow, desde, hasta):
+        # Días [desde, hasta): se borran y se vuelven a agregar desde las tablas de reservas, todo dentro de la BD
+        d = DatabaseManager.dialecto()
+        dia = d.fecha_de("R.fechareserva")
+        rango = (datetime(desde.year, desde.month, desde.day), datetime(hasta.year, hasta.month, hasta.day))
+        activos = ", ".join(str(e) for e in ESTADOS_ACTIVOS)
+        uow.ejecutar("DELETE FROM SGR_R_ResumenDia WHERE fecha >= ? AND fecha < ?", (desde, hasta))
+        uow.ejecutar("DELETE FROM SGR_R_OcupacionMesaDia WHERE fecha >= ? AND fecha < ?", (desde, hasta))
+        uow.ejecutar(f"""
+        INSERT INTO SGR_R_ResumenDia (idRestaurante, fecha, reservas, pendientes, confirmadas, canceladas, completadas, personas, ingresos)
+        SELECT R.idRestaurante, {dia}, COUNT(*),
+               SUM(CASE WHEN R.idEstadoreserva = 1 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN R.idEstadoreserva = 2 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN R.idEstadoreserva = 3 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN R.idEstadoreserva = 4 THEN 1 ELSE 0 END),
+               SUM(CASE WHEN R.idEstadoreserva = 3 THEN 0 ELSE {d.isnull("R.Npersonas", "0")} END),
+               {d.isnull("SUM(P.Valor)", "0")}
+        FROM SGR_T_Reserva R
+        LEFT JOIN SGR_P_Politica P ON P.idPolitica = R.idPolitica
+        WHERE R.fechareserva >= ? AND R.fechareserva < ? AND R.idRestaurante IS NOT NULL
+        GROUP BY R.idRestaurante, {dia}
+        """, rango)
+        uow.ejecutar(f"""
+        INSERT INTO SGR_R_OcupacionMesaDia (idRestaurante, fecha, idMesa, reservas, canceladas)
+        SELECT R.idRestaurante, {dia}, D.idMesa,
+               SUM(CASE WHEN R.idEstadoreserva IN ({activos}) THEN 1 ELSE 0 END),
+               SUM(CASE WHEN R.idEstadoreserva = 3 THEN 1 ELSE 0 END)
+        FROM SGR_T_Reserva R
+        JOIN SGR_T_DetalleReserva D ON D.idReserva = R.idReserva
+        WHERE R.fechareserva >= ? AND R.fechareserva < ? AND R.idRestaurante IS NOT NULL AND D.idMesa IS NOT NULL
+        GROUP BY R.idRestaurante, {dia}, D.idMesa
+        """, rango)
+
+
+def _consultar(sql, params=()):
+    # Lectura sin transacción; los errores llegan a quien pidió el reporte (el visor los muestra en al_error)
+    filas = DatabaseManager.run_query(sql, params, fetchall=True, reportar=False)
+    if filas is None:
+        raise RuntimeError("No se pudieron leer los datos de reportes (ver el log)")
+    return filas
+
+
+def _fecha(valor):
+    # date, datetime, o texto ISO (SQLite devuelve texto en expresiones sin tipo declarado)
+    if isinstance(valor, datetime): return valor.date()
+    if isinstance(valor, date): return valor
+    return date.fromisoformat(str(valor)[:10])
+
+
+def _rangos(dias, maximo):
+    """Días ordenados -> rangos [desde, hasta) de días consecutivos, de a lo sumo maximo días cada uno."""
+    rangos = []
+    for dia in dias:
+        if rangos and dia == rangos[-1][1] and (dia - rangos[-1][0]).days < maximo:
+            rangos[-1][1] = dia + timedelta(days=1)
+        else:
+            rangos.append([dia, dia + timedelta(days=1)])
+    return [tuple(r) for r in rangos]
+
+
+def _minutos_servicio():
+    # Mismo horario que la grilla: de hora_inicio a hora_fin:59
+    return (GRILLA_CONFIG['hora_fin'] + 1 - GRILLA_CONFIG['hora_inicio']) * 60
+
+
+def _vacio():
+    return {'reservas': 0, 'pendientes': 0, 'confirmadas': 0, 'canceladas': 0, 'completadas': 0,
+            'personas': 0, 'ingresos': 0.0, 'mesas_reservadas': 0}
+
+
+def _tasas(fila, minutos_disponibles, minutos_por_reserva, total=None):
+    total = fila['reservas'] if total is None else total
+    fila['tasa_cancelacion'] = round(fila['canceladas'] / total, 4) if total else 0.0
+    fila['ocupacion'] = round(fila['mesas_reservadas'] * minutos_por_reserva / minutos_disponibles, 4) if minutos_disponibles else 0.0
+    return fila
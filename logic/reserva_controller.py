@@ -1,45 +1,202 @@
-from datetime import timedelta
-from data.database import DatabaseManager
-from config.settings import ID_RESTAURANTE_ACTUAL, COLOR_DISPONIBLE, COLOR_OCUPADA, COLOR_RESERVADA
+from datetime import datetime, timedelta
+from data.database import DatabaseManager, MAX_PARAMETROS_IN
+from logic.disponibilidad import INDICE, MARGEN_RESERVA, nivel_visual, slots_del_rango, matriz_niveles, cargar_reservas_activas
+from logic.catalogos import MESAS
+from logic.asignacion_mesas import proponer_mesas, zona_por_nombre
+from config.settings import ID_RESTAURANTE_ACTUAL, COLOR_DISPONIBLE, COLOR_OCUPADA, COLOR_RESERVADA, MONITOR_DIAS_VENTANA, ASIGNACION_CONFIG, GRILLA_CONFIG, BLOQUEO_RESERVA_TIMEOUT_MS
+
+class ConflictoReservaError(Exception):
+    """Alguna de las mesas ya tiene una reserva activa en ese horario."""
+    def __init__(self, mesas):
+        super().__init__(f"Mesas ocupadas o reservadas en ese horario: {', '.join(mesas)}")
+        self.mesas = mesas
+
+
+class NoEncontradoError(Exception):
+    """La reserva pedida no existe (p. ej. otra terminal la eliminó)."""
+
 
 class ReservaController:
     
     @staticmethod
-    def verificar_conflicto_mesas(fecha_hora, lista_ids_mesas, id_reserva_ignorar=None):
+    def verificar_conflicto_mesas(fecha_hora, lista_ids_mesas, id_reserva_ignorar=None, forzar_recarga=False):
         """
         Revisa si alguna de las mesas seleccionadas ya tiene reserva en el rango de tiempo.
+        Se responde desde el índice en memoria; forzar_recarga=True relee el día de la BD
+        (se usa antes de guardar para ver lo que hicieron otras terminales).
         Retorna: Una lista con los NOMBRES de las mesas en conflicto, o None si todo está libre.
         """
+        if forzar_recarga:
+            INDICE.invalidar_rango(fecha_hora)
+        return INDICE.conflictos(fecha_hora, lista_ids_mesas, id_reserva_ignorar) or None
+
+    @staticmethod
+    def verificar_conflicto_mesas_bd(fecha_hora, lista_ids_mesas, id_reserva_ignorar=None):
+        """Versión directa contra la BD de verificar_conflicto_mesas (referencia de paridad del índice)."""
+        sql, params = ReservaController._sql_conflictos(fecha_hora, lista_ids_mesas, id_reserva_ignorar)
+        conflictos = DatabaseManager.run_query(sql, params, fetchall=True)
+        
+        if conflictos:
+            # Retornamos los nombres de las mesas culpables (ej: ['M-06', 'VIP-01'])
+            return [row[0] for row in conflictos]
+        return None
+
+    @staticmethod
+    def _sql_conflictos(fecha_hora, lista_ids_mesas, id_reserva_ignorar=None):
         # Rango de tiempo (la misma lógica de 2 horas)
         inicio = fecha_hora - timedelta(hours=1, minutes=59)
         fin = fecha_hora + timedelta(hours=1, minutes=59)
         
-        # Convertir lista de IDs a string para SQL (ej: "1, 2, 5")
-        ids_str = ",".join(map(str, lista_ids_mesas))
-        
+        # IDs como parámetros con aridad fija (plan reutilizable y sin inyección)
+        marcadores, ids_params = DatabaseManager.parametros_in(lista_ids_mesas)
+
         sql = f"""
         SELECT DISTINCT M.Nmesa
         FROM SGR_T_DetalleReserva DR
         JOIN SGR_T_Reserva R ON DR.idReserva = R.idReserva
         JOIN SGR_M_Mesa M ON DR.idMesa = M.idMesa
         WHERE R.idEstadoreserva IN (1, 2, 4)  -- Pendiente, Conf, Comp
-        AND DR.idMesa IN ({ids_str})          -- ¿Es alguna de las que quiero?
+        AND DR.idMesa IN ({marcadores})       -- ¿Es alguna de las que quiero?
         AND R.fechareserva BETWEEN ? AND ?    -- ¿Choca en hora?
         """
-        
-        params = [inicio, fin]
+
+        params = ids_params + [inicio, fin]
         
         # Si editamos, no chocar con nosotros mismos
         if id_reserva_ignorar:
             sql += " AND R.idReserva != ?"
             params.append(id_reserva_ignorar)
-            
-        conflictos = DatabaseManager.run_query(sql, tuple(params), fetchall=True)
-        
-        if conflictos:
-            # Retornamos los nombres de las mesas culpables (ej: ['M-06', 'VIP-01'])
-            return [row[0] for row in conflictos]
-        return None
+        return sql, tuple(params)
+
+    @staticmethod
+    def _recursos_bloqueo(fecha_hora):
+        """
+        Nombres de bloqueo por restaurante y cubeta de 1 hora: la de la reserva y sus dos vecinas.
+        Dos reservas que chocan (a menos de 1h59m) caen en cubetas a distancia <= 2, así que sus
+        tríos de cubetas siempre comparten al menos una: la segunda espera a que la primera confirme.
+        """
+        hora = fecha_hora.replace(minute=0, second=0, microsecond=0)
+        return [f"SGR_Reserva_R{ID_RESTAURANTE_ACTUAL}_{(hora + timedelta(hours=h)):%Y%m%d%H}" for h in (-1, 0, 1)]
+
+    @staticmethod
+    def ventana_monitor(dias=MONITOR_DIAS_VENTANA, referencia=None):
+        """Rango por defecto del monitor: desde el inicio de (hoy - dias) hasta el final de (hoy + dias)."""
+        hoy = (referencia or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+        return hoy - timedelta(days=dias), hoy + timedelta(days=dias + 1) - timedelta(seconds=1)
+
+    @staticmethod
+    def listar_reservas_monitor(desde=None, hasta=None, despues_de=None, limite=None, ids=None, antes_de=None):
+        """
+        Reservas para el monitor con sus mesas ya concatenadas, en UNA sola consulta.
+        - desde/hasta: ventana de fechas (None = sin filtro).
+        - despues_de: cursor (fechareserva, idReserva) de la última fila ya mostrada (paginación keyset).
+        - antes_de: cursor de la primera fila mostrada: la página anterior (al volver a subir con el scroll).
+        - limite: tamaño de página (None = todas).
+        - ids: solo esas reservas (refresco incremental desde el feed de cambios).
+        Retorna filas: (idReserva, cliente, fechareserva, Npersonas, estado, idEstadoreserva, mesas)
+        """
+        if ids is not None and len(ids) > MAX_PARAMETROS_IN:
+            ids, filas = list(ids), []
+            for i in range(0, len(ids), MAX_PARAMETROS_IN):
+                filas.extend(ReservaController.listar_reservas_monitor(desde, hasta, despues_de, limite, ids[i:i + MAX_PARAMETROS_IN], antes_de))
+            return sorted(filas, key=lambda f: (f[2], f[0]), reverse=True)  # Orden del monitor
+        d = DatabaseManager.dialecto()
+        filtros, params = [], []
+        if desde is not None:
+            filtros.append("R.fechareserva >= ?"); params.append(desde)
+        if hasta is not None:
+            filtros.append("R.fechareserva <= ?"); params.append(hasta)
+        if despues_de is not None:
+            # Orden descendente: la siguiente página es "menor" que el cursor
+            filtros.append("(R.fechareserva < ? OR (R.fechareserva = ? AND R.idReserva < ?))")
+            params.extend([despues_de[0], despues_de[0], despues_de[1]])
+        if antes_de is not None:
+            # Se recorre al revés (ASC) desde el cursor y se invierte: la página queda en el orden del monitor
+            filtros.append("(R.fechareserva > ? OR (R.fechareserva = ? AND R.idReserva > ?))")
+            params.extend([antes_de[0], antes_de[0], antes_de[1]])
+        if ids:
+            marcadores, ids_params = DatabaseManager.parametros_in(ids)
+            filtros.append(f"R.idReserva IN ({marcadores})"); params.extend(ids_params)
+        if limite:
+            params.append(limite)
+
+        orden = "ASC" if antes_de is not None else "DESC"
+        # Subconsulta escalar en vez de OUTER APPLY: la entienden ambos motores y usa el mismo índice
+        sql = f"""
+        SELECT R.idReserva, {d.concat("C.nombre", "' '", "C.apellido")}, R.fechareserva,
+               R.Npersonas, E.Descripcion, R.idEstadoreserva,
+               (SELECT {d.agregar_texto("M.Nmesa")}
+                FROM SGR_T_DetalleReserva DR
+                JOIN SGR_M_Mesa M ON DR.idMesa = M.idMesa
+                WHERE DR.idReserva = R.idReserva) AS mesas
+        FROM SGR_T_Reserva R
+        JOIN SGR_M_Cliente C ON R.idCliente = C.idCliente
+        JOIN SGR_P_Estadoreserva E ON R.idEstadoreserva = E.idEstadoreserva
+        {"WHERE " + " AND ".join(filtros) if filtros else ""}
+        ORDER BY R.fechareserva {orden}, R.idReserva {orden}
+        {d.primeras_filas() if limite else ""}
+        """
+        filas = DatabaseManager.run_query(sql, tuple(params), fetchall=True) or []
+        return filas[::-1] if antes_de is not None else filas
+
+    @staticmethod
+    def guardar_reserva(fecha_hora, n_personas, id_cliente, id_empleado, ids_mesas, id_reserva=None):
+        """
+        Crea (id_reserva=None) o actualiza una reserva con sus mesas en UNA transacción.
+        La verificación de conflicto va dentro de esa transacción, después de tomar el bloqueo de la
+        franja horaria: dos terminales que guardan la misma mesa a la vez no pueden pasar ambas.
+        Retorna el id de la reserva; si hay choque lanza ConflictoReservaError y si la reserva a editar
+        ya no existe, NoEncontradoError (en ambos casos no se escribe nada).
+        """
+        id_pol = ReservaController.calcular_politica(n_personas, 1) # 1=Pendiente
+        with DatabaseManager.transaccion() as uow:
+            uow.bloquear(ReservaController._recursos_bloqueo(fecha_hora), BLOQUEO_RESERVA_TIMEOUT_MS)
+            sql, params = ReservaController._sql_conflictos(fecha_hora, ids_mesas, id_reserva)
+            ocupadas = uow.consultar(sql, params)
+            if ocupadas:
+                raise ConflictoReservaError(sorted(row[0] for row in ocupadas))
+            if id_reserva:
+                editadas = uow.ejecutar(
+                    "UPDATE SGR_T_Reserva SET fechareserva=?, Npersonas=?, idCliente=?, idEmpleado=?, idPolitica=?, idEstadoreserva=1 WHERE idReserva=?",
+                    (fecha_hora, n_personas, id_cliente, id_empleado, id_pol, id_reserva)
+                )
+                if not editadas:
+                    raise NoEncontradoError(f"No existe la reserva #{id_reserva}")
+                uow.ejecutar("DELETE FROM SGR_T_DetalleReserva WHERE idReserva=?", (id_reserva,))
+            else:
+                id_reserva = uow.insertar(
+                    """INSERT INTO SGR_T_Reserva (fechareserva, Npersonas, idCliente, idEmpleado, idEstadoreserva, idPolitica, idRestaurante)
+                       VALUES (?, ?, ?, ?, 1, ?, ?)""",
+                    (fecha_hora, n_personas, id_cliente, id_empleado, id_pol, ID_RESTAURANTE_ACTUAL)
+                )
+            uow.ejecutar_lote(
+                "INSERT INTO SGR_T_DetalleReserva (idReserva, idMesa, Total) VALUES (?, ?, 0)",
+                [(id_reserva, m_id) for m_id in ids_mesas]
+            )
+        INDICE.registrar_reserva(id_reserva, fecha_hora, ids_mesas)
+        return id_reserva
+
+    @staticmethod
+    def eliminar_reserva(id_reserva):
+        # Hijos primero (detalles y pagos, por las FK) y luego la cabecera, todo o nada
+        with DatabaseManager.transaccion() as uow:
+            uow.ejecutar("DELETE FROM SGR_T_DetalleReserva WHERE idReserva = ?", (id_reserva,))
+            uow.ejecutar("DELETE FROM SGR_T_Pago WHERE idReserva = ?", (id_reserva,))
+            if not uow.ejecutar("DELETE FROM SGR_T_Reserva WHERE idReserva = ?", (id_reserva,)):
+                raise NoEncontradoError(f"No existe la reserva #{id_reserva}")  # Rollback: nada se borró
+        INDICE.quitar_reserva(id_reserva)
+
+    @staticmethod
+    def cambiar_estado(id_reserva, nuevo_estado):
+        # Lectura y UPDATE en una transacción; el índice se toca solo si el cambio quedó confirmado
+        with DatabaseManager.transaccion() as uow:
+            fila = uow.consultar("SELECT Npersonas, fechareserva FROM SGR_T_Reserva WHERE idReserva=?", (id_reserva,), fetchone=True)
+            if not fila:
+                raise NoEncontradoError(f"No existe la reserva #{id_reserva}")  # Otra terminal la eliminó
+            pax, fecha_hora = fila
+            pol = ReservaController.calcular_politica(pax, nuevo_estado)
+            uow.ejecutar("UPDATE SGR_T_Reserva SET idEstadoreserva=?, idPolitica=? WHERE idReserva=?", (nuevo_estado, pol, id_reserva))
+        INDICE.cambiar_estado(id_reserva, nuevo_estado, fecha_hora)
 
     @staticmethod
     def calcular_politica(n_personas, id_estado):
@@ -49,48 +206,12 @@ class ReservaController:
 
     @staticmethod
     def obtener_mesas_disponibles(fecha_filtro=None, id_reserva_ignorar=None):
-        # 1. Traer mesas (NOMBRES NUEVOS: SGR_M_Mesa, idMesa, Nmesa)
-        sql = """
-        SELECT idMesa, Nmesa, capacidad, idEstadomesa 
-        FROM SGR_M_Mesa 
-        WHERE idRestaurante = ?
-        ORDER BY Nmesa ASC
-        """
-        todas = DatabaseManager.run_query(sql, (ID_RESTAURANTE_ACTUAL,), fetchall=True)
+        # 1. Mesas desde el catálogo en memoria (solo va a la BD si cambiaron)
+        MESAS.actualizar()
+        todas = MESAS.filas()  # (idMesa, Nmesa, capacidad, idEstadomesa) ordenadas por nombre
         
-        mapa_prioridad_visual = {} 
-
-        if fecha_filtro:
-            inicio = fecha_filtro - timedelta(hours=1, minutes=59)
-            fin = fecha_filtro + timedelta(hours=1, minutes=59)
-            
-            # NOMBRES NUEVOS: SGR_T_DetalleReserva, SGR_T_Reserva
-            sql_ocup = """
-            SELECT DISTINCT DR.idMesa, R.idEstadoreserva
-            FROM SGR_T_DetalleReserva DR
-            JOIN SGR_T_Reserva R ON DR.idReserva = R.idReserva
-            WHERE R.idEstadoreserva IN (1, 2, 4) 
-            AND R.fechareserva BETWEEN ? AND ?
-            """
-            params = [inicio, fin]
-            
-            if id_reserva_ignorar:
-                sql_ocup += " AND R.idReserva != ?"
-                params.append(id_reserva_ignorar)
-
-            ocupadas_raw = DatabaseManager.run_query(sql_ocup, tuple(params), fetchall=True)
-            
-            for row in ocupadas_raw:
-                id_m = row[0]
-                estado_bd = row[1]
-                
-                nivel_actual = mapa_prioridad_visual.get(id_m, 0)
-                nivel_nuevo = 0
-                if estado_bd in [1, 2]: nivel_nuevo = 1
-                elif estado_bd == 4: nivel_nuevo = 2
-                
-                if nivel_nuevo > nivel_actual:
-                    mapa_prioridad_visual[id_m] = nivel_nuevo
+        INDICE.registrar_nombres({m[0]: m[1] for m in todas})
+        mapa_prioridad_visual = INDICE.niveles(fecha_filtro, id_reserva_ignorar) if fecha_filtro else {}
 
         resultado = []
         for m in todas:
@@ -109,6 +230,68 @@ class ReservaController:
                 'id': id_m,
                 'texto': f"{num} - Cap: {cap} p. {txt}",
                 'capacidad': cap,
+                'nivel': nivel,
                 'estilo': estilo
             })
-        return resultado
\ No newline at end of file
+        return resultado
+
+    @staticmethod
+    def grilla_disponibilidad(desde, dias=1, id_reserva_ignorar=None, minutos_slot=GRILLA_CONFIG['minutos_slot']):
+        """
+        Matriz mesa x franja para uno o varios días (vista de plano / línea de tiempo), con UNA consulta.
+        Cada celda tiene el mismo nivel que obtener_mesas_disponibles daría a esa hora (0 libre, 1 reservada, 2 ocupada).
+        Retorna {'slots': [datetime...], 'mesas': [{'id', 'nombre', 'capacidad', 'niveles': bytes}]} o None si falla la BD.
+        """
+        slots = slots_del_rango(desde, dias, GRILLA_CONFIG['hora_inicio'], GRILLA_CONFIG['hora_fin'], minutos_slot)
+        filas = cargar_reservas_activas(slots[0] - MARGEN_RESERVA, slots[-1] + MARGEN_RESERVA + timedelta(seconds=1))
+        if filas is None: return None
+        MESAS.actualizar()
+        niveles = matriz_niveles([(f[0], f[2], f[3], f[4]) for f in filas], slots, id_reserva_ignorar)
+        vacia = bytes(len(slots))
+        return {
+            'slots': slots,
+            'mesas': [{'id': m[0], 'nombre': m[1], 'capacidad': m[2], 'niveles': niveles.get(m[0], vacia)}
+                      for m in MESAS.filas()]
+        }
+
+    @staticmethod
+    def sugerir_mesas(fecha_hora, n_personas, id_reserva_ignorar=None):
+        """
+        Propone la combinación de mesas libres a esa hora que acomoda n_personas con menos asientos vacíos
+        (y, a igual sobrante, menos mesas), de preferencia en una sola zona.
+        Retorna la lista de idMesa, o None si no hay combinación posible.
+        """
+        MESAS.actualizar()
+        todas = MESAS.filas()
+        INDICE.registrar_nombres({m[0]: m[1] for m in todas})
+        niveles = INDICE.niveles(fecha_hora, id_reserva_ignorar)
+        libres = [(m[0], m[2]) for m in todas if niveles.get(m[0], 0) == 0]
+        zonas = {m[0]: zona_por_nombre(m[1]) for m in todas} if ASIGNACION_CONFIG['por_zona'] else None
+        propuesta = proponer_mesas(libres, n_personas, zonas, ASIGNACION_CONFIG['max_mesas'])
+        return propuesta[0] if propuesta else None
+
+    @staticmethod
+    def niveles_ocupacion_bd(fecha_filtro, id_reserva_ignorar=None):
+        """Versión directa contra la BD de INDICE.niveles (referencia de paridad del índice)."""
+        inicio = fecha_filtro - timedelta(hours=1, minutes=59)
+        fin = fecha_filtro + timedelta(hours=1, minutes=59)
+
+        sql_ocup = """
+        SELECT DISTINCT DR.idMesa, R.idEstadoreserva
+        FROM SGR_T_DetalleReserva DR
+        JOIN SGR_T_Reserva R ON DR.idReserva = R.idReserva
+        WHERE R.idEstadoreserva IN (1, 2, 4)
+        AND R.fechareserva BETWEEN ? AND ?
+        """
+        params = [inicio, fin]
+
+        if id_reserva_ignorar:
+            sql_ocup += " AND R.idReserva != ?"
+            params.append(id_reserva_ignorar)
+
+        mapa_prioridad_visual = {}
+        for id_m, estado_bd in DatabaseManager.run_query(sql_ocup, tuple(params), fetchall=True) or []:
+            nivel_nuevo = nivel_visual(estado_bd)
+            if nivel_nuevo > mapa_prioridad_visual.get(id_m, 0):
+                mapa_prioridad_visual[id_m] = nivel_nuevo
+        return mapa_prioridad_visual
@@ -0,0 +1,202 @@
+from datetime import datetime, date
+from data.database import DatabaseManager
+from logic.reserva_controller import ReservaController, ConflictoReservaError, NoEncontradoError
+from logic.disponibilidad import INDICE
+from logic.catalogos import CLIENTES, EMPLEADOS, MESAS
+from logic.busqueda_clientes import BUSCADOR, buscar_clientes_bd, normalizar
+from config.settings import ID_RESTAURANTE_ACTUAL, BUSQUEDA_CLIENTES_CONFIG, MONITOR_TAMANO_PAGINA
+
+ESTADOS_RESERVA = {1: "Pendiente", 2: "Confirmada", 3: "Cancelada", 4: "Completada"}
+MAX_LIMITE = 500        # Filas por página que se devuelven como máximo (listados y búsqueda)
+MAX_DIAS_GRILLA = 31    # Días por consulta de la grilla
+
+
+class ValidacionError(Exception):
+    """Datos de entrada inválidos; titulo sirve de encabezado para el mensaje al usuario."""
+    def __init__(self, titulo, mensaje):
+        super().__init__(mensaje)
+        self.titulo = titulo
+
+
+class ReservaServicio:
+    """
+    Flujos de negocio de las reservas sin nada de Tk: entran y salen datos planos (dict, list, int, datetime).
+    Los usan la ventana principal, el servidor HTTP (servidor.py) y las pruebas de carga.
+    Errores: ValidacionError (datos), ConflictoReservaError (mesas tomadas), NoEncontradoError.
+    """
+
+    @staticmethod
+    def guardar_reserva(datos, ahora=None):
+        """
+        datos: {'cliente' o 'id_cliente', 'n_personas', 'fecha_hora' (datetime o ISO), 'mesas' [idMesa],
+                'empleado' o 'id_empleado' (opcional), 'id_reserva' (solo al editar)}
+        Retorna {'id_reserva', 'editada'}.
+        """
+        id_reserva = datos.get('id_reserva')
+        mesas = datos.get('mesas') or []
+        if not isinstance(mesas, (list, tuple)):
+            raise ValidacionError("Error", "'mesas' debe ser una lista de ids de mesa")
+        ids_mesas = [ReservaServicio._entero(m, 'mesas') for m in mesas]
+        id_cliente = ReservaServicio._resolver(CLIENTES, datos.get('id_cliente'), datos.get('cliente'), "cliente")
+        if not id_cliente or not ids_mesas:
+            raise ValidacionError("Error", "Faltan datos (Cliente o Mesas)")
+
+        fecha_hora = ReservaServicio._fecha(datos.get('fecha_hora'), 'fecha_hora')
+        if not id_reserva and fecha_hora < (ahora or datetime.now()):
+            raise ValidacionError("Error", "Fecha pasada")
+
+        pax = ReservaServicio._entero(datos.get('n_personas'), 'n_personas')
+        if pax < 1:
+            raise ValidacionError("Error", "Número de personas inválido")
+        MESAS.actualizar()
+        desconocidas = [m for m in ids_mesas if m not in MESAS.por_id]
+        if desconocidas:
+            raise ValidacionError("Error", f"Mesas inexistentes: {desconocidas}")
+        if sum(MESAS.por_id[m][2] for m in ids_mesas) < pax:
+            raise ValidacionError("Capacidad", "Mesas insuficientes")
+
+        id_empleado = ReservaServicio._resolver(EMPLEADOS, datos.get('id_empleado'), datos.get('empleado'), "empleado")
+        try:
+            id_reserva = ReservaController.guardar_reserva(fecha_hora, pax, id_cliente, id_empleado, ids_mesas, id_reserva)
+        except ConflictoReservaError:
+            INDICE.invalidar_rango(fecha_hora)  # Otra terminal ganó la mesa: el índice local está desactualizado
+            raise
+        return {'id_reserva': id_reserva, 'editada': bool(datos.get('id_reserva'))}
+
+    @staticmethod
+    def obtener_reserva(id_reserva):
+        """Datos para editar: {'id_reserva', 'id_cliente', 'cliente', 'n_personas', 'fecha_hora', 'id_empleado', 'empleado', 'id_estado', 'mesas'}."""
+        # Solo lectura: sin transacción (en SQLite tomaría el bloqueo de escritura)
+        fila = DatabaseManager.run_query(
+            """SELECT R.idCliente, R.Npersonas, R.fechareserva, R.idEmpleado, R.idEstadoreserva, C.nombrecompleto
+               FROM SGR_T_Reserva R LEFT JOIN SGR_M_Cliente C ON C.idCliente = R.idCliente
+               WHERE R.idReserva=?""",
+            (id_reserva,), fetchone=True)
+        mesas = DatabaseManager.run_query("SELECT idMesa FROM SGR_T_DetalleReserva WHERE idReserva=? ORDER BY idMesa",
+                                          (id_reserva,), fetchall=True) or []
+        if not fila:
+            raise NoEncontradoError(f"No existe la reserva #{id_reserva}")
+        EMPLEADOS.actualizar()
+        return {
+            'id_reserva': id_reserva, 'id_cliente': fila[0], 'cliente': fila[5],
+            'n_personas': fila[1], 'fecha_hora': fila[2], 'id_empleado': fila[3], 'empleado': EMPLEADOS.nombre(fila[3]),
+            'id_estado': fila[4], 'mesas': [m[0] for m in mesas]
+        }
+
+    @staticmethod
+    def cambiar_estado(id_reserva, nuevo_estado):
+        nuevo_estado = ReservaServicio._entero(nuevo_estado, 'estado')
+        if nuevo_estado not in ESTADOS_RESERVA:
+            raise ValidacionError("Estado", f"Estado inválido: {nuevo_estado}")
+        ReservaController.cambiar_estado(id_reserva, nuevo_estado)  # NoEncontradoError si ya no existe
+        return {'id_reserva': id_reserva, 'id_estado': nuevo_estado}
+
+    @staticmethod
+    def eliminar_reserva(id_reserva):
+        ReservaController.eliminar_reserva(id_reserva)  # NoEncontradoError si ya no existe
+        return {'id_reserva': id_reserva, 'eliminada': True}
+
+    @staticmethod
+    def mesas_disponibles(fecha_hora, id_reserva_ignorar=None):
+        """[{'id', 'texto', 'capacidad', 'nivel'}] (sin colores: eso es cosa de cada interfaz)."""
+        mesas = ReservaController.obtener_mesas_disponibles(ReservaServicio._fecha(fecha_hora, 'fecha'), id_reserva_ignorar)
+        return [{k: v for k, v in m.items() if k != 'estilo'} for m in mesas]
+
+    @staticmethod
+    def sugerir_mesas(fecha_hora, n_personas, id_reserva_ignorar=None):
+        return {'mesas': ReservaController.sugerir_mesas(ReservaServicio._fecha(fecha_hora, 'fecha'),
+                                                         ReservaServicio._entero(n_personas, 'pax'), id_reserva_ignorar) or []}
+
+    @staticmethod
+    def listar_reservas(desde=None, hasta=None, despues_de=None, limite=None):
+        """
+        despues_de: (fecha_hora, id_reserva) de la última reserva recibida; la fecha puede venir en ISO.
+        limite: tamaño de página (por defecto MONITOR_TAMANO_PAGINA, a lo sumo MAX_LIMITE).
+        """
+        limite = min(ReservaServicio._entero(limite or MONITOR_TAMANO_PAGINA, 'limite'), MAX_LIMITE)
+        if despues_de:
+            despues_de = (ReservaServicio._fecha(despues_de[0], 'despues_fecha'), ReservaServicio._entero(despues_de[1], 'despues_id'))
+        filas = ReservaController.listar_reservas_monitor(
+            ReservaServicio._fecha(desde, 'desde') if desde else None, ReservaServicio._fecha(hasta, 'hasta') if hasta else None,
+            despues_de, limite)
+        return [{'id_reserva': f[0], 'cliente': f[1], 'fecha_hora': f[2], 'n_personas': f[3],
+                 'estado': f[4], 'id_estado': f[5], 'mesas': f[6]} for f in filas]
+
+    @staticmethod
+    def grilla(desde, dias=1):
+        grilla = ReservaController.grilla_disponibilidad(
+            ReservaServicio._fecha(desde, 'desde'), max(1, min(ReservaServicio._entero(dias, 'dias'), MAX_DIAS_GRILLA)))
+        if grilla is None: return None
+        return {'slots': grilla['slots'],
+                'mesas': [dict(m, niveles=list(m['niveles'])) for m in grilla['mesas']]}
+
+    @staticmethod
+    def buscar_clientes(texto, limite=None, despues_de=None):
+        """
+        Clientes por prefijo de nombre completo, apellido, cédula o teléfono, de a una página.
+        despues_de: (nombre, id) del último cliente recibido. Retorna {'clientes': [...], 'hay_mas'}.
+        """
+        if len(normalizar(texto)) < BUSQUEDA_CLIENTES_CONFIG['min_caracteres']:
+            raise ValidacionError("Búsqueda", f"Escriba al menos {BUSQUEDA_CLIENTES_CONFIG['min_caracteres']} caracteres")
+        limite = ReservaServicio._entero(limite, 'limite') if limite else None
+        if despues_de or (limite and limite != BUSCADOR.limite):
+            filas, hay_mas = buscar_clientes_bd(texto, min(limite or BUSCADOR.limite, MAX_LIMITE), despues_de) or ([], False)
+        else:
+            filas, hay_mas = BUSCADOR.buscar(texto)
+        return {'clientes': [{'id': f[0], 'nombre': f[1], 'cedula': f[3], 'telefono': f[4]} for f in filas],
+                'hay_mas': hay_mas}
+
+    @staticmethod
+    def catalogos():
+        """Empleados, mesas y estados. Los clientes no: pueden ser decenas de miles (ver buscar_clientes)."""
+        EMPLEADOS.actualizar(); MESAS.actualizar()
+        return {
+            'restaurante': ID_RESTAURANTE_ACTUAL,
+            'empleados': [{'id': f[0], 'nombre': f[1]} for f in EMPLEADOS.filas()],
+            'mesas': [{'id': f[0], 'nombre': f[1], 'capacidad': f[2]} for f in MESAS.filas()],
+            'estados': [{'id': k, 'nombre': v} for k, v in ESTADOS_RESERVA.items()]
+        }
+
+    # --- Internos ---
+    @staticmethod
+    def _resolver(catalogo, id_registro, nombre, que):
+        # Acepta el id directo o el nombre tal como aparece en los combos
+        if id_registro not in (None, ""):
+            id_registro = ReservaServicio._entero(id_registro, f"id_{que}")
+            # Consulta puntual por PK: el catálogo de clientes no se carga entero para esto
+            existe = DatabaseManager.run_query(
+                f"SELECT 1 FROM {catalogo.tabla} WHERE {catalogo.columna_id} = ? AND {catalogo.filtro}",
+                (id_registro,) + catalogo.params, fetchone=True)
+            if not existe:
+                raise ValidacionError("Error", f"No existe el {que} #{id_registro}")
+            return id_registro
+        if nombre:
+            if not isinstance(nombre, str):
+                raise ValidacionError("Error", f"'{que}' debe ser un texto")
+            catalogo.actualizar()
+            return catalogo.id_de(nombre)
+        return None
+
+    @staticmethod
+    def _entero(valor, campo):
+        # Errores de tipo con el nombre del campo, en vez del texto de int()
+        if valor in (None, ""):
+            raise ValidacionError("Error", f"Falta '{campo}'")
+        if isinstance(valor, float) and valor.is_integer(): valor = int(valor)  # JSON: 4.0
+        if isinstance(valor, bool) or not isinstance(valor, (int, str)):
+            raise ValidacionError("Error", f"'{campo}' debe ser un número entero")
+        try:
+            return int(valor)
+        except ValueError:
+            raise ValidacionError("Error", f"'{campo}' debe ser un número entero")
+
+    @staticmethod
+    def _fecha(valor, campo="fecha"):
+        if isinstance(valor, datetime): return valor
+        if isinstance(valor, date): return datetime(valor.year, valor.month, valor.day)
+        if valor in (None, ""):
+            raise ValidacionError("Error", f"Falta '{campo}'")
+        try:
+            return datetime.fromisoformat(str(valor))
+        except ValueError:
+            raise ValidacionError("Error", f"'{campo}': fecha inválida (ISO 8601, p. ej. 2026-05-01T20:00)")
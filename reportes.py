@@ -0,0 +1,50 @@
+"""
+Resúmenes diarios para reportes (migraciones 004 y 005): refresco programado y consulta desde la línea de comandos.
+El visor de la aplicación y GET /reportes solo leen los resúmenes (e informan su antigüedad); los refrescan
+app.py y servidor.py en segundo plano cada REPORTES_CONFIG['refrescar_cada_s']. Sin ninguno de los dos corriendo,
+o con ese valor en 0, programar "refrescar" (p. ej. cada pocos minutos).
+
+Uso:
+    python reportes.py refrescar                                   # Solo los días que cambiaron
+    python reportes.py reconstruir [--desde 2026-01-01] [--hasta 2026-12-31]   # Tras cambiar SGR_P_Politica.Valor
+    python reportes.py resumen --desde 2026-01-01 --hasta 2026-12-31 [--agrupar mes]
+"""
+import argparse
+import logging
+import time
+from datetime import datetime
+from data.database import DatabaseManager
+from data.migraciones import aplicar_migraciones_pendientes
+from logic.reportes import Reportes, AGRUPACIONES
+from config.settings import MIGRACIONES_AL_INICIAR
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("accion", choices=("refrescar", "reconstruir", "resumen"))
+    parser.add_argument("--desde", type=datetime.fromisoformat)
+    parser.add_argument("--hasta", type=datetime.fromisoformat)
+    parser.add_argument("--agrupar", choices=tuple(AGRUPACIONES), default="mes")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.accion == "resumen" and not (args.desde and args.hasta):
+        parser.error("resumen necesita --desde y --hasta")
+
+    if MIGRACIONES_AL_INICIAR:
+        aplicar_migraciones_pendientes()
+    inicio = time.perf_counter()
+    try:
+        if args.accion == "refrescar":
+            print(f"{Reportes.refrescar()} días recalculados en {time.perf_counter() - inicio:.2f} s")
+        elif args.accion == "reconstruir":
+            print(f"{Reportes.reconstruir(args.desde, args.hasta)} días recalculados en {time.perf_counter() - inicio:.2f} s")
+        else:
+            r = Reportes.resumen(args.desde, args.hasta, args.agrupar)
+            print(f"{'Período':<12} {'Reservas':>9} {'Cancel.':>8} {'% Canc.':>8} {'Personas':>9} {'Ingresos':>12} {'% Ocup.':>8}")
+            for p in r['periodos'] + [dict(r['totales'], periodo="TOTAL")]:
+                print(f"{str(p['periodo']):<12} {p['reservas']:>9} {p['canceladas']:>8} {p['tasa_cancelacion']:>8.1%} "
+                      f"{p['personas']:>9} {p['ingresos']:>12,.2f} {p['ocupacion']:>8.1%}")
+            actualizado = f"{r['actualizado']:%Y-%m-%d %H:%M}" if r['actualizado'] else "nunca"
+            print(f"({r['ms']:.0f} ms; último refresco: {actualizado}, {r['dias_pendientes']} días con cambios sin resumir)")
+    finally:
+        DatabaseManager.get_pool().cerrar_todo()
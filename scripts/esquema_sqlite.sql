@@ -0,0 +1,130 @@
+-- Esquema SGR_* para el motor local SQLite (equivalente a setup_base_datos.sql de SQL Server).
+-- Los índices de rendimiento van en scripts/migraciones/sqlite/, igual que en SQL Server.
+
+CREATE TABLE SGR_P_Provincia (
+    idProvincia INTEGER PRIMARY KEY AUTOINCREMENT,
+    Descripcion VARCHAR(100) NOT NULL
+);
+
+CREATE TABLE SGR_P_Ciudad (
+    idCiudad INTEGER PRIMARY KEY AUTOINCREMENT,
+    idProvincia INT REFERENCES SGR_P_Provincia (idProvincia),
+    Descripcion VARCHAR(100) NOT NULL
+);
+
+CREATE TABLE SGR_P_Cargo (
+    IdCargo INTEGER PRIMARY KEY AUTOINCREMENT,
+    Descripcion VARCHAR(50)
+);
+
+CREATE TABLE SGR_P_Estadocliente (
+    idEstacliente INTEGER PRIMARY KEY AUTOINCREMENT,
+    Descripcion VARCHAR(50)
+);
+
+CREATE TABLE SGR_P_Estadomesa (
+    idEstadomesa INTEGER PRIMARY KEY AUTOINCREMENT,
+    Descripcion VARCHAR(50)
+);
+
+CREATE TABLE SGR_P_Estadopago (
+    idEstadopago INTEGER PRIMARY KEY AUTOINCREMENT,
+    Descripcion VARCHAR(50)
+);
+
+CREATE TABLE SGR_P_Estadoreserva (
+    idEstadoreserva INTEGER PRIMARY KEY AUTOINCREMENT,
+    Descripcion VARCHAR(50)
+);
+
+CREATE TABLE SGR_P_Metodo (
+    idMetodo INTEGER PRIMARY KEY AUTOINCREMENT,
+    Descripcion VARCHAR(50)
+);
+
+CREATE TABLE SGR_P_Politica (
+    idPolitica INTEGER PRIMARY KEY AUTOINCREMENT,
+    Descripcion VARCHAR(200),
+    Valor DECIMAL(10, 2)
+);
+
+CREATE TABLE SGR_M_Restaurante (
+    idRestaurante INTEGER PRIMARY KEY AUTOINCREMENT,
+    idCiudad INT REFERENCES SGR_P_Ciudad (idCiudad),
+    nombre VARCHAR(100),
+    RUC VARCHAR(20),
+    direccion VARCHAR(200),
+    telefono VARCHAR(20)
+);
+
+CREATE TABLE SGR_M_Cliente (
+    idCliente INTEGER PRIMARY KEY AUTOINCREMENT,
+    idCiudad INT REFERENCES SGR_P_Ciudad (idCiudad),
+    idRestaurante INT REFERENCES SGR_M_Restaurante (idRestaurante),
+    nombre VARCHAR(100),
+    apellido VARCHAR(100),
+    cedula VARCHAR(20),
+    telefono VARCHAR(20),
+    fecharegistro DATETIME DEFAULT CURRENT_TIMESTAMP,
+    idEstadocliente INT REFERENCES SGR_P_Estadocliente (idEstacliente)
+);
+
+CREATE TABLE SGR_M_Empleado (
+    idEmpleado INTEGER PRIMARY KEY AUTOINCREMENT,
+    idCargo INT REFERENCES SGR_P_Cargo (IdCargo),
+    idRestaurante INT REFERENCES SGR_M_Restaurante (idRestaurante),
+    nombre VARCHAR(100),
+    cedula VARCHAR(20),
+    telefono VARCHAR(20),
+    correo VARCHAR(100),
+    fechacontrato DATE
+);
+
+CREATE TABLE SGR_M_Mesa (
+    idMesa INTEGER PRIMARY KEY AUTOINCREMENT,
+    idRestaurante INT REFERENCES SGR_M_Restaurante (idRestaurante),
+    Nmesa VARCHAR(10),
+    costo DECIMAL(10, 2),
+    capacidad INT,
+    idEstadomesa INT REFERENCES SGR_P_Estadomesa (idEstadomesa)
+);
+
+CREATE TABLE SGR_T_Reserva (
+    idReserva INTEGER PRIMARY KEY AUTOINCREMENT,
+    idCliente INT REFERENCES SGR_M_Cliente (idCliente),
+    idEmpleado INT REFERENCES SGR_M_Empleado (idEmpleado),
+    idPolitica INT REFERENCES SGR_P_Politica (idPolitica),
+    fechareserva DATETIME,
+    Npersonas INT,
+    idEstadoreserva INT REFERENCES SGR_P_Estadoreserva (idEstadoreserva),
+    fechacreacion DATETIME DEFAULT CURRENT_TIMESTAMP,
+    idRestaurante INT REFERENCES SGR_M_Restaurante (idRestaurante)
+);
+
+CREATE TABLE SGR_T_DetalleReserva (
+    idDetalleReserva INTEGER PRIMARY KEY AUTOINCREMENT,
+    idReserva INT REFERENCES SGR_T_Reserva (idReserva),
+    idMesa INT REFERENCES SGR_M_Mesa (idMesa),
+    Total DECIMAL(10, 2)
+);
+
+CREATE TABLE SGR_T_Pago (
+    idPago INTEGER PRIMARY KEY AUTOINCREMENT,
+    idReserva INT REFERENCES SGR_T_Reserva (idReserva),
+    idMetodo INT REFERENCES SGR_P_Metodo (idMetodo),
+    idEstadopago INT REFERENCES SGR_P_Estadopago (idEstadopago),
+    fechapago DATETIME
+);
+
+-- Datos base (los mismos que el script de SQL Server)
+INSERT INTO SGR_P_Provincia (idProvincia, Descripcion) VALUES (1, 'Guayas'), (2, 'Pichincha');
+INSERT INTO SGR_P_Ciudad (idCiudad, idProvincia, Descripcion) VALUES (1, 1, 'Guayaquil'), (2, 2, 'Quito');
+INSERT INTO SGR_P_Cargo (IdCargo, Descripcion) VALUES (1, 'Mesero'), (2, 'Cajero');
+INSERT INTO SGR_P_Estadocliente (idEstacliente, Descripcion) VALUES (1, 'Activo'), (2, 'Inactivo');
+INSERT INTO SGR_P_Estadomesa (idEstadomesa, Descripcion) VALUES (1, 'Disponible'), (2, 'Ocupada');
+INSERT INTO SGR_P_Estadoreserva (idEstadoreserva, Descripcion) VALUES (1, 'Pendiente'), (2, 'Confirmada'), (3, 'Cancelada'), (4, 'Completada');
+INSERT INTO SGR_P_Politica (idPolitica, Descripcion, Valor) VALUES (1, 'Cancelacion', 25.00), (2, 'Evento', 50.00), (3, 'Estandar', 0.00);
+INSERT INTO SGR_M_Restaurante (idRestaurante, idCiudad, nombre, RUC, direccion, telefono) VALUES (1, 1, 'Restaurante Ejemplo', '099000111', 'Av. Principal', '042222222');
+INSERT INTO SGR_M_Cliente (idCliente, idCiudad, idRestaurante, nombre, apellido, cedula, telefono, fecharegistro, idEstadocliente) VALUES (1, 1, 1, 'Cliente', 'Prueba', '0922222222', '0977777777', '2025-11-26 16:51:24', 1);
+INSERT INTO SGR_M_Empleado (idEmpleado, idCargo, idRestaurante, nombre, cedula, telefono, correo, fechacontrato) VALUES (1, 1, 1, 'Juan Mesero', '0911111111', '0988888888', 'juan@mail.com', '2025-11-26');
+INSERT INTO SGR_M_Mesa (idMesa, idRestaurante, Nmesa, costo, capacidad, idEstadomesa) VALUES (1, 1, 'M-01', 0.00, 2, 1), (2, 1, 'M-02', 0.00, 4, 1), (3, 1, 'VIP-01', 20.00, 8, 1);
@@ -0,0 +1,28 @@
+-- 001: Índices para las consultas calientes (equivalentes a los de SQL Server).
+
+-- Disponibilidad / conflictos: índice parcial solo con las reservas que bloquean mesa
+CREATE INDEX IF NOT EXISTS IX_SGR_T_Reserva_Activas_Fecha
+    ON SGR_T_Reserva (fechareserva, idEstadoreserva, idRestaurante)
+    WHERE idEstadoreserva IN (1, 2, 4);
+GO
+
+-- Monitor: ventana de fechas + keyset (fechareserva DESC, idReserva DESC)
+CREATE INDEX IF NOT EXISTS IX_SGR_T_Reserva_Fecha
+    ON SGR_T_Reserva (fechareserva DESC, idReserva DESC, idCliente, Npersonas, idEstadoreserva);
+GO
+
+CREATE INDEX IF NOT EXISTS IX_SGR_T_DetalleReserva_Reserva
+    ON SGR_T_DetalleReserva (idReserva, idMesa);
+GO
+
+CREATE INDEX IF NOT EXISTS IX_SGR_T_DetalleReserva_Mesa
+    ON SGR_T_DetalleReserva (idMesa, idReserva);
+GO
+
+CREATE INDEX IF NOT EXISTS IX_SGR_M_Mesa_Restaurante
+    ON SGR_M_Mesa (idRestaurante, Nmesa, capacidad, idEstadomesa);
+GO
+
+CREATE INDEX IF NOT EXISTS IX_SGR_T_Pago_Reserva
+    ON SGR_T_Pago (idReserva);
+GO
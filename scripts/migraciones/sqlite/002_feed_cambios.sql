@@ -0,0 +1,47 @@
+-- 002: Feed de cambios de reservas (mismo diseño que en SQL Server: tabla + triggers + marca de agua).
+
+CREATE TABLE IF NOT EXISTS SGR_S_Cambio (
+    idCambio INTEGER PRIMARY KEY AUTOINCREMENT,
+    idReserva INT NOT NULL,
+    fechareserva DATETIME NULL,
+    tipo CHAR(1) NOT NULL,
+    fechacambio DATETIME NOT NULL DEFAULT (datetime('now', 'localtime'))
+);
+GO
+
+CREATE INDEX IF NOT EXISTS IX_SGR_S_Cambio_Fecha ON SGR_S_Cambio (fechacambio);
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_Reserva_Alta AFTER INSERT ON SGR_T_Reserva
+BEGIN
+    INSERT INTO SGR_S_Cambio (idReserva, fechareserva, tipo) VALUES (NEW.idReserva, NEW.fechareserva, 'I');
+END;
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_Reserva_Edicion AFTER UPDATE ON SGR_T_Reserva
+BEGIN
+    INSERT INTO SGR_S_Cambio (idReserva, fechareserva, tipo) VALUES (NEW.idReserva, NEW.fechareserva, 'U');
+    INSERT INTO SGR_S_Cambio (idReserva, fechareserva, tipo)
+    SELECT OLD.idReserva, OLD.fechareserva, 'U' WHERE OLD.fechareserva IS NOT NEW.fechareserva;
+END;
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_Reserva_Borrado AFTER DELETE ON SGR_T_Reserva
+BEGIN
+    INSERT INTO SGR_S_Cambio (idReserva, fechareserva, tipo) VALUES (OLD.idReserva, OLD.fechareserva, 'D');
+END;
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_DetalleReserva_Alta AFTER INSERT ON SGR_T_DetalleReserva
+BEGIN
+    INSERT INTO SGR_S_Cambio (idReserva, fechareserva, tipo)
+    VALUES (NEW.idReserva, (SELECT fechareserva FROM SGR_T_Reserva WHERE idReserva = NEW.idReserva), 'M');
+END;
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_DetalleReserva_Borrado AFTER DELETE ON SGR_T_DetalleReserva
+BEGIN
+    INSERT INTO SGR_S_Cambio (idReserva, fechareserva, tipo)
+    VALUES (OLD.idReserva, (SELECT fechareserva FROM SGR_T_Reserva WHERE idReserva = OLD.idReserva), 'M');
+END;
+GO
@@ -0,0 +1,36 @@
+-- 003: Búsqueda incremental de clientes (mismo diseño que en SQL Server).
+-- ALTER TABLE no puede agregar columnas generadas STORED (y las VIRTUAL piden SQLite 3.31+):
+-- nombrecompleto es una columna normal que mantienen dos triggers.
+-- COLLATE NOCASE en columna e índices: LIKE no distingue mayúsculas y así puede usar el índice (rango).
+
+ALTER TABLE SGR_M_Cliente ADD COLUMN nombrecompleto VARCHAR(201) COLLATE NOCASE;
+GO
+
+UPDATE SGR_M_Cliente SET nombrecompleto = IFNULL(nombre, '') || ' ' || IFNULL(apellido, '');
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_M_Cliente_NombreAlta AFTER INSERT ON SGR_M_Cliente
+BEGIN
+    UPDATE SGR_M_Cliente SET nombrecompleto = IFNULL(NEW.nombre, '') || ' ' || IFNULL(NEW.apellido, '')
+    WHERE idCliente = NEW.idCliente;
+END;
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_M_Cliente_NombreEdicion AFTER UPDATE OF nombre, apellido ON SGR_M_Cliente
+BEGIN
+    UPDATE SGR_M_Cliente SET nombrecompleto = IFNULL(NEW.nombre, '') || ' ' || IFNULL(NEW.apellido, '')
+    WHERE idCliente = NEW.idCliente;
+END;
+GO
+
+CREATE INDEX IF NOT EXISTS IX_SGR_M_Cliente_NombreCompleto ON SGR_M_Cliente (nombrecompleto, idCliente);
+GO
+
+CREATE INDEX IF NOT EXISTS IX_SGR_M_Cliente_Apellido ON SGR_M_Cliente (apellido COLLATE NOCASE);
+GO
+
+CREATE INDEX IF NOT EXISTS IX_SGR_M_Cliente_Cedula ON SGR_M_Cliente (cedula COLLATE NOCASE);
+GO
+
+CREATE INDEX IF NOT EXISTS IX_SGR_M_Cliente_Telefono ON SGR_M_Cliente (telefono COLLATE NOCASE);
+GO
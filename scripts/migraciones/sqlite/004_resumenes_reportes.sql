@@ -0,0 +1,74 @@
+-- 004: Resúmenes diarios para reportes (mismo diseño que en SQL Server).
+
+CREATE TABLE IF NOT EXISTS SGR_R_ResumenDia (
+    idRestaurante INT NOT NULL,
+    fecha DATE NOT NULL,
+    reservas INT NOT NULL,
+    pendientes INT NOT NULL,
+    confirmadas INT NOT NULL,
+    canceladas INT NOT NULL,
+    completadas INT NOT NULL,
+    personas INT NOT NULL,
+    ingresos DECIMAL(12, 2) NOT NULL,
+    PRIMARY KEY (idRestaurante, fecha)
+);
+GO
+
+CREATE TABLE IF NOT EXISTS SGR_R_OcupacionMesaDia (
+    idRestaurante INT NOT NULL,
+    fecha DATE NOT NULL,
+    idMesa INT NOT NULL,
+    reservas INT NOT NULL,
+    canceladas INT NOT NULL,
+    PRIMARY KEY (idRestaurante, fecha, idMesa)
+);
+GO
+
+CREATE TABLE IF NOT EXISTS SGR_R_DiaPendiente (
+    fecha DATE NOT NULL PRIMARY KEY
+);
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_Reserva_ResumenAlta AFTER INSERT ON SGR_T_Reserva
+BEGIN
+    INSERT OR IGNORE INTO SGR_R_DiaPendiente (fecha) SELECT date(NEW.fechareserva) WHERE NEW.fechareserva IS NOT NULL;
+END;
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_Reserva_ResumenEdicion AFTER UPDATE ON SGR_T_Reserva
+BEGIN
+    INSERT OR IGNORE INTO SGR_R_DiaPendiente (fecha) SELECT date(NEW.fechareserva) WHERE NEW.fechareserva IS NOT NULL;
+    INSERT OR IGNORE INTO SGR_R_DiaPendiente (fecha) SELECT date(OLD.fechareserva) WHERE OLD.fechareserva IS NOT NULL;
+END;
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_Reserva_ResumenBorrado AFTER DELETE ON SGR_T_Reserva
+BEGIN
+    INSERT OR IGNORE INTO SGR_R_DiaPendiente (fecha) SELECT date(OLD.fechareserva) WHERE OLD.fechareserva IS NOT NULL;
+END;
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_DetalleReserva_ResumenAlta AFTER INSERT ON SGR_T_DetalleReserva
+BEGIN
+    INSERT OR IGNORE INTO SGR_R_DiaPendiente (fecha)
+    SELECT date(fechareserva) FROM SGR_T_Reserva WHERE idReserva = NEW.idReserva AND fechareserva IS NOT NULL;
+END;
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_DetalleReserva_ResumenEdicion AFTER UPDATE ON SGR_T_DetalleReserva
+BEGIN
+    INSERT OR IGNORE INTO SGR_R_DiaPendiente (fecha)
+    SELECT date(fechareserva) FROM SGR_T_Reserva WHERE idReserva IN (NEW.idReserva, OLD.idReserva) AND fechareserva IS NOT NULL;
+END;
+GO
+
+CREATE TRIGGER IF NOT EXISTS TR_SGR_T_DetalleReserva_ResumenBorrado AFTER DELETE ON SGR_T_DetalleReserva
+BEGIN
+    INSERT OR IGNORE INTO SGR_R_DiaPendiente (fecha)
+    SELECT date(fechareserva) FROM SGR_T_Reserva WHERE idReserva = OLD.idReserva AND fechareserva IS NOT NULL;
+END;
+GO
+
+INSERT OR IGNORE INTO SGR_R_DiaPendiente (fecha)
+SELECT DISTINCT date(fechareserva) FROM SGR_T_Reserva WHERE fechareserva IS NOT NULL;
+GO
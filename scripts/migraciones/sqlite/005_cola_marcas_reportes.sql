@@ -0,0 +1,73 @@
+-- 005: Cola de días a recalcular de solo inserción (mismo diseño que en SQL Server).
+
+-- AUTOINCREMENT: un id borrado nunca se reutiliza (el refresco borra "hasta la última marca que leyó")
+CREATE TABLE IF NOT EXISTS SGR_R_MarcaDia (
+    idMarca INTEGER PRIMARY KEY AUTOINCREMENT,
+    fecha DATE NOT NULL
+);
+GO
+
+DROP TRIGGER IF EXISTS TR_SGR_T_Reserva_ResumenAlta;
+GO
+
+DROP TRIGGER IF EXISTS TR_SGR_T_Reserva_ResumenEdicion;
+GO
+
+DROP TRIGGER IF EXISTS TR_SGR_T_Reserva_ResumenBorrado;
+GO
+
+DROP TRIGGER IF EXISTS TR_SGR_T_DetalleReserva_ResumenAlta;
+GO
+
+DROP TRIGGER IF EXISTS TR_SGR_T_DetalleReserva_ResumenEdicion;
+GO
+
+DROP TRIGGER IF EXISTS TR_SGR_T_DetalleReserva_ResumenBorrado;
+GO
+
+CREATE TRIGGER TR_SGR_T_Reserva_ResumenAlta AFTER INSERT ON SGR_T_Reserva
+BEGIN
+    INSERT INTO SGR_R_MarcaDia (fecha) SELECT date(NEW.fechareserva) WHERE NEW.fechareserva IS NOT NULL;
+END;
+GO
+
+CREATE TRIGGER TR_SGR_T_Reserva_ResumenEdicion AFTER UPDATE ON SGR_T_Reserva
+BEGIN
+    INSERT INTO SGR_R_MarcaDia (fecha) SELECT date(NEW.fechareserva) WHERE NEW.fechareserva IS NOT NULL;
+    INSERT INTO SGR_R_MarcaDia (fecha) SELECT date(OLD.fechareserva) WHERE OLD.fechareserva IS NOT NULL
+        AND date(OLD.fechareserva) IS NOT date(NEW.fechareserva);
+END;
+GO
+
+CREATE TRIGGER TR_SGR_T_Reserva_ResumenBorrado AFTER DELETE ON SGR_T_Reserva
+BEGIN
+    INSERT INTO SGR_R_MarcaDia (fecha) SELECT date(OLD.fechareserva) WHERE OLD.fechareserva IS NOT NULL;
+END;
+GO
+
+CREATE TRIGGER TR_SGR_T_DetalleReserva_ResumenAlta AFTER INSERT ON SGR_T_DetalleReserva
+BEGIN
+    INSERT INTO SGR_R_MarcaDia (fecha)
+    SELECT date(fechareserva) FROM SGR_T_Reserva WHERE idReserva = NEW.idReserva AND fechareserva IS NOT NULL;
+END;
+GO
+
+CREATE TRIGGER TR_SGR_T_DetalleReserva_ResumenEdicion AFTER UPDATE ON SGR_T_DetalleReserva
+BEGIN
+    INSERT INTO SGR_R_MarcaDia (fecha)
+    SELECT DISTINCT date(fechareserva) FROM SGR_T_Reserva WHERE idReserva IN (NEW.idReserva, OLD.idReserva) AND fechareserva IS NOT NULL;
+END;
+GO
+
+CREATE TRIGGER TR_SGR_T_DetalleReserva_ResumenBorrado AFTER DELETE ON SGR_T_DetalleReserva
+BEGIN
+    INSERT INTO SGR_R_MarcaDia (fecha)
+    SELECT date(fechareserva) FROM SGR_T_Reserva WHERE idReserva = OLD.idReserva AND fechareserva IS NOT NULL;
+END;
+GO
+
+INSERT INTO SGR_R_MarcaDia (fecha) SELECT fecha FROM SGR_R_DiaPendiente ORDER BY fecha;
+GO
+
+DROP TABLE IF EXISTS SGR_R_DiaPendiente;
+GO
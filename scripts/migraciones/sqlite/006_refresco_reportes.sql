@@ -0,0 +1,7 @@
+-- 006: Momento del último refresco de los resúmenes diarios (mismo diseño que en SQL Server).
+
+CREATE TABLE IF NOT EXISTS SGR_R_Refresco (
+    id INT NOT NULL PRIMARY KEY CHECK (id = 1),
+    fechahora DATETIME NOT NULL
+);
+GO
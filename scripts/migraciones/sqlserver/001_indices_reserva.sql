@@ -0,0 +1,44 @@
+-- 001: Índices para las consultas calientes de disponibilidad, conflicto y monitor.
+-- Las tablas SGR_T_* solo tenían la PK clustered; todo filtro por fecha era un scan.
+
+-- Disponibilidad / conflictos: R.fechareserva BETWEEN ? AND ? con estados activos.
+-- Índice filtrado: solo las reservas que bloquean mesa (las canceladas no pesan).
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_T_Reserva_Activas_Fecha' AND object_id = OBJECT_ID('dbo.SGR_T_Reserva'))
+CREATE NONCLUSTERED INDEX IX_SGR_T_Reserva_Activas_Fecha
+    ON dbo.SGR_T_Reserva (fechareserva)
+    INCLUDE (idEstadoreserva, idRestaurante)
+    WHERE idEstadoreserva IN (1, 2, 4);
+GO
+
+-- Monitor: ventana de fechas + keyset (fechareserva DESC, idReserva DESC), cubriendo las columnas mostradas
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_T_Reserva_Fecha' AND object_id = OBJECT_ID('dbo.SGR_T_Reserva'))
+CREATE NONCLUSTERED INDEX IX_SGR_T_Reserva_Fecha
+    ON dbo.SGR_T_Reserva (fechareserva DESC, idReserva DESC)
+    INCLUDE (idCliente, Npersonas, idEstadoreserva, idRestaurante);
+GO
+
+-- Join DR.idReserva (detalles de una reserva, STRING_AGG del monitor, borrados)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_T_DetalleReserva_Reserva' AND object_id = OBJECT_ID('dbo.SGR_T_DetalleReserva'))
+CREATE NONCLUSTERED INDEX IX_SGR_T_DetalleReserva_Reserva
+    ON dbo.SGR_T_DetalleReserva (idReserva)
+    INCLUDE (idMesa);
+GO
+
+-- Conflictos por mesa: DR.idMesa IN (...) y luego la reserva
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_T_DetalleReserva_Mesa' AND object_id = OBJECT_ID('dbo.SGR_T_DetalleReserva'))
+CREATE NONCLUSTERED INDEX IX_SGR_T_DetalleReserva_Mesa
+    ON dbo.SGR_T_DetalleReserva (idMesa, idReserva);
+GO
+
+-- Catálogo de mesas del restaurante ordenado por nombre
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_M_Mesa_Restaurante' AND object_id = OBJECT_ID('dbo.SGR_M_Mesa'))
+CREATE NONCLUSTERED INDEX IX_SGR_M_Mesa_Restaurante
+    ON dbo.SGR_M_Mesa (idRestaurante, Nmesa)
+    INCLUDE (capacidad, idEstadomesa);
+GO
+
+-- Pagos por reserva (borrado físico)
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_T_Pago_Reserva' AND object_id = OBJECT_ID('dbo.SGR_T_Pago'))
+CREATE NONCLUSTERED INDEX IX_SGR_T_Pago_Reserva
+    ON dbo.SGR_T_Pago (idReserva);
+GO
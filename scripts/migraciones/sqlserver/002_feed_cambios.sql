@@ -0,0 +1,46 @@
+-- 002: Feed de cambios de reservas para que cada terminal refresque solo lo que cambió.
+-- Cada alta/edición/borrado de una reserva o de sus mesas deja una fila en SGR_S_Cambio (vía triggers).
+-- Los clientes recuerdan el último idCambio leído (marca de agua) y piden solo lo posterior.
+-- Se usa una tabla propia en vez de Change Tracking para que funcione igual en SQLite y sin permisos extra.
+
+IF OBJECT_ID('dbo.SGR_S_Cambio') IS NULL
+CREATE TABLE dbo.SGR_S_Cambio (
+    idCambio BIGINT IDENTITY(1,1) NOT NULL PRIMARY KEY,
+    idReserva INT NOT NULL,
+    fechareserva DATETIME NULL,           -- Día afectado (para invalidar solo ese día)
+    tipo CHAR(1) NOT NULL,                -- I alta, U edición/estado, D borrado, M mesas
+    fechacambio DATETIME NOT NULL DEFAULT GETDATE()
+);
+GO
+
+-- Purga periódica de lo ya leído por todos
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_S_Cambio_Fecha' AND object_id = OBJECT_ID('dbo.SGR_S_Cambio'))
+CREATE NONCLUSTERED INDEX IX_SGR_S_Cambio_Fecha ON dbo.SGR_S_Cambio (fechacambio);
+GO
+
+-- SET NOCOUNT ON: el trigger no debe alterar los rowcount ni los resultados que lee pyodbc
+CREATE OR ALTER TRIGGER dbo.TR_SGR_T_Reserva_Cambio ON dbo.SGR_T_Reserva
+AFTER INSERT, UPDATE, DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.SGR_S_Cambio (idReserva, fechareserva, tipo)
+    SELECT i.idReserva, i.fechareserva, CASE WHEN d.idReserva IS NULL THEN 'I' ELSE 'U' END
+    FROM inserted i LEFT JOIN deleted d ON d.idReserva = i.idReserva
+    UNION ALL
+    -- Borradas, y la fecha anterior de las que cambiaron de día/hora (ese día también cambia)
+    SELECT d.idReserva, d.fechareserva, CASE WHEN i.idReserva IS NULL THEN 'D' ELSE 'U' END
+    FROM deleted d LEFT JOIN inserted i ON i.idReserva = d.idReserva
+    WHERE i.idReserva IS NULL OR i.fechareserva <> d.fechareserva;
+END
+GO
+
+CREATE OR ALTER TRIGGER dbo.TR_SGR_T_DetalleReserva_Cambio ON dbo.SGR_T_DetalleReserva
+AFTER INSERT, DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.SGR_S_Cambio (idReserva, fechareserva, tipo)
+    SELECT x.idReserva, R.fechareserva, 'M'
+    FROM (SELECT idReserva FROM inserted UNION SELECT idReserva FROM deleted) x
+    LEFT JOIN dbo.SGR_T_Reserva R ON R.idReserva = x.idReserva;
+END
+GO
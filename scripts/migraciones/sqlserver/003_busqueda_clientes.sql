@@ -0,0 +1,26 @@
+-- 003: Búsqueda incremental de clientes (LIKE 'prefijo%' por nombre completo, apellido, cédula o teléfono).
+-- nombrecompleto es calculada y persistida para poder indexarla; las búsquedas la comparan con un
+-- parámetro VARCHAR (no NVARCHAR) para que el LIKE use el índice en vez de convertir toda la columna.
+
+IF COL_LENGTH('dbo.SGR_M_Cliente', 'nombrecompleto') IS NULL
+ALTER TABLE dbo.SGR_M_Cliente
+    ADD nombrecompleto AS CAST(ISNULL(nombre, '') + ' ' + ISNULL(apellido, '') AS VARCHAR(201)) PERSISTED;
+GO
+
+-- Orden del keyset: (nombrecompleto, idCliente); idCliente ya viaja en el índice por ser la clave clustered
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_M_Cliente_NombreCompleto' AND object_id = OBJECT_ID('dbo.SGR_M_Cliente'))
+CREATE NONCLUSTERED INDEX IX_SGR_M_Cliente_NombreCompleto
+    ON dbo.SGR_M_Cliente (nombrecompleto) INCLUDE (cedula, telefono);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_M_Cliente_Apellido' AND object_id = OBJECT_ID('dbo.SGR_M_Cliente'))
+CREATE NONCLUSTERED INDEX IX_SGR_M_Cliente_Apellido ON dbo.SGR_M_Cliente (apellido);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_M_Cliente_Cedula' AND object_id = OBJECT_ID('dbo.SGR_M_Cliente'))
+CREATE NONCLUSTERED INDEX IX_SGR_M_Cliente_Cedula ON dbo.SGR_M_Cliente (cedula);
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_SGR_M_Cliente_Telefono' AND object_id = OBJECT_ID('dbo.SGR_M_Cliente'))
+CREATE NONCLUSTERED INDEX IX_SGR_M_Cliente_Telefono ON dbo.SGR_M_Cliente (telefono);
+GO
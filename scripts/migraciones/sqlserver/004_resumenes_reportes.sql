@@ -0,0 +1,65 @@
+-- 004: Resúmenes diarios para reportes (ocupación por mesa, cancelaciones, ingresos por políticas).
+-- Los reportes leen SOLO estas tablas; nunca agregan SGR_T_Reserva en vivo.
+-- Los triggers anotan en SGR_R_DiaPendiente los días tocados y logic/reportes.py recalcula solo esos.
+
+IF OBJECT_ID('dbo.SGR_R_ResumenDia') IS NULL
+CREATE TABLE dbo.SGR_R_ResumenDia (
+    idRestaurante INT NOT NULL,
+    fecha DATE NOT NULL,
+    reservas INT NOT NULL,                -- Todas, en cualquier estado
+    pendientes INT NOT NULL,
+    confirmadas INT NOT NULL,
+    canceladas INT NOT NULL,              -- Estado 3 (no-show / cancelación con multa)
+    completadas INT NOT NULL,
+    personas INT NOT NULL,                -- Pax de las no canceladas
+    ingresos DECIMAL(12, 2) NOT NULL,     -- SUM(SGR_P_Politica.Valor)
+    CONSTRAINT PK_SGR_R_ResumenDia PRIMARY KEY (idRestaurante, fecha)
+);
+GO
+
+IF OBJECT_ID('dbo.SGR_R_OcupacionMesaDia') IS NULL
+CREATE TABLE dbo.SGR_R_OcupacionMesaDia (
+    idRestaurante INT NOT NULL,
+    fecha DATE NOT NULL,
+    idMesa INT NOT NULL,
+    reservas INT NOT NULL,                -- Reservas que ocupan la mesa (estados 1, 2, 4)
+    canceladas INT NOT NULL,
+    CONSTRAINT PK_SGR_R_OcupacionMesaDia PRIMARY KEY (idRestaurante, fecha, idMesa)
+);
+GO
+
+-- IGNORE_DUP_KEY: dos terminales que tocan el mismo día no chocan; la segunda marca se descarta sin error
+IF OBJECT_ID('dbo.SGR_R_DiaPendiente') IS NULL
+CREATE TABLE dbo.SGR_R_DiaPendiente (
+    fecha DATE NOT NULL,
+    CONSTRAINT PK_SGR_R_DiaPendiente PRIMARY KEY (fecha) WITH (IGNORE_DUP_KEY = ON)
+);
+GO
+
+CREATE OR ALTER TRIGGER dbo.TR_SGR_T_Reserva_Resumen ON dbo.SGR_T_Reserva
+AFTER INSERT, UPDATE, DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.SGR_R_DiaPendiente (fecha)
+    SELECT DISTINCT CAST(x.fechareserva AS DATE)
+    FROM (SELECT fechareserva FROM inserted UNION ALL SELECT fechareserva FROM deleted) x
+    WHERE x.fechareserva IS NOT NULL;
+END
+GO
+
+CREATE OR ALTER TRIGGER dbo.TR_SGR_T_DetalleReserva_Resumen ON dbo.SGR_T_DetalleReserva
+AFTER INSERT, UPDATE, DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.SGR_R_DiaPendiente (fecha)
+    SELECT DISTINCT CAST(R.fechareserva AS DATE)
+    FROM (SELECT idReserva FROM inserted UNION SELECT idReserva FROM deleted) x
+    JOIN dbo.SGR_T_Reserva R ON R.idReserva = x.idReserva
+    WHERE R.fechareserva IS NOT NULL;
+END
+GO
+
+-- Historia existente: todos los días con reservas quedan pendientes y el primer refresco los calcula
+INSERT INTO dbo.SGR_R_DiaPendiente (fecha)
+SELECT DISTINCT CAST(fechareserva AS DATE) FROM dbo.SGR_T_Reserva WHERE fechareserva IS NOT NULL;
+GO
@@ -0,0 +1,44 @@
+-- 005: La cola de días a recalcular (004) pasa a ser de solo inserción: SGR_R_MarcaDia, con clave IDENTITY.
+-- Con SGR_R_DiaPendiente el refresco borraba la marca de un día y después leía sus reservas, mientras una
+-- terminal escribía la reserva y después la marca del mismo día: bloqueos en orden inverso, interbloqueo.
+-- Ahora las terminales solo agregan filas al final; el refresco lee hasta la última marca, recalcula sin
+-- tocar la cola y al final borra, en una transacción corta, las marcas hasta esa (logic/reportes.py).
+
+IF OBJECT_ID('dbo.SGR_R_MarcaDia') IS NULL
+CREATE TABLE dbo.SGR_R_MarcaDia (
+    idMarca BIGINT IDENTITY(1, 1) NOT NULL,
+    fecha DATE NOT NULL,
+    CONSTRAINT PK_SGR_R_MarcaDia PRIMARY KEY (idMarca)
+);
+GO
+
+CREATE OR ALTER TRIGGER dbo.TR_SGR_T_Reserva_Resumen ON dbo.SGR_T_Reserva
+AFTER INSERT, UPDATE, DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.SGR_R_MarcaDia (fecha)
+    SELECT DISTINCT CAST(x.fechareserva AS DATE)
+    FROM (SELECT fechareserva FROM inserted UNION ALL SELECT fechareserva FROM deleted) x
+    WHERE x.fechareserva IS NOT NULL;
+END
+GO
+
+CREATE OR ALTER TRIGGER dbo.TR_SGR_T_DetalleReserva_Resumen ON dbo.SGR_T_DetalleReserva
+AFTER INSERT, UPDATE, DELETE AS
+BEGIN
+    SET NOCOUNT ON;
+    INSERT INTO dbo.SGR_R_MarcaDia (fecha)
+    SELECT DISTINCT CAST(R.fechareserva AS DATE)
+    FROM (SELECT idReserva FROM inserted UNION SELECT idReserva FROM deleted) x
+    JOIN dbo.SGR_T_Reserva R ON R.idReserva = x.idReserva
+    WHERE R.fechareserva IS NOT NULL;
+END
+GO
+
+-- Lo que quedaba pendiente en la cola vieja pasa a la nueva
+IF OBJECT_ID('dbo.SGR_R_DiaPendiente') IS NOT NULL
+BEGIN
+    INSERT INTO dbo.SGR_R_MarcaDia (fecha) SELECT fecha FROM dbo.SGR_R_DiaPendiente ORDER BY fecha;
+    DROP TABLE dbo.SGR_R_DiaPendiente;
+END
+GO
@@ -0,0 +1,11 @@
+-- 006: Momento del último refresco de los resúmenes diarios.
+-- El visor de reportes ya no recalcula al abrir: lee los resúmenes tal como están y muestra su antigüedad.
+-- El refresco corre en segundo plano (servidor.py, app.py) o programado (python reportes.py refrescar).
+
+IF OBJECT_ID('dbo.SGR_R_Refresco') IS NULL
+CREATE TABLE dbo.SGR_R_Refresco (
+    id INT NOT NULL CONSTRAINT CK_SGR_R_Refresco_Unica CHECK (id = 1),   -- Una sola fila
+    fechahora DATETIME NOT NULL,                                         -- Cambios marcados hasta aquí ya están en los resúmenes
+    CONSTRAINT PK_SGR_R_Refresco PRIMARY KEY (id)
+);
+GO
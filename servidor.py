@@ -0,0 +1,194 @@
+"""
+Servidor HTTP/JSON local: varias terminales (web, kiosco, pruebas de carga) comparten UN proceso,
+con un solo pool de conexiones, un solo índice de disponibilidad y los mismos catálogos en memoria.
+
+Uso:
+    python servidor.py [--host 127.0.0.1] [--puerto 8765]
+
+Rutas (fechas en ISO 8601, p. ej. 2026-05-01T20:00):
+    GET    /salud
+    GET    /catalogos             (empleados, mesas y estados)
+    GET    /clientes?q=TEXTO[&limite=50&despues_nombre=...&despues_id=ID]
+    GET    /mesas?fecha=...[&ignorar=ID]
+    GET    /mesas/sugerencia?fecha=...&pax=N[&ignorar=ID]
+    GET    /grilla?desde=...[&dias=7]                               (a lo sumo 31 días)
+    GET    /reservas[?desde=...&hasta=...&limite=100&despues_fecha=...&despues_id=ID]   (limite <= 500)
+    GET    /reservas/ID
+    POST   /reservas              {"cliente"|"id_cliente", "n_personas", "fecha_hora", "mesas": [ids], "empleado"|"id_empleado"}
+    PUT    /reservas/ID           (mismo cuerpo)
+    POST   /reservas/ID/estado    {"estado": 1..4}
+    DELETE /reservas/ID
+    GET    /reportes?desde=...&hasta=...[&agrupar=dia|semana|mes]   (solo lee los resúmenes diarios; ver 'actualizado')
+    GET    /estadisticas
+"""
+import argparse
+import json
+import logging
+import re
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from data.database import DatabaseManager, PoolAgotadoError, BloqueoNoObtenidoError
+from data.instrumentacion import INSTRUMENTACION
+from data.migraciones import aplicar_migraciones_pendientes
+from logic.reserva_controller import ConflictoReservaError
+from logic.reserva_servicio import ReservaServicio, ValidacionError, NoEncontradoError
+from logic.notificaciones import FEED
+from logic.reportes import Reportes
+from config.settings import SERVIDOR_CONFIG, MIGRACIONES_AL_INICIAR, NOTIFICACIONES_CONFIG
+
+log = logging.getLogger("sgr.servidor")
+
+
+class MetodoNoPermitidoError(Exception):
+    """La ruta existe pero no con ese método HTTP."""
+
+
+def _a_json(valor):
+    if isinstance(valor, (datetime, date)): return valor.isoformat()
+    raise TypeError(f"No serializable: {type(valor).__name__}")
+
+
+def _entero(consulta, nombre):
+    valor = consulta.get(nombre)
+    if valor in (None, ""): return None
+    try:
+        return int(valor)
+    except ValueError:
+        raise ValidacionError("Error", f"'{nombre}' debe ser un número entero")
+
+
+# --- Rutas: (método, patrón, función(consulta, cuerpo, *grupos)) ---
+def _listar_reservas(consulta, cuerpo):
+    despues_de = None
+    if consulta.get('despues_fecha') and consulta.get('despues_id'):
+        despues_de = (consulta['despues_fecha'], consulta['despues_id'])
+    return ReservaServicio.listar_reservas(consulta.get('desde'), consulta.get('hasta'), despues_de,
+                                           _entero(consulta, 'limite'))
+
+
+def _buscar_clientes(consulta, cuerpo):
+    despues_de = None
+    if consulta.get('despues_nombre') and consulta.get('despues_id'):
+        despues_de = (consulta['despues_nombre'], int(consulta['despues_id']))
+    return ReservaServicio.buscar_clientes(consulta.get('q'), _entero(consulta, 'limite'), despues_de)
+
+
+def _guardar(consulta, cuerpo, id_reserva=None):
+    datos = dict(cuerpo, id_reserva=int(id_reserva)) if id_reserva else dict(cuerpo, id_reserva=None)
+    return ReservaServicio.guardar_reserva(datos)
+
+
+RUTAS = [
+    ("GET", r"/salud", lambda c, b: {'ok': True, 'pool': DatabaseManager.estadisticas_pool(),
+                                     'backend': DatabaseManager.backend().nombre}),
+    ("GET", r"/catalogos", lambda c, b: ReservaServicio.catalogos()),
+    ("GET", r"/clientes", _buscar_clientes),
+    ("GET", r"/mesas", lambda c, b: ReservaServicio.mesas_disponibles(c.get('fecha'), _entero(c, 'ignorar'))),
+    ("GET", r"/mesas/sugerencia", lambda c, b: ReservaServicio.sugerir_mesas(c.get('fecha'), c.get('pax'), _entero(c, 'ignorar'))),
+    ("GET", r"/grilla", lambda c, b: ReservaServicio.grilla(c.get('desde'), _entero(c, 'dias') or 1)),
+    ("GET", r"/reservas", _listar_reservas),
+    ("POST", r"/reservas", _guardar),
+    ("GET", r"/reservas/(\d+)", lambda c, b, i: ReservaServicio.obtener_reserva(int(i))),
+    ("PUT", r"/reservas/(\d+)", _guardar),
+    ("POST", r"/reservas/(\d+)/estado", lambda c, b, i: ReservaServicio.cambiar_estado(int(i), b.get('estado'))),
+    ("DELETE", r"/reservas/(\d+)", lambda c, b, i: ReservaServicio.eliminar_reserva(int(i))),
+    ("GET", r"/reportes", lambda c, b: Reportes.resumen(c.get('desde'), c.get('hasta'), c.get('agrupar') or "dia")),
+    ("GET", r"/estadisticas", lambda c, b: INSTRUMENTACION.estadisticas()),
+]
+_RUTAS = [(metodo, re.compile(f"^{patron}/?$"), funcion) for metodo, patron, funcion in RUTAS]
+
+
+class ManejadorAPI(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive: cada terminal reutiliza su conexión TCP
+
+    def do_GET(self): self._atender("GET")
+    def do_POST(self): self._atender("POST")
+    def do_PUT(self): self._atender("PUT")
+    def do_DELETE(self): self._atender("DELETE")
+
+    def _atender(self, metodo):
+        url = urlsplit(self.path)
+        consulta = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        try:
+            funcion, grupos = self._ruta(metodo, url.path)
+            cuerpo = self._leer_cuerpo()
+            INSTRUMENTACION.en_accion(f"HTTP {metodo} {url.path}")
+            self._responder(200, funcion(consulta, cuerpo, *grupos))
+        except ValidacionError as e:
+            self._responder(400, {'error': str(e), 'titulo': e.titulo})
+        except (ValueError, TypeError) as e:
+            self._responder(400, {'error': f"Parámetros inválidos: {e}"})
+        except NoEncontradoError as e:
+            self._responder(404, {'error': str(e)})
+        except MetodoNoPermitidoError as e:
+            self._responder(405, {'error': str(e)})
+        except ConflictoReservaError as e:
+            self._responder(409, {'error': str(e), 'mesas': e.mesas})
+        except (BloqueoNoObtenidoError, PoolAgotadoError) as e:
+            self._responder(503, {'error': str(e)})
+        except Exception as e:
+            log.exception("Error atendiendo %s %s", metodo, self.path)
+            self._responder(500, {'error': f"{type(e).__name__}: {e}"})
+        finally:
+            INSTRUMENTACION.en_accion(None)
+
+    def _ruta(self, metodo, ruta):
+        encontrada = False
+        for metodo_ruta, patron, funcion in _RUTAS:
+            m = patron.match(ruta)
+            if m:
+                encontrada = True
+                if metodo_ruta == metodo: return funcion, m.groups()
+        if encontrada: raise MetodoNoPermitidoError(f"{metodo} no permitido en {ruta}")
+        raise NoEncontradoError(f"Ruta inexistente: {ruta}")
+
+    def _leer_cuerpo(self):
+        largo = int(self.headers.get("Content-Length") or 0)
+        if largo > SERVIDOR_CONFIG['max_cuerpo']:
+            raise ValidacionError("Error", "Cuerpo demasiado grande")
+        if not largo: return {}
+        cuerpo = json.loads(self.rfile.read(largo).decode("utf-8"))
+        if not isinstance(cuerpo, dict):
+            raise ValidacionError("Error", "Se esperaba un objeto JSON")
+        return cuerpo
+
+    def _responder(self, estado, datos):
+        contenido = json.dumps(datos, default=_a_json, ensure_ascii=False).encode("utf-8")
+        self.send_response(estado)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(contenido)))
+        self.end_headers()
+        self.wfile.write(contenido)
+
+    def log_message(self, formato, *args):
+        log.info("%s - %s", self.address_string(), formato % args)
+
+
+def crear_servidor(host=SERVIDOR_CONFIG['host'], puerto=SERVIDOR_CONFIG['puerto']):
+    servidor = ThreadingHTTPServer((host, puerto), ManejadorAPI)
+    servidor.daemon_threads = True
+    return servidor
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default=SERVIDOR_CONFIG['host'])
+    parser.add_argument("--puerto", type=int, default=SERVIDOR_CONFIG['puerto'])
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+
+    if MIGRACIONES_AL_INICIAR:
+        aplicar_migraciones_pendientes()
+    if NOTIFICACIONES_CONFIG['activas']:
+        FEED.iniciar_en_fondo()  # Cambios de terminales que escriben directo a la BD (Tk) -> índice fresco
+    Reportes.iniciar_en_fondo()  # GET /reportes solo lee los resúmenes
+    servidor = crear_servidor(args.host, args.puerto)
+    log.info("SGR escuchando en http://%s:%s (backend %s)", args.host, args.puerto, DatabaseManager.backend().nombre)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        DatabaseManager.get_pool().cerrar_todo()
@@ -0,0 +1,61 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, Toplevel
+from data.database import DatabaseManager
+from data.instrumentacion import INSTRUMENTACION
+
+class VentanaDepuracion(Toplevel):
+    """Menú oculto (Ctrl+Shift+D): estadísticas de consultas, acciones de la UI y del pool."""
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.title("Depuración - Estadísticas de BD")
+        self.geometry("1000x520")
+        self._init_widgets()
+        self.actualizar()
+
+    def _init_widgets(self):
+        f_top = tk.Frame(self); f_top.pack(fill=tk.X, padx=10, pady=5)
+        self.lbl_pool = tk.Label(f_top, text="", anchor="w", justify="left", font=("Consolas", 9))
+        self.lbl_pool.pack(side=tk.LEFT)
+        tk.Button(f_top, text="Reiniciar", command=self.reiniciar).pack(side=tk.RIGHT, padx=2)
+        tk.Button(f_top, text="Volcar a archivo", command=self.volcar).pack(side=tk.RIGHT, padx=2)
+        tk.Button(f_top, text="🔄 Actualizar", command=self.actualizar).pack(side=tk.RIGHT, padx=2)
+
+        pestanas = ttk.Notebook(self); pestanas.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.tree_sql = self._tabla(pestanas, "Sentencias SQL",
+                                    ("SQL", "N", "Total ms", "Prom ms", "p95 ms", "Máx ms", "Filas", "Espera p95", "Lentas", "Errores"))
+        self.tree_acciones = self._tabla(pestanas, "Acciones de la UI", ("Acción", "N", "Total ms", "Prom ms", "p95 ms", "Máx ms"))
+
+    def _tabla(self, pestanas, titulo, cols):
+        f = tk.Frame(pestanas); pestanas.add(f, text=titulo)
+        sb = ttk.Scrollbar(f, orient=tk.VERTICAL); sb.pack(side=tk.RIGHT, fill=tk.Y)
+        tree = ttk.Treeview(f, columns=cols, show="headings", yscrollcommand=sb.set)
+        sb.config(command=tree.yview)
+        for col in cols:
+            tree.heading(col, text=col); tree.column(col, width=70, anchor="e")
+        tree.column(cols[0], width=420, anchor="w")
+        tree.pack(fill=tk.BOTH, expand=True)
+        return tree
+
+    def actualizar(self):
+        datos = INSTRUMENTACION.estadisticas()
+        for tree in (self.tree_sql, self.tree_acciones):
+            for i in tree.get_children(): tree.delete(i)
+        for s in datos['sentencias']:
+            self.tree_sql.insert("", tk.END, values=(s['sql'][:200], s['n'], f"{s['total_ms']:.1f}", f"{s['prom_ms']:.2f}",
+                                                     s['p95_ms'], f"{s['max_ms']:.1f}", s['filas'], s['espera']['p95_ms'],
+                                                     s['lentas'], s['errores']))
+        for a in datos['acciones']:
+            self.tree_acciones.insert("", tk.END, values=(a['accion'], a['n'], f"{a['total_ms']:.1f}", f"{a['prom_ms']:.2f}",
+                                                          a['p95_ms'], f"{a['max_ms']:.1f}"))
+        p = DatabaseManager.estadisticas_pool()
+        self.lbl_pool.config(text=f"Desde {datos['desde']} | Pool: {p['abiertas']} abiertas, {p['libres']} libres, "
+                                  f"hits {p['tasa_hits']:.0%}, espera prom. {p['espera_promedio_ms']:.2f} ms, "
+                                  f"timeouts {p['timeouts']}, sentencias reutilizadas {p['sentencias_reutilizadas']}")
+
+    def volcar(self):
+        ruta = INSTRUMENTACION.volcar(extra={'pool': DatabaseManager.estadisticas_pool()})
+        messagebox.showinfo("Depuración", f"Estadísticas guardadas en:\n{ruta}", parent=self)
+
+    def reiniciar(self):
+        INSTRUMENTACION.reiniciar()
+        self.actualizar()
@@ -0,0 +1,121 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+from data.database import DatabaseManager
+from data.instrumentacion import INSTRUMENTACION
+from config.settings import EJECUTOR_CONFIG
+
+
+class Tarea:
+    """Trabajo enviado al ejecutor. Si se cancela, su callback ya no se ejecuta."""
+    def __init__(self, funcion, args, kwargs, al_terminar, al_error, clave):
+        self.funcion = funcion
+        self.args = args
+        self.kwargs = kwargs
+        self.al_terminar = al_terminar
+        self.al_error = al_error
+        self.clave = clave
+        self.cancelada = False
+        self.future = None
+        self.id_after = None  # Pendiente de debounce
+
+
+class EjecutorBD:
+    """
+    Corre las llamadas a la BD en hilos de fondo para que el mainloop de Tk nunca se bloquee.
+    Los resultados vuelven al hilo de Tk por una cola que se revisa con after().
+    - clave: solo vale la última tarea con la misma clave; las anteriores se cancelan
+      (si no empezaron) o se ignora su resultado (si ya estaban corriendo).
+    - retraso_ms: debounce; la tarea espera ese tiempo y se reemplaza si llega otra con la misma clave.
+    """
+    def __init__(self, root, hilos=EJECUTOR_CONFIG['hilos'], intervalo_ms=EJECUTOR_CONFIG['intervalo_ms']):
+        self.root = root
+        self.intervalo_ms = intervalo_ms
+        self._pool = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="bd")
+        self._resultados = queue.Queue()
+        self._ultima = {}        # clave -> Tarea vigente
+        self._pendientes = 0     # Tareas cuyo resultado aún no se despachó
+        self._revisando = False
+        self._hilo_tk = threading.get_ident()
+        DatabaseManager.manejador_errores = self._reportar_error
+
+    def enviar(self, funcion, *args, al_terminar=None, al_error=None, clave=None, retraso_ms=0, **kwargs):
+        tarea = Tarea(funcion, args, kwargs, al_terminar, al_error, clave)
+        if clave is not None:
+            anterior = self._ultima.get(clave)
+            if anterior:
+                self.cancelar(anterior)
+            self._ultima[clave] = tarea
+        if retraso_ms:
+            tarea.id_after = self.root.after(retraso_ms, lambda: self._lanzar(tarea))
+        else:
+            self._lanzar(tarea)
+        return tarea
+
+    def cancelar(self, tarea):
+        tarea.cancelada = True
+        if tarea.id_after:
+            self.root.after_cancel(tarea.id_after)
+            tarea.id_after = None
+        elif tarea.future and tarea.future.cancel():
+            self._pendientes -= 1
+
+    def cerrar(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # --- Internos ---
+    def _lanzar(self, tarea):
+        tarea.id_after = None
+        if tarea.cancelada: return
+        self._pendientes += 1
+        tarea.future = self._pool.submit(self._correr, tarea)
+        self._programar_revision()
+
+    def _correr(self, tarea):
+        # Hilo de fondo: nada de widgets aquí. Cada tarea se mide como una "acción" de la UI
+        accion = getattr(tarea.funcion, '__qualname__', repr(tarea.funcion)).replace('.<locals>', '')
+        INSTRUMENTACION.en_accion(accion)
+        inicio = time.perf_counter()
+        try:
+            self._resultados.put((tarea, tarea.funcion(*tarea.args, **tarea.kwargs), None))
+        except Exception as e:
+            self._resultados.put((tarea, None, e))
+        finally:
+            INSTRUMENTACION.registrar_accion(accion, time.perf_counter() - inicio)
+            INSTRUMENTACION.en_accion(None)
+
+    def _programar_revision(self):
+        if not self._revisando:
+            self._revisando = True
+            self.root.after(self.intervalo_ms, self._despachar)
+
+    def _despachar(self):
+        self._revisando = False
+        while True:
+            try:
+                tarea, resultado, error = self._resultados.get_nowait()
+            except queue.Empty:
+                break
+            if tarea is None:
+                messagebox.showerror(*resultado)  # Error de BD ocurrido en un hilo de fondo
+                continue
+            self._pendientes -= 1
+            if tarea.clave is not None and self._ultima.get(tarea.clave) is tarea:
+                del self._ultima[tarea.clave]
+            if tarea.cancelada: continue
+            if error is not None:
+                if tarea.al_error: tarea.al_error(error)
+                else: messagebox.showerror("Error", f"{error}")
+            elif tarea.al_terminar:
+                tarea.al_terminar(resultado)
+        if self._pendientes > 0 or not self._resultados.empty():
+            self._programar_revision()
+
+    def _reportar_error(self, titulo, detalle):
+        # run_query avisa de errores; desde un hilo de fondo se muestran en el hilo de Tk
+        if threading.get_ident() == self._hilo_tk:
+            messagebox.showerror(titulo, detalle)
+        else:
+            self._resultados.put((None, (titulo, detalle), None))
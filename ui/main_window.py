@@ -1,119 +1,206 @@
+import logging
+import time
 import tkinter as tk
 from tkinter import messagebox
 from datetime import datetime
 from ui.reserva_form import ReservaForm
 from ui.reserva_monitor import ReservaMonitor
+from ui.ejecutor import EjecutorBD
+from ui.depuracion import VentanaDepuracion
+from ui.reportes import VentanaReportes
 from data.database import DatabaseManager
-from logic.reserva_controller import ReservaController
-from config.settings import ID_RESTAURANTE_ACTUAL
+from logic.reserva_controller import ConflictoReservaError
+from logic.reserva_servicio import ReservaServicio, ValidacionError
+from data.instrumentacion import INSTRUMENTACION
+from data.migraciones import aplicar_migraciones_pendientes
+from logic.notificaciones import FEED
+from logic.reportes import Reportes
+from logic.catalogos import cargar_instantanea, guardar_instantanea
+from config.settings import INSTRUMENTACION_CONFIG, NOTIFICACIONES_CONFIG, MIGRACIONES_AL_INICIAR
+
+log = logging.getLogger(__name__)
+
 
 class MainWindow:
-    def __init__(self):
+    def __init__(self, inicio=None, salir_al_cargar=False):
+        """
+        inicio: perf_counter() al arrancar el proceso (app.py), para medir el tiempo hasta el primer pintado.
+        salir_al_cargar: cerrar apenas estén los datos iniciales (medición del arranque).
+        """
+        self.inicio = inicio or time.perf_counter()
+        self.salir_al_cargar = salir_al_cargar
+        self.tiempos_arranque = {}  # etapa -> ms desde inicio
+        self._cargas_pendientes = {"catalogos", "monitor"}
         self.root = tk.Tk()
         self.root.title("Gestión Reservas Modular v8.0 (SGR)")
         self.root.geometry("1250x700")
         self.id_reserva_seleccionada = None
         self.modo_edicion = False
+        self._revision_en_curso = False   # Revisión del feed de cambios corriendo en el ejecutor
+        self._repetir_revision = False    # Se pidió otra mientras tanto (p. ej. tras una escritura propia)
+        self.ejecutor = EjecutorBD(self.root)
         self.form = ReservaForm(self.root, self)
         self.form.pack(side=tk.LEFT, fill=tk.Y)
         self.monitor = ReservaMonitor(self.root, self)
         self.monitor.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
+        self.root.bind_all("<Control-Shift-D>", lambda e: VentanaDepuracion(self.root))  # Menú oculto de depuración
+        # Nada de BD antes de pintar: la carga empieza cuando Tk queda ocioso por primera vez
+        self.root.after_idle(self._primer_pintado)
 
-    def run(self): self.root.mainloop()
+    def run(self):
+        self.root.mainloop()
+        self.ejecutor.cerrar()
+        try:
+            guardar_instantanea()  # Arranque en caliente la próxima vez
+        except Exception:
+            log.exception("No se pudo guardar la instantánea de catálogos")
+        if INSTRUMENTACION_CONFIG['volcar_al_salir']:
+            INSTRUMENTACION.volcar(extra={'pool': DatabaseManager.estadisticas_pool(), 'arranque_ms': self.tiempos_arranque})
 
-    def procesar_guardado(self, nombre_cli, n_personas, fecha, hora, minuto, indices_mesa, nombre_emp):
-        # 1. Validaciones
-        if not nombre_cli or not indices_mesa: return messagebox.showerror("Error", "Faltan datos (Cliente o Mesas)")
-        
+    # --- Arranque progresivo ---
+    def _primer_pintado(self):
+        self.root.update_idletasks()
+        self._marcar_arranque("primer pintado")
+        self.form.cargar_calendario()
+        # 1) catálogos de la sesión anterior (disco), 2) migraciones, 3) catálogos y monitor desde la BD
+        self.ejecutor.enviar(cargar_instantanea, clave="arranque", al_terminar=self._al_cargar_instantanea,
+                             al_error=lambda e: self._al_cargar_instantanea(False))
+
+    def _al_cargar_instantanea(self, cargada):
+        if cargada:
+            self.form.cargar_catalogos_en_cache()
+            self._marcar_arranque("catálogos en caché")
+        self.ejecutor.enviar(self._preparar_bd, clave="arranque", al_terminar=self._cargar_datos_iniciales,
+                             al_error=self._al_fallar_migraciones)
+
+    @staticmethod
+    def _preparar_bd():
+        if MIGRACIONES_AL_INICIAR:
+            aplicar_migraciones_pendientes()
+
+    def _al_fallar_migraciones(self, error):
+        messagebox.showerror("Migraciones", f"No se pudieron aplicar las migraciones pendientes:\n{error}")
+        self._cargar_datos_iniciales(None)
+
+    def _cargar_datos_iniciales(self, _):
+        self._marcar_arranque("BD lista")
+        self.form.cargar_catalogos(al_terminar=lambda: self._carga_lista("catalogos"))
+        self.monitor.cargar_datos(al_terminar=lambda: self._carga_lista("monitor"))
+        if NOTIFICACIONES_CONFIG['activas']:
+            self.root.after(NOTIFICACIONES_CONFIG['intervalo_ms'], self._sondear_cambios)
+        Reportes.iniciar_en_fondo()  # El visor de reportes solo lee los resúmenes; esto los mantiene al día
+
+    def _carga_lista(self, parte):
+        self._cargas_pendientes.discard(parte)
+        if self._cargas_pendientes: return
+        self._marcar_arranque("datos listos")
+        if self.salir_al_cargar:
+            print("Arranque (ms desde el inicio del proceso): " + ", ".join(f"{k} {v:.0f}" for k, v in self.tiempos_arranque.items()))
+            self.root.after(0, self.root.destroy)
+
+    def _marcar_arranque(self, etapa):
+        segundos = time.perf_counter() - self.inicio
+        self.tiempos_arranque[etapa] = segundos * 1000
+        INSTRUMENTACION.registrar_accion(f"arranque: {etapa}", segundos)  # Visible en Ctrl+Shift+D
+        log.info("Arranque: %s a los %.0f ms", etapa, segundos * 1000)
+
+    def _sondear_cambios(self):
+        self._revisar_cambios()
+        self.root.after(NOTIFICACIONES_CONFIG['intervalo_ms'], self._sondear_cambios)
+
+    def _revisar_cambios(self):
+        # Feed de cambios: solo se refresca lo que tocó alguna terminal (esta incluida).
+        # Sin clave de reemplazo: FEED.revisar avanza la marca de agua en el hilo de fondo, así que descartar su
+        # resultado perdería esos cambios para siempre. Una sola revisión a la vez; la pedida mientras tanto va después.
+        if self._revision_en_curso:
+            self._repetir_revision = True
+            return
+        self._revision_en_curso = True
+        self.ejecutor.enviar(FEED.revisar, al_terminar=self._al_recibir_cambios, al_error=self._al_fallar_revision)
+
+    def _al_recibir_cambios(self, cambios):
+        self._fin_revision()
+        if not cambios: return
+        self.monitor.aplicar_cambios(cambios)
+        self.form.verificar_disponibilidad()  # FEED ya invalidó en el índice los días tocados
+
+    def _al_fallar_revision(self, error):
+        log.warning("No se pudo revisar el feed de cambios: %s", error)
+        self._fin_revision()
+
+    def _fin_revision(self):
+        self._revision_en_curso = False
+        if self._repetir_revision:
+            self._repetir_revision = False
+            self._revisar_cambios()
+
+    def _actualizar_pantallas(self):
+        # Tras una escritura propia: incremental si hay feed, recarga completa si no
+        if FEED.disponible: self._revisar_cambios()
+        else: self.monitor.cargar_datos()
+
+    def procesar_guardado(self, id_cliente, n_personas, fecha, hora, minuto, indices_mesa, nombre_emp):
+        # 1. Datos planos desde los widgets (las reglas de negocio viven en ReservaServicio)
         try:
             dt = datetime(fecha.year, fecha.month, fecha.day, int(hora), int(minuto))
-            if not self.modo_edicion and dt < datetime.now(): return messagebox.showerror("Error", "Fecha pasada")
         except: return messagebox.showerror("Error", "Fecha inválida")
+        editando = self.modo_edicion
+        datos = {
+            'id_cliente': id_cliente, 'n_personas': n_personas, 'fecha_hora': dt, 'empleado': nombre_emp,
+            'mesas': [self.form.mesas_actuales[i]['id'] for i in indices_mesa],
+            'id_reserva': self.id_reserva_seleccionada if editando else None
+        }
 
-        pax = int(n_personas)
-        cap_total = sum([self.form.mesas_actuales[i]['capacidad'] for i in indices_mesa])
-        ids_mesas = [self.form.mesas_actuales[i]['id'] for i in indices_mesa]
+        # 2. Validación + conflicto + guardado (una transacción con bloqueo de la franja), fuera del hilo de Tk
+        self.form.btn_guardar.config(state=tk.DISABLED)
+        self.ejecutor.enviar(ReservaServicio.guardar_reserva, datos, clave="guardar",
+                             al_terminar=self._al_guardar, al_error=self._al_fallar_guardado)
 
-        if cap_total < pax: return messagebox.showerror("Capacidad", "Mesas insuficientes")
+    def _al_guardar(self, resultado):
+        self.form.btn_guardar.config(state=tk.NORMAL)
+        messagebox.showinfo("Éxito", "Reserva Actualizada" if resultado['editada'] else f"Reserva #{resultado['id_reserva']} Creada")
+        self.form.limpiar()
+        self._actualizar_pantallas()
 
-        ids_mesas_seleccionadas = [self.form.mesas_actuales[i]['id'] for i in indices_mesa]
-        
-        # Fecha que queremos reservar
-        try:
-            dt_intento = datetime(fecha.year, fecha.month, fecha.day, int(hora), int(minuto))
-        except: return # Ya validado arriba
-        
-        # ¿Estamos editando?
-        ignorar_id = self.id_reserva_seleccionada if self.modo_edicion else None
-        
-        # Preguntar al controlador
-        mesas_ocupadas = ReservaController.verificar_conflicto_mesas(dt_intento, ids_mesas_seleccionadas, ignorar_id)
-        
-        if mesas_ocupadas:
-            nombres = ", ".join(mesas_ocupadas)
+    def _al_fallar_guardado(self, error):
+        self.form.btn_guardar.config(state=tk.NORMAL)
+        if isinstance(error, ValidacionError):
+            messagebox.showerror(error.titulo, str(error))
+        elif isinstance(error, ConflictoReservaError):
+            nombres = ", ".join(error.mesas)
             messagebox.showerror("Conflicto de Reserva", 
                                  f"IMPOSIBLE GUARDAR.\n\nLas siguientes mesas ya están ocupadas o reservadas en ese horario:\n👉 {nombres}\n\nPor favor seleccione otras mesas o cambie la hora.")
-            return
-
-        # 2. Datos
-        id_cli = self.form.clientes_map[nombre_cli]
-        id_emp = self.form.empleados_map.get(nombre_emp)
-        id_pol = ReservaController.calcular_politica(pax, 1) # 1=Pendiente
-
-        # 3. SQL Transaction
-        try:
-            if self.modo_edicion:
-                sql = "UPDATE SGR_T_Reserva SET fechareserva=?, Npersonas=?, idCliente=?, idEmpleado=?, idPolitica=?, idEstadoreserva=1 WHERE idReserva=?"
-                DatabaseManager.run_query(sql, (dt, pax, id_cli, id_emp, id_pol, self.id_reserva_seleccionada), commit=True)
-                DatabaseManager.run_query("DELETE FROM SGR_T_DetalleReserva WHERE idReserva=?", (self.id_reserva_seleccionada,), commit=True)
-                id_res = self.id_reserva_seleccionada
-                msg = "Reserva Actualizada"
-            else:
-                sql = """SET NOCOUNT ON; INSERT INTO SGR_T_Reserva (fechareserva, Npersonas, idCliente, idEmpleado, idEstadoreserva, idPolitica, idRestaurante)
-                         VALUES (?, ?, ?, ?, 1, ?, ?); SELECT SCOPE_IDENTITY();"""
-                id_res = DatabaseManager.run_query(sql, (dt, pax, id_cli, id_emp, id_pol, ID_RESTAURANTE_ACTUAL), commit=True)
-                msg = f"Reserva #{id_res} Creada"
-
-            # --- CORRECCIÓN AQUÍ: ESPECIFICAR COLUMNAS ---
-            for m_id in ids_mesas:
-                # Antes fallaba aquí porque no decíamos en qué columnas insertar
-                sql_detalle = "INSERT INTO SGR_T_DetalleReserva (idReserva, idMesa, Total) VALUES (?, ?, 0)"
-                DatabaseManager.run_query(sql_detalle, (id_res, m_id), commit=True)
-
-            messagebox.showinfo("Éxito", msg)
-            self.form.limpiar()
-            self.monitor.cargar_datos()
-            
-        except Exception as e:
-            messagebox.showerror("Error Crítico", f"No se pudo guardar: {e}")
+        else:
+            messagebox.showerror("Error Crítico", f"No se pudo guardar: {error}")
 
     def cargar_edicion(self):
         if not self.id_reserva_seleccionada: return
-        # NOMBRES NUEVOS
-        sql = "SELECT idCliente, Npersonas, fechareserva, idEmpleado FROM SGR_T_Reserva WHERE idReserva=?"
-        d = DatabaseManager.run_query(sql, (self.id_reserva_seleccionada,), fetchone=True)
-        if d:
-            self.modo_edicion = True
-            self.form.lbl_titulo.config(text=f"EDITANDO #{self.id_reserva_seleccionada}", fg="orange")
-            self.form.btn_guardar.config(text="GUARDAR CAMBIOS", bg="orange")
-            try:
-                nombre = [k for k, v in self.form.clientes_map.items() if v == d[0]][0]
-                self.form.combo_cliente.set(nombre)
-            except: pass
-            self.form.spin_personas.delete(0, tk.END); self.form.spin_personas.insert(0, d[1])
-            self.form.entry_fecha.set_date(d[2])
-            self.form.spin_hora.delete(0, tk.END); self.form.spin_hora.insert(0, d[2].hour)
-            self.form.spin_min.delete(0, tk.END); self.form.spin_min.insert(0, d[2].minute)
-            self.form.verificar_disponibilidad()
+        self.ejecutor.enviar(ReservaServicio.obtener_reserva, self.id_reserva_seleccionada, clave="edicion",
+                             al_terminar=self._mostrar_edicion,
+                             al_error=lambda e: messagebox.showerror("Editar", f"{e}"))
+
+    def _mostrar_edicion(self, d):
+        self.modo_edicion = True
+        self.id_reserva_seleccionada = d['id_reserva']
+        self.form.lbl_titulo.config(text=f"EDITANDO #{d['id_reserva']}", fg="orange")
+        self.form.btn_guardar.config(text="GUARDAR CAMBIOS", bg="orange")
+        self.form.mostrar_cliente(d['id_cliente'], d['cliente'])
+        self.form.spin_personas.delete(0, tk.END); self.form.spin_personas.insert(0, d['n_personas'])
+        self.form.entry_fecha.set_date(d['fecha_hora'])
+        self.form.spin_hora.delete(0, tk.END); self.form.spin_hora.insert(0, d['fecha_hora'].hour)
+        self.form.spin_min.delete(0, tk.END); self.form.spin_min.insert(0, d['fecha_hora'].minute)
+        self.form.verificar_disponibilidad()
+
+    def abrir_reportes(self):
+        VentanaReportes(self.root, self.ejecutor)
 
     def cambiar_estado(self, nuevo_estado):
         if not self.id_reserva_seleccionada: return
-        pax = DatabaseManager.run_query("SELECT Npersonas FROM SGR_T_Reserva WHERE idReserva=?", (self.id_reserva_seleccionada,), fetchone=True)[0]
-        pol = ReservaController.calcular_politica(pax, nuevo_estado)
-        # NOMBRES NUEVOS
-        sql = "UPDATE SGR_T_Reserva SET idEstadoreserva=?, idPolitica=? WHERE idReserva=?"
-        DatabaseManager.run_query(sql, (nuevo_estado, pol, self.id_reserva_seleccionada), commit=True)
-        self.monitor.cargar_datos()
+        self.ejecutor.enviar(ReservaServicio.cambiar_estado, self.id_reserva_seleccionada, nuevo_estado,
+                             al_terminar=lambda _: self._refrescar())
+
+    def _refrescar(self):
+        self._actualizar_pantallas()
         self.form.verificar_disponibilidad()
 
     # --- AGREGAR ESTO AL FINAL DE LA CLASE MainWindow ---
@@ -126,26 +213,14 @@ class MainWindow:
         if not messagebox.askyesno("Eliminar Registro", msg, icon='warning'):
             return
 
-        # Ejecución SQL
-        try:
-            # 1. Borrar Detalles (Hijos)
-            sql_det = "DELETE FROM SGR_T_DetalleReserva WHERE idReserva = ?"
-            DatabaseManager.run_query(sql_det, (self.id_reserva_seleccionada,), commit=True)
-            
-            # 2. Borrar Pagos (Si hubiera, para evitar error de FK)
-            sql_pag = "DELETE FROM SGR_T_Pago WHERE idReserva = ?"
-            DatabaseManager.run_query(sql_pag, (self.id_reserva_seleccionada,), commit=True)
-
-            # 3. Borrar Cabecera (Padre)
-            sql_cab = "DELETE FROM SGR_T_Reserva WHERE idReserva = ?"
-            DatabaseManager.run_query(sql_cab, (self.id_reserva_seleccionada,), commit=True)
-            
-            messagebox.showinfo("Eliminado", "El registro ha sido borrado exitosamente.")
-            
-            # Refrescar interfaz
-            self.id_reserva_seleccionada = None
-            self.monitor.cargar_datos()
-            self.form.verificar_disponibilidad() # Liberar mesas visualmente
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"No se pudo eliminar: {e}")
\ No newline at end of file
+        # Ejecución SQL (detalles, pagos y cabecera en una sola transacción) en segundo plano
+        self.ejecutor.enviar(ReservaServicio.eliminar_reserva, self.id_reserva_seleccionada,
+                             al_terminar=self._al_eliminar,
+                             al_error=lambda e: messagebox.showerror("Error", f"No se pudo eliminar: {e}"))
+
+    def _al_eliminar(self, _):
+        messagebox.showinfo("Eliminado", "El registro ha sido borrado exitosamente.")
+        
+        # Refrescar interfaz
+        self.id_reserva_seleccionada = None
+        self._refrescar() # Liberar mesas visualmente
\ No newline at end of file
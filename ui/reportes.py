@@ -0,0 +1,112 @@
+import tkinter as tk
+from tkinter import ttk, messagebox, Toplevel
+from datetime import date, timedelta
+from logic.reportes import Reportes
+from ui.reserva_form import CampoFecha
+from config.settings import REPORTES_CONFIG
+
+AGRUPAR = {"Día": "dia", "Semana": "semana", "Mes": "mes"}
+
+
+class VentanaReportes(Toplevel):
+    """Ocupación, cancelaciones e ingresos por período y por mesa. Solo lee los resúmenes diarios (logic/reportes.py)."""
+    def __init__(self, parent, ejecutor):
+        super().__init__(parent)
+        self.title("Reportes de gestión")
+        self.geometry("1000x560")
+        self.ejecutor = ejecutor
+        self._init_widgets()
+        self.consultar()
+
+    def _init_widgets(self):
+        f_top = tk.Frame(self); f_top.pack(fill=tk.X, padx=10, pady=5)
+        tk.Label(f_top, text="Desde:").pack(side=tk.LEFT)
+        self.entry_desde = CampoFecha(f_top, width=12); self.entry_desde.pack(side=tk.LEFT, padx=2)
+        self.entry_desde.set_date(date.today() - timedelta(days=REPORTES_CONFIG['dias_por_defecto']))
+        tk.Label(f_top, text="Hasta:").pack(side=tk.LEFT)
+        self.entry_hasta = CampoFecha(f_top, width=12); self.entry_hasta.pack(side=tk.LEFT, padx=2)
+        tk.Label(f_top, text="Agrupar por:").pack(side=tk.LEFT, padx=(10, 0))
+        self.combo_agrupar = ttk.Combobox(f_top, state="readonly", width=8, values=list(AGRUPAR))
+        self.combo_agrupar.set("Día"); self.combo_agrupar.pack(side=tk.LEFT, padx=2)
+        self.combo_agrupar.bind("<<ComboboxSelected>>", lambda e: self.consultar())
+        self.btn_consultar = tk.Button(f_top, text="📊 Consultar", command=self.consultar); self.btn_consultar.pack(side=tk.LEFT, padx=5)
+        tk.Button(f_top, text="Recalcular todo", command=self.reconstruir).pack(side=tk.RIGHT, padx=2)
+        tk.Button(f_top, text="Actualizar resúmenes", command=self.refrescar).pack(side=tk.RIGHT, padx=2)
+        self.lbl_estado = tk.Label(f_top, text="", fg="gray"); self.lbl_estado.pack(side=tk.RIGHT, padx=10)
+
+        self.lbl_totales = tk.Label(self, text="", anchor="w", justify="left", font=("Consolas", 10))
+        self.lbl_totales.pack(fill=tk.X, padx=10)
+
+        pestanas = ttk.Notebook(self); pestanas.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.tree_periodos = self._tabla(pestanas, "Por período",
+                                         ("Período", "Reservas", "Pendientes", "Confirmadas", "Canceladas", "% Cancel.",
+                                          "Completadas", "Personas", "Ingresos", "% Ocupación"))
+        self.tree_mesas = self._tabla(pestanas, "Por mesa",
+                                      ("Mesa", "Capacidad", "Reservas", "Canceladas", "% Cancel.", "% Ocupación"))
+
+    def _tabla(self, pestanas, titulo, cols):
+        f = tk.Frame(pestanas); pestanas.add(f, text=titulo)
+        sb = ttk.Scrollbar(f, orient=tk.VERTICAL); sb.pack(side=tk.RIGHT, fill=tk.Y)
+        tree = ttk.Treeview(f, columns=cols, show="headings", yscrollcommand=sb.set)
+        sb.config(command=tree.yview)
+        for col in cols:
+            tree.heading(col, text=col); tree.column(col, width=80, anchor="e")
+        tree.column(cols[0], width=120, anchor="w")
+        tree.pack(fill=tk.BOTH, expand=True)
+        return tree
+
+    def consultar(self):
+        try:
+            desde, hasta = self.entry_desde.get_date(), self.entry_hasta.get_date()
+        except ValueError:
+            return messagebox.showerror("Reportes", "Fecha inválida (AAAA-MM-DD)", parent=self)
+        if hasta < desde:
+            return messagebox.showerror("Reportes", "'Hasta' es anterior a 'Desde'", parent=self)
+        self.lbl_estado.config(text="Consultando…")
+        self.btn_consultar.config(state=tk.DISABLED)
+        self.ejecutor.enviar(Reportes.resumen, desde, hasta, AGRUPAR[self.combo_agrupar.get()], clave="reportes",
+                             al_terminar=self._mostrar, al_error=self._al_fallar)
+
+    def refrescar(self):
+        # Los resúmenes se refrescan en segundo plano (REPORTES_CONFIG['refrescar_cada_s']); esto solo adelanta el próximo
+        self.lbl_estado.config(text="Actualizando resúmenes…")
+        self.ejecutor.enviar(Reportes.refrescar, clave="reportes", al_terminar=lambda n: self.consultar(),
+                             al_error=self._al_fallar)
+
+    def reconstruir(self):
+        if not messagebox.askyesno("Reportes", "¿Recalcular los resúmenes de toda la historia?\n"
+                                   "Solo hace falta si cambiaron los valores de las políticas.", parent=self):
+            return
+        self.lbl_estado.config(text="Recalculando…")
+        self.ejecutor.enviar(Reportes.reconstruir, clave="reportes", al_terminar=lambda n: self.consultar(),
+                             al_error=self._al_fallar)
+
+    def _mostrar(self, r):
+        if not self.winfo_exists(): return
+        self.btn_consultar.config(state=tk.NORMAL)
+        formato = {'dia': "%Y-%m-%d (%a)", 'semana': "Sem. %Y-%m-%d", 'mes': "%Y-%m"}[r['agrupar']]
+        for tree in (self.tree_periodos, self.tree_mesas):
+            for i in tree.get_children(): tree.delete(i)
+        for p in r['periodos']:
+            self.tree_periodos.insert("", tk.END, values=(
+                p['periodo'].strftime(formato), p['reservas'], p['pendientes'], p['confirmadas'], p['canceladas'],
+                f"{p['tasa_cancelacion']:.1%}", p['completadas'], p['personas'], f"{p['ingresos']:,.2f}", f"{p['ocupacion']:.1%}"))
+        for m in r['mesas']:
+            self.tree_mesas.insert("", tk.END, values=(
+                m['mesa'], m['capacidad'] or "-", m['reservas'], m['canceladas'], f"{m['tasa_cancelacion']:.1%}", f"{m['ocupacion']:.1%}"))
+        t = r['totales']
+        self.lbl_totales.config(text=f"{r['desde']} a {r['hasta']}:  {t['reservas']} reservas | {t['personas']} personas | "
+                                     f"canceladas {t['canceladas']} ({t['tasa_cancelacion']:.1%}) | ocupación {t['ocupacion']:.1%} | "
+                                     f"ingresos {t['ingresos']:,.2f}")
+        if not r['dias_pendientes']:
+            antiguedad = "resúmenes al día"
+        else:
+            desde_cuando = r['actualizado'].strftime('%d/%m %H:%M') if r['actualizado'] else "nunca"
+            antiguedad = f"resúmenes del {desde_cuando}: {r['dias_pendientes']} días con cambios sin resumir"
+        self.lbl_estado.config(text=f"{r['ms']:.0f} ms, {antiguedad}", fg="gray" if not r['dias_pendientes'] else "darkorange")
+
+    def _al_fallar(self, error):
+        if not self.winfo_exists(): return
+        self.btn_consultar.config(state=tk.NORMAL)
+        self.lbl_estado.config(text="", fg="gray")
+        messagebox.showerror("Reportes", f"No se pudo generar el reporte: {error}", parent=self)
@@ -1,29 +1,62 @@
+import importlib
+import logging
 import tkinter as tk
 from tkinter import ttk, messagebox
-from tkcalendar import DateEntry
-from datetime import datetime
-from data.database import DatabaseManager
-from config.settings import ID_RESTAURANTE_ACTUAL
+from datetime import datetime, date
+from config.settings import EJECUTOR_CONFIG, ARRANQUE_CONFIG, BUSQUEDA_CLIENTES_CONFIG
 from logic.reserva_controller import ReservaController
+from logic.catalogos import EMPLEADOS
+from logic.busqueda_clientes import BUSCADOR, normalizar
+
+log = logging.getLogger(__name__)
+
+
+class CampoFecha(ttk.Entry):
+    """
+    Fecha AAAA-MM-DD con la misma interfaz que DateEntry (get_date / set_date).
+    Se muestra hasta que tkcalendar termina de importarse, o siempre si no está instalado.
+    """
+    def __init__(self, parent, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.set_date(datetime.now())
+
+    def get_date(self):
+        return datetime.strptime(self.get().strip(), "%Y-%m-%d").date()  # ValueError si no es una fecha
+
+    def set_date(self, fecha):
+        self.delete(0, tk.END); self.insert(0, f"{fecha:%Y-%m-%d}")
+
 
 class ReservaForm(tk.Frame):
     def __init__(self, parent, main_controller):
         super().__init__(parent, width=420, bg="#f4f4f4", padx=10, pady=10)
         self.pack_propagate(False)
         self.main_window = main_controller
-        self.clientes_map = {}
-        self.empleados_map = {}
+        self._version_empleados = None
         self.mesas_actuales = []
+        self.id_cliente = None            # Cliente elegido en las sugerencias (se busca por id, no por nombre)
+        self._texto_cliente = ""          # Último texto buscado
+        self.clientes_sugeridos = []      # Filas de las sugerencias visibles
+        self._mas_clientes = False
         self._init_widgets()
-        self.cargar_catalogos()
+        # Los catálogos los pide MainWindow después del primer pintado (cargar_catalogos)
 
     def _init_widgets(self):
         self.lbl_titulo = tk.Label(self, text="NUEVA RESERVA", font=("Arial", 14, "bold"), bg="#f4f4f4")
         self.lbl_titulo.pack(pady=5)
 
-        tk.Label(self, text="Cliente:", bg="#f4f4f4", anchor="w").pack(fill=tk.X)
-        self.combo_cliente = ttk.Combobox(self, state="readonly")
-        self.combo_cliente.pack(fill=tk.X, pady=2)
+        tk.Label(self, text="Cliente (nombre, apellido, cédula o teléfono):", bg="#f4f4f4", anchor="w").pack(fill=tk.X)
+        self.entry_cliente = ttk.Entry(self)
+        self.entry_cliente.pack(fill=tk.X, pady=2)
+        self.entry_cliente.bind("<KeyRelease>", self._al_escribir_cliente)
+        self.entry_cliente.bind("<Down>", self._ir_a_sugerencias)
+        self.entry_cliente.bind("<Return>", lambda e: self._elegir_cliente(0))
+        self.entry_cliente.bind("<Escape>", lambda e: self._ocultar_sugerencias())
+        # Sugerencias: solo visibles mientras se busca
+        self.listbox_clientes = tk.Listbox(self, height=6, exportselection=False, activestyle="dotbox")
+        self.listbox_clientes.bind("<Return>", lambda e: self._elegir_cliente(self.listbox_clientes.index(tk.ACTIVE)))
+        self.listbox_clientes.bind("<Double-Button-1>", lambda e: self._elegir_cliente(self.listbox_clientes.nearest(e.y)))
+        self.listbox_clientes.bind("<Escape>", lambda e: (self._ocultar_sugerencias(), self.entry_cliente.focus_set()))
 
         tk.Label(self, text="Personas:", bg="#f4f4f4", anchor="w").pack(fill=tk.X)
         self.spin_personas = tk.Spinbox(self, from_=1, to=50, font=("Arial", 11))
@@ -31,14 +64,18 @@ class ReservaForm(tk.Frame):
 
         tk.Label(self, text="Fecha y Hora:", bg="#f4f4f4", anchor="w").pack(fill=tk.X)
         f_hora = tk.Frame(self, bg="#f4f4f4"); f_hora.pack(fill=tk.X)
-        self.entry_fecha = DateEntry(f_hora, width=12, date_pattern='yyyy-mm-dd',state="readonly")
+        self.entry_fecha = CampoFecha(f_hora, width=12)
         self.entry_fecha.pack(side=tk.LEFT)
+        if not ARRANQUE_CONFIG['calendario_diferido']:
+            self._crear_calendario(importlib.import_module("tkcalendar"))
         self.spin_hora = tk.Spinbox(f_hora, from_=8, to=22, width=3); self.spin_hora.pack(side=tk.LEFT)
         tk.Label(f_hora, text=":", bg="#f4f4f4").pack(side=tk.LEFT)
         self.spin_min = tk.Spinbox(f_hora, from_=0, to=59, width=3); self.spin_min.pack(side=tk.LEFT)
         tk.Button(f_hora, text="🔄 Verificar", bg="#eee", command=self.verificar_disponibilidad).pack(side=tk.LEFT, padx=5)
 
-        tk.Label(self, text="Mesas:", bg="#f4f4f4", anchor="w").pack(fill=tk.X, pady=5)
+        f_mesas = tk.Frame(self, bg="#f4f4f4"); f_mesas.pack(fill=tk.X, pady=5)
+        tk.Label(f_mesas, text="Mesas:", bg="#f4f4f4", anchor="w").pack(side=tk.LEFT)
+        tk.Button(f_mesas, text="✨ Sugerir", bg="#eee", command=self.sugerir_mesas).pack(side=tk.RIGHT)
         f_list = tk.Frame(self); f_list.pack(fill=tk.X, expand=True)
         sb = tk.Scrollbar(f_list); sb.pack(side=tk.RIGHT, fill=tk.Y)
         self.listbox_mesas = tk.Listbox(f_list, selectmode=tk.MULTIPLE, height=8, yscrollcommand=sb.set)
@@ -46,45 +83,175 @@ class ReservaForm(tk.Frame):
         sb.config(command=self.listbox_mesas.yview)
 
         tk.Label(self, text="Empleado:", bg="#f4f4f4", anchor="w").pack(fill=tk.X)
-        self.combo_empleado = ttk.Combobox(self, state="readonly")
+        self.combo_empleado = ttk.Combobox(self, state="readonly", postcommand=self.refrescar_catalogos)
         self.combo_empleado.pack(fill=tk.X, pady=2)
 
         self.btn_guardar = tk.Button(self, text="CONFIRMAR", bg="#007bff", fg="white", font=("Arial", 11, "bold"), height=2, command=self.guardar)
         self.btn_guardar.pack(fill=tk.X, pady=15)
         tk.Button(self, text="Limpiar", command=self.limpiar).pack(fill=tk.X)
 
-    def cargar_catalogos(self):
-        # NOMBRES NUEVOS: SGR_M_Cliente, idCliente
-        rows = DatabaseManager.run_query("SELECT idCliente, nombre + ' ' + apellido FROM SGR_M_Cliente", fetchall=True)
-        if rows:
-            self.clientes_map = {r[1]: r[0] for r in rows}
-            self.combo_cliente['values'] = list(self.clientes_map.keys())
-        
-        # NOMBRES NUEVOS: SGR_M_Empleado, idEmpleado, idRestaurante
-        rows = DatabaseManager.run_query("SELECT idEmpleado, nombre FROM SGR_M_Empleado WHERE idRestaurante=?", (ID_RESTAURANTE_ACTUAL,), fetchall=True)
-        if rows:
-            self.empleados_map = {r[1]: r[0] for r in rows}
-            self.combo_empleado['values'] = list(self.empleados_map.keys())
-        
-        self.verificar_disponibilidad()
+    def cargar_calendario(self):
+        # tkcalendar (y babel) se importan en un hilo de fondo; el widget se crea en el de Tk
+        if isinstance(self.entry_fecha, CampoFecha):
+            self.main_window.ejecutor.enviar(importlib.import_module, "tkcalendar", clave="calendario",
+                                             al_terminar=self._crear_calendario,
+                                             al_error=lambda e: log.warning("Sin tkcalendar (%s): fecha como texto", e))
+
+    def _crear_calendario(self, tkcalendar):
+        try:
+            fecha = self.entry_fecha.get_date()
+        except ValueError:
+            fecha = date.today()
+        calendario = tkcalendar.DateEntry(self.entry_fecha.master, width=12, date_pattern='yyyy-mm-dd', state="readonly")
+        calendario.set_date(fecha)
+        calendario.pack(side=tk.LEFT, before=self.entry_fecha)
+        self.entry_fecha.destroy()
+        self.entry_fecha = calendario
+
+    def cargar_catalogos_en_cache(self):
+        # Instantánea de la sesión anterior: el combo se llena antes de tocar la BD
+        self._mostrar_catalogos(EMPLEADOS.version)
+
+    def cargar_catalogos(self, al_terminar=None):
+        def listo():
+            self.verificar_disponibilidad()
+            if al_terminar: al_terminar()
+        self.refrescar_catalogos(al_terminar=listo)
+
+    def refrescar_catalogos(self, al_terminar=None):
+        # Empleados desde el caché (solo viaja a la BD lo que cambió); combo en el hilo de Tk.
+        # Los clientes no se cargan enteros: se buscan al escribir (_al_escribir_cliente)
+        def consultar():
+            EMPLEADOS.actualizar()
+            return EMPLEADOS.version
+        def mostrar(version):
+            self._mostrar_catalogos(version)
+            if al_terminar: al_terminar()
+        self.main_window.ejecutor.enviar(consultar, clave="catalogos", al_terminar=mostrar)
+
+    def _mostrar_catalogos(self, version):
+        # Solo se reconstruye el combo si el catálogo cambió desde la última vez
+        if version != self._version_empleados:
+            self.combo_empleado['values'] = EMPLEADOS.nombres()
+        self._version_empleados = version
+
+    # --- Búsqueda incremental de clientes ---
+    def _al_escribir_cliente(self, event=None):
+        texto = self.entry_cliente.get()
+        if normalizar(texto) == normalizar(self._texto_cliente): return  # Flechas, Shift, espacios de más...
+        self._texto_cliente = texto
+        self.id_cliente = None  # Texto editado: ya no es el cliente elegido
+        if len(normalizar(texto)) < BUSQUEDA_CLIENTES_CONFIG['min_caracteres']:
+            return self._ocultar_sugerencias()  # Si llega una búsqueda anterior, _mostrar_clientes la descarta
+        # Prefijo ya visto (o acotable en memoria): respuesta inmediata, sin hilo ni BD
+        resultado = BUSCADOR.en_cache(texto)
+        if resultado is not None:
+            return self._mostrar_clientes(texto, resultado)
+        self.main_window.ejecutor.enviar(BUSCADOR.buscar, texto, clave="clientes", retraso_ms=EJECUTOR_CONFIG['debounce_ms'],
+                                         al_terminar=lambda r: self._mostrar_clientes(texto, r))
+
+    def _mostrar_clientes(self, texto, resultado, agregar=False):
+        if texto != self._texto_cliente: return  # Llegó tarde: el usuario siguió escribiendo
+        filas, self._mas_clientes = resultado
+        self.clientes_sugeridos = self.clientes_sugeridos + filas if agregar else filas
+        self.listbox_clientes.delete(0, tk.END)
+        for f in self.clientes_sugeridos:
+            self.listbox_clientes.insert(tk.END, f"{f[1]} — {f[3] or 's/c'}" + (f"  ☎ {f[4]}" if f[4] else ""))
+        if not self.clientes_sugeridos:
+            self.listbox_clientes.insert(tk.END, "(sin coincidencias)")
+        elif self._mas_clientes:
+            self.listbox_clientes.insert(tk.END, "▼ más resultados…")
+        if not self.listbox_clientes.winfo_ismapped():
+            self.listbox_clientes.pack(fill=tk.X, after=self.entry_cliente)
+
+    def _ir_a_sugerencias(self, event=None):
+        if self.clientes_sugeridos and self.listbox_clientes.winfo_ismapped():
+            self.listbox_clientes.focus_set()
+            self.listbox_clientes.selection_clear(0, tk.END)
+            self.listbox_clientes.selection_set(0); self.listbox_clientes.activate(0)
+
+    def _elegir_cliente(self, indice):
+        if indice >= len(self.clientes_sugeridos):
+            if self._mas_clientes and indice == len(self.clientes_sugeridos):
+                self._cargar_mas_clientes()
+            return
+        fila = self.clientes_sugeridos[indice]
+        self.mostrar_cliente(fila[0], fila[1])
+        self.spin_personas.focus_set()
+
+    def _cargar_mas_clientes(self):
+        texto, ultima = self._texto_cliente, self.clientes_sugeridos[-1]
+        self.main_window.ejecutor.enviar(BUSCADOR.siguiente_pagina, texto, (ultima[1], ultima[0]), clave="clientes",
+                                         al_terminar=lambda r: self._mostrar_clientes(texto, r, agregar=True))
+
+    def _ocultar_sugerencias(self):
+        self.listbox_clientes.pack_forget()
+        self.clientes_sugeridos, self._mas_clientes = [], False
+
+    def mostrar_cliente(self, id_cliente, texto):
+        """Fija el cliente elegido (sugerencia o reserva en edición) sin disparar una búsqueda."""
+        self._texto_cliente = texto or ""
+        self.entry_cliente.delete(0, tk.END); self.entry_cliente.insert(0, self._texto_cliente)
+        self.id_cliente = id_cliente
+        self._ocultar_sugerencias()
+
+    def limpiar_cliente(self):
+        self.mostrar_cliente(None, "")
 
     def verificar_disponibilidad(self):
         try:
             fecha = self.entry_fecha.get_date()
             dt = datetime(fecha.year, fecha.month, fecha.day, int(self.spin_hora.get()), int(self.spin_min.get()))
             id_a_ignorar = self.main_window.id_reserva_seleccionada if self.main_window.modo_edicion else None
-            self.mesas_actuales = ReservaController.obtener_mesas_disponibles(dt, id_a_ignorar)
-            self.listbox_mesas.delete(0, tk.END)
-            for i, m in enumerate(self.mesas_actuales):
-                self.listbox_mesas.insert(tk.END, m['texto'])
-                self.listbox_mesas.itemconfig(i, m['estilo'])
-        except: pass
+        except: return
+        # Clics seguidos en "Verificar": solo corre la última consulta (debounce + cancelación por clave)
+        self.main_window.ejecutor.enviar(
+            ReservaController.obtener_mesas_disponibles, dt, id_a_ignorar,
+            clave="disponibilidad", retraso_ms=EJECUTOR_CONFIG['debounce_ms'], al_terminar=self._mostrar_mesas
+        )
+
+    def _mostrar_mesas(self, mesas):
+        # Se conserva la selección: los refrescos por cambios de otras terminales no deben borrarla
+        seleccionadas = {self.mesas_actuales[i]['id'] for i in self.listbox_mesas.curselection() if i < len(self.mesas_actuales)}
+        self.mesas_actuales = mesas
+        self.listbox_mesas.delete(0, tk.END)
+        for i, m in enumerate(self.mesas_actuales):
+            self.listbox_mesas.insert(tk.END, m['texto'])
+            self.listbox_mesas.itemconfig(i, m['estilo'])
+            if m['id'] in seleccionadas: self.listbox_mesas.selection_set(i)
+
+    def sugerir_mesas(self):
+        try:
+            fecha = self.entry_fecha.get_date()
+            dt = datetime(fecha.year, fecha.month, fecha.day, int(self.spin_hora.get()), int(self.spin_min.get()))
+            pax = int(self.spin_personas.get())
+            id_a_ignorar = self.main_window.id_reserva_seleccionada if self.main_window.modo_edicion else None
+        except: return messagebox.showerror("Error", "Fecha o personas inválidas")
+        # La lista se recalcula con la misma hora para que la selección coincida con lo propuesto
+        def consultar():
+            return (ReservaController.obtener_mesas_disponibles(dt, id_a_ignorar),
+                    ReservaController.sugerir_mesas(dt, pax, id_a_ignorar))
+        self.main_window.ejecutor.enviar(consultar, clave="disponibilidad", al_terminar=self._mostrar_sugerencia)
+
+    def _mostrar_sugerencia(self, resultado):
+        mesas, sugeridas = resultado
+        self.listbox_mesas.selection_clear(0, tk.END)
+        self._mostrar_mesas(mesas)
+        if not sugeridas:
+            return messagebox.showwarning("Sugerir", "No hay combinación de mesas libres para ese grupo a esa hora.")
+        for i, m in enumerate(self.mesas_actuales):
+            if m['id'] in sugeridas:
+                self.listbox_mesas.selection_set(i); self.listbox_mesas.see(i)
 
     def guardar(self):
         # 1. Recolectar datos visuales para el mensaje
-        cli = self.combo_cliente.get()
+        cli = self.entry_cliente.get()
+        if not self.id_cliente: return messagebox.showerror("Error", "Elija el cliente de la lista de sugerencias")
         pax = self.spin_personas.get()
-        fecha = self.entry_fecha.get_date()
+        try:
+            fecha = self.entry_fecha.get_date()
+        except ValueError:
+            return messagebox.showerror("Error", "Fecha inválida (AAAA-MM-DD)")
         hora = f"{self.spin_hora.get()}:{self.spin_min.get()}"
         
         # Obtener nombres de mesas seleccionadas
@@ -106,8 +273,8 @@ class ReservaForm(tk.Frame):
         if confirmacion:
             # Si dice SÍ, procedemos a llamar al controlador principal
             self.main_window.procesar_guardado(
-                self.combo_cliente.get(), self.spin_personas.get(), 
-                self.entry_fecha.get_date(), self.spin_hora.get(), self.spin_min.get(),
+                self.id_cliente, self.spin_personas.get(),
+                fecha, self.spin_hora.get(), self.spin_min.get(),
                 self.listbox_mesas.curselection(), self.combo_empleado.get()
             )
 
@@ -116,7 +283,7 @@ class ReservaForm(tk.Frame):
         self.main_window.id_reserva_seleccionada = None
         self.lbl_titulo.config(text="NUEVA RESERVA", fg="black")
         self.btn_guardar.config(text="CONFIRMAR", bg="#007bff")
-        self.combo_cliente.set('')
+        self.limpiar_cliente()
         self.listbox_mesas.selection_clear(0, tk.END)
         self.entry_fecha.set_date(datetime.now())
         self.verificar_disponibilidad()
\ No newline at end of file
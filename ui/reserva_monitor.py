@@ -1,24 +1,44 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, Toplevel
 from data.database import DatabaseManager
+from logic.reserva_controller import ReservaController
+from config.settings import MONITOR_DIAS_VENTANA, MONITOR_TAMANO_PAGINA, MONITOR_MAX_PAGINAS
 
 class ReservaMonitor(tk.Frame):
     def __init__(self, parent, main_controller):
         super().__init__(parent, bg="white", padx=15, pady=15)
         self.main_window = main_controller
+        self._cursor = None      # (fechareserva, idReserva) de la última fila cargada
+        self._hay_mas = False
+        self._tope = None        # (fechareserva, idReserva) de la primera fila cargada
+        self._hay_antes = False  # Se descartaron filas por arriba (se vuelven a pedir al subir)
+        self._pagina_pendiente = False
+        self._claves = {}        # iid -> (fechareserva, idReserva), para insertar cambios en su lugar
+        self._al_primera_pagina = None
         self._init_widgets()
-        self.cargar_datos()
+        # La primera página la pide MainWindow después del primer pintado (cargar_datos)
 
     def _init_widgets(self):
-        tk.Label(self, text="Monitor de Reservas", font=("Arial", 14)).pack(anchor="w")
+        f_top = tk.Frame(self, bg="white"); f_top.pack(fill=tk.X)
+        tk.Label(f_top, text="Monitor de Reservas", font=("Arial", 14)).pack(side=tk.LEFT)
+        tk.Button(f_top, text="📊 Reportes", command=self.main_window.abrir_reportes).pack(side=tk.LEFT, padx=10)
+        self.spin_dias = tk.Spinbox(f_top, from_=1, to=365, width=4, command=self.cargar_datos)
+        self.spin_dias.delete(0, tk.END); self.spin_dias.insert(0, MONITOR_DIAS_VENTANA)
+        self.spin_dias.pack(side=tk.RIGHT)
+        self.spin_dias.bind("<Return>", lambda e: self.cargar_datos())
+        tk.Label(f_top, text="Hoy ± días:", bg="white").pack(side=tk.RIGHT)
+
         cols = ("ID", "Cliente", "Pax", "Fecha", "Mesas", "Estado")
-        self.tree = ttk.Treeview(self, columns=cols, show="headings")
+        f_tree = tk.Frame(self); f_tree.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.scroll = ttk.Scrollbar(f_tree, orient=tk.VERTICAL); self.scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree = ttk.Treeview(f_tree, columns=cols, show="headings", yscrollcommand=self._on_scroll)
+        self.scroll.config(command=self.tree.yview)
         for col in cols: self.tree.heading(col, text=col)
         self.tree.column("ID", width=30); self.tree.column("Pax", width=30); self.tree.column("Mesas", width=120)
         self.tree.tag_configure("cancelada", background="#ffebee")
         self.tree.tag_configure("completada", background="#e8f5e9")
         self.tree.tag_configure("confirmada", background="#fff3cd")
-        self.tree.pack(fill=tk.BOTH, expand=True, pady=5)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.tree.bind("<<TreeviewSelect>>", self.on_select)
         
         f_btn = tk.Frame(self, bg="white"); f_btn.pack(fill=tk.X, pady=5)
@@ -29,30 +49,145 @@ class ReservaMonitor(tk.Frame):
         tk.Button(f_btn, text="❌ Cancelar", bg="#dc3545", fg="white", command=lambda: self.main_window.cambiar_estado(3)).pack(side=tk.LEFT, padx=2)
 
         tk.Button(f_btn, text="🗑 Eliminar", bg="#343a40", fg="white", command=self.main_window.eliminar_reserva_fisica).pack(side=tk.RIGHT, padx=5)
-    def cargar_datos(self):
+    def cargar_datos(self, al_terminar=None):
+        # Refresco = primera página de la ventana actual; el resto se pide al hacer scroll
+        self._al_primera_pagina = al_terminar
         for i in self.tree.get_children(): self.tree.delete(i)
-        # NOMBRES NUEVOS EN QUERY
-        query = """
-        SELECT R.idReserva, C.nombre + ' ' + C.apellido, R.fechareserva, 
-               R.Npersonas, E.Descripcion, R.idEstadoreserva
-        FROM SGR_T_Reserva R
-        JOIN SGR_M_Cliente C ON R.idCliente = C.idCliente
-        JOIN SGR_P_Estadoreserva E ON R.idEstadoreserva = E.idEstadoreserva
-        ORDER BY R.fechareserva DESC
-        """
-        reservas = DatabaseManager.run_query(query, fetchall=True)
-        if reservas:
-            for row in reservas:
-                mesas = DatabaseManager.run_query(
-                    "SELECT M.Nmesa FROM SGR_T_DetalleReserva DR JOIN SGR_M_Mesa M ON DR.idMesa=M.idMesa WHERE DR.idReserva=?", 
-                    (row[0],), fetchall=True
-                )
-                mesas_str = ", ".join([m[0] for m in mesas]) if mesas else "-"
-                tag = "normal"
-                if row[5] == 3: tag = "cancelada"
-                elif row[5] == 4: tag = "completada"
-                elif row[5] == 2: tag = "confirmada"
-                self.tree.insert("", "end", values=(row[0], row[1], row[3], row[2].strftime('%d/%m %H:%M'), mesas_str, row[4]), tags=(tag,))
+        self._claves = {}
+        self._cursor = None
+        self._hay_mas = True
+        self._tope = None
+        self._hay_antes = False
+        self._pagina_pendiente = True
+        self._cargar_pagina()
+
+    def _ventana(self):
+        try:
+            dias = int(self.spin_dias.get())
+        except ValueError:
+            dias = MONITOR_DIAS_VENTANA
+        return ReservaController.ventana_monitor(dias)
+
+    def _cargar_pagina(self):
+        if not self._hay_mas:
+            self._pagina_pendiente = False
+            return
+        desde, hasta = self._ventana()
+        # Misma clave que el refresco: un refresco nuevo descarta las páginas en vuelo
+        self.main_window.ejecutor.enviar(
+            ReservaController.listar_reservas_monitor, desde, hasta, self._cursor, MONITOR_TAMANO_PAGINA,
+            clave="monitor", al_terminar=self._agregar_filas, al_error=self._fallo_pagina
+        )
+
+    def _cargar_pagina_anterior(self):
+        desde, hasta = self._ventana()
+        self.main_window.ejecutor.enviar(
+            ReservaController.listar_reservas_monitor, desde, hasta, None, MONITOR_TAMANO_PAGINA, antes_de=self._tope,
+            clave="monitor", al_terminar=self._anteponer_filas, al_error=self._fallo_pagina
+        )
+
+    def _fallo_pagina(self, error):
+        self._pagina_pendiente = False
+        messagebox.showerror("Monitor", f"No se pudieron cargar las reservas:\n{error}")
+
+    def _agregar_filas(self, filas):
+        self._hay_mas = len(filas) == MONITOR_TAMANO_PAGINA
+        primera = self._primera_visible()
+        for row in filas:
+            self._insertar_fila(row, "end")
+        if filas:
+            self._cursor = (filas[-1][2], filas[-1][0])
+            if self._tope is None:
+                self._tope = (filas[0][2], filas[0][0])
+        # Memoria acotada: a lo sumo MONITOR_MAX_PAGINAS páginas; las de arriba se descartan
+        hijos = self.tree.get_children()
+        sobran = len(hijos) - MONITOR_MAX_PAGINAS * MONITOR_TAMANO_PAGINA
+        if sobran > 0:
+            self._descartar(hijos[:sobran])
+            self._tope = self._claves[self.tree.get_children()[0]]
+            self._hay_antes = True
+            self._mover_vista(primera - sobran)
+        self._pagina_pendiente = False
+        if self._al_primera_pagina:
+            aviso, self._al_primera_pagina = self._al_primera_pagina, None
+            aviso()
+
+    def _anteponer_filas(self, filas):
+        # Página anterior (keyset inverso desde _tope), ya en el orden del monitor
+        self._hay_antes = len(filas) == MONITOR_TAMANO_PAGINA
+        primera = self._primera_visible()
+        for i, row in enumerate(filas):
+            self._insertar_fila(row, i)
+        if filas:
+            self._tope = (filas[0][2], filas[0][0])
+        hijos = self.tree.get_children()
+        sobran = len(hijos) - MONITOR_MAX_PAGINAS * MONITOR_TAMANO_PAGINA
+        if sobran > 0:
+            self._descartar(hijos[-sobran:])
+            self._cursor = self._claves[self.tree.get_children()[-1]]
+            self._hay_mas = True
+        self._mover_vista(primera + len(filas))
+        self._pagina_pendiente = False
+
+    def _descartar(self, iids):
+        self.tree.delete(*iids)
+        for iid in iids: self._claves.pop(iid, None)
+
+    def _primera_visible(self):
+        return round(float(self.tree.yview()[0]) * len(self.tree.get_children()))
+
+    def _mover_vista(self, indice):
+        # Mantiene a la vista las mismas filas aunque se hayan agregado o quitado otras por arriba
+        total = len(self.tree.get_children())
+        if total: self.tree.yview_moveto(max(indice, 0) / total)
+
+    def _insertar_fila(self, row, posicion):
+        mesas_str = row[6] or "-"
+        tag = "normal"
+        if row[5] == 3: tag = "cancelada"
+        elif row[5] == 4: tag = "completada"
+        elif row[5] == 2: tag = "confirmada"
+        iid = str(row[0])
+        if self.tree.exists(iid): self.tree.delete(iid)
+        self.tree.insert("", posicion, iid=iid, values=(row[0], row[1], row[3], row[2].strftime('%d/%m %H:%M'), mesas_str, row[4]), tags=(tag,))
+        self._claves[iid] = (row[2], row[0])
+
+    def aplicar_cambios(self, cambios):
+        """Refresco incremental (feed de cambios): solo se releen las reservas tocadas por otras terminales."""
+        ids = sorted({c[1] for c in cambios})
+        if len(ids) > MONITOR_TAMANO_PAGINA:
+            return self.cargar_datos()  # Carga masiva: releer la página es más barato que recolocar fila por fila
+        self.main_window.ejecutor.enviar(ReservaController.listar_reservas_monitor, ids=ids,
+                                         al_terminar=lambda filas: self._actualizar_filas(ids, filas))
+
+    def _actualizar_filas(self, ids, filas):
+        if filas is None: return
+        desde, hasta = self._ventana()
+        for id_reserva in ids:
+            iid = str(id_reserva)
+            if self.tree.exists(iid): self.tree.delete(iid)
+            self._claves.pop(iid, None)
+        for row in filas:
+            clave = (row[2], row[0])
+            # Fuera de la ventana, o más allá de lo ya paginado (llegará con su página): no se muestra aún
+            if not desde <= row[2] <= hasta: continue
+            if self._hay_mas and self._cursor and clave < self._cursor: continue
+            if self._hay_antes and self._tope and clave > self._tope: continue
+            # Orden del monitor: fechareserva DESC, idReserva DESC
+            hijos = self.tree.get_children()
+            posicion = next((i for i, h in enumerate(hijos) if self._claves.get(h, clave) < clave), "end")
+            self._insertar_fila(row, posicion)
+
+    def _on_scroll(self, primero, ultimo):
+        self.scroll.set(primero, ultimo)
+        if self._pagina_pendiente: return
+        # Cerca del final de lo ya cargado: traer la siguiente página; cerca del principio, la anterior descartada
+        if self._hay_mas and float(ultimo) >= 0.9:
+            self._pagina_pendiente = True
+            self.after_idle(self._cargar_pagina)
+        elif self._hay_antes and float(primero) <= 0.1:
+            self._pagina_pendiente = True
+            self.after_idle(self._cargar_pagina_anterior)
 
     def on_select(self, event):
         item = self.tree.focus()
@@ -64,10 +199,11 @@ class ReservaMonitor(tk.Frame):
         if not id_res: return
         
         # NOMBRES NUEVOS EN QUERY DETALLES
-        sql = """
-        SELECT Rest.nombre, Rest.direccion, C.nombre + ' ' + C.apellido, C.cedula, C.telefono,
-               ISNULL(P.Descripcion, 'Estándar'), ISNULL(P.Valor, 0), R.fechareserva, R.Npersonas, E.Descripcion,
-               ISNULL(Emp.nombre, 'Sin asignar')
+        d = DatabaseManager.dialecto()
+        sql = f"""
+        SELECT Rest.nombre, Rest.direccion, {d.concat("C.nombre", "' '", "C.apellido")}, C.cedula, C.telefono,
+               {d.isnull("P.Descripcion", "'Estándar'")}, {d.isnull("P.Valor", "0")}, R.fechareserva, R.Npersonas, E.Descripcion,
+               {d.isnull("Emp.nombre", "'Sin asignar'")}
         FROM SGR_T_Reserva R
         JOIN SGR_M_Restaurante Rest ON R.idRestaurante = Rest.idRestaurante
         JOIN SGR_M_Cliente C ON R.idCliente = C.idCliente
@@ -76,8 +212,10 @@ class ReservaMonitor(tk.Frame):
         LEFT JOIN SGR_M_Empleado Emp ON R.idEmpleado = Emp.idEmpleado
         WHERE R.idReserva = ?
         """
-        d = DatabaseManager.run_query(sql, (id_res,), fetchone=True)
-        
+        self.main_window.ejecutor.enviar(DatabaseManager.run_query, sql, (id_res,), fetchone=True,
+                                         clave="detalles", al_terminar=self._mostrar_detalles)
+
+    def _mostrar_detalles(self, d):
         if d:
             top = Toplevel()
             top.geometry("500x600"); top.title("Ficha")